@@ -1,19 +1,168 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, Response, stream_with_context
 from flask_cors import CORS
 import youtube_analyzer
 import datetime
+import json
 import traceback
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
+def parse_extract_links(value):
+    """
+    Parse the extract_links query parameter
+
+    Accepts true/false, or one of the extraction modes (browser, http, auto).
+    true uses the default mode from LINK_EXTRACTION_MODE.
+
+    Returns:
+        tuple: (extract_links, links_mode), or (None, None) if the value is invalid
+    """
+    value = (value or 'false').lower()
+    if value == 'false':
+        return False, None
+    if value == 'true':
+        return True, youtube_analyzer.LINK_EXTRACTION_MODE
+    if value in youtube_analyzer.LINK_EXTRACTION_MODES:
+        return True, value
+    return None, None
+
+def quota_exceeded_response(error):
+    """
+    Build the 429 response for a request that ran out of YouTube API quota
+    """
+    response = jsonify({
+        "error": str(error),
+        "retry_after": int(error.retry_after) if error.retry_after is not None else None
+    })
+    response.status_code = 429
+    if error.retry_after is not None:
+        response.headers['Retry-After'] = str(max(1, int(error.retry_after)))
+    return response
+
+def parse_quota_budget(value):
+    """
+    Parse the quota_budget query parameter
+
+    Returns:
+        int: The budget in quota units, None for no budget. Raises ValueError if invalid.
+    """
+    if value is None:
+        return None
+    budget = int(value)
+    if budget < 1:
+        raise ValueError("quota_budget must be positive")
+    return budget
+
+def ndjson_response(lines):
+    """
+    Stream an iterable of JSON-serializable objects as newline-delimited JSON
+
+    A quota or other error raised while streaming ends the stream with an error
+    line, since the status code has already been sent.
+    """
+    def generate():
+        try:
+            for line in lines:
+                yield json.dumps(line) + "\n"
+        except youtube_analyzer.QuotaExceededError as e:
+            yield json.dumps({
+                "error": str(e),
+                "retry_after": int(e.retry_after) if e.retry_after is not None else None
+            }) + "\n"
+        except Exception as e:
+            print(f"Error while streaming {request.path}: {str(e)}")
+            print(traceback.format_exc())
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+def export_channel(channel_id, result):
+    """
+    Build the JSON export of an analyzed channel
+
+    Returns:
+        tuple: (channel title, channel data)
+    """
+    metrics = result.get('metrics', {})
+
+    # Process external links to remove YouTube redirect URLs
+    external_links = metrics.get('external_links', [])
+    for link in external_links:
+        if 'url' in link and 'youtube.com/redirect' in link['url']:
+            # Extract the direct URL from YouTube redirect URLs
+            direct_url = youtube_analyzer.extract_direct_url(link['url'])
+            link['url'] = direct_url
+
+    return metrics.get('channel_info', {}).get('title', channel_id), {
+        "channel_info": metrics.get('channel_info', {}),
+        "video_metrics": metrics.get('video_metrics', {}),
+        "social_handles": metrics.get('social_handles', {}),
+        "external_links": external_links,
+        "recent_videos": metrics.get('recent_videos', [])
+    }
+
+@app.before_request
+def start_quota_scope():
+    """Attribute the YouTube API quota spent by this request to its endpoint"""
+    g.quota_scope = youtube_analyzer.quota_scope(request.path)
+    g.quota_scope.__enter__()
+
+@app.teardown_request
+def end_quota_scope(exception=None):
+    quota_scope = g.pop('quota_scope', None)
+    if quota_scope is not None:
+        quota_scope.__exit__(None, None, None)
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Simple health check endpoint"""
-    return jsonify({
+    health = {
         "status": "ok",
         "timestamp": datetime.datetime.now().isoformat()
-    })
+    }
+
+    # Cache statistics, reported as unavailable rather than failing the health check
+    try:
+        health["link_cache"] = youtube_analyzer.link_cache.stats()
+    except Exception as e:
+        health["link_cache"] = {"error": str(e)}
+
+    try:
+        health["etag_cache"] = youtube_analyzer.etag_cache.stats()
+    except Exception as e:
+        health["etag_cache"] = {"error": str(e)}
+
+    try:
+        health["channel_ids"] = youtube_analyzer.channel_ids.stats()
+    except Exception as e:
+        health["channel_ids"] = {"error": str(e)}
+
+    try:
+        health["channel_state"] = youtube_analyzer.channel_state.stats()
+    except Exception as e:
+        health["channel_state"] = {"error": str(e)}
+
+    try:
+        health["search_cache"] = {**youtube_analyzer.search_cache.stats(),
+                                  **youtube_analyzer.search_cache_counters.stats()}
+    except Exception as e:
+        health["search_cache"] = {"error": str(e)}
+
+    try:
+        health["quota"] = youtube_analyzer.quota_ledger.stats()
+    except Exception as e:
+        health["quota"] = {"error": str(e)}
+
+    health["api_latency"] = youtube_analyzer.api_latency.stats()
+
+    if youtube_analyzer.SCRAPER_DISPATCH == 'worker':
+        try:
+            health["scrape_queue"] = youtube_analyzer.scrape_job_queue.stats()
+        except Exception as e:
+            health["scrape_queue"] = {"error": str(e)}
+
+    return jsonify(health)
 
 @app.route('/api/channel', methods=['GET'])
 def analyze_channel():
@@ -27,7 +176,13 @@ def analyze_channel():
     - days: Only include videos from the last X days
     - start_date: Only include videos published after this date (format: YYYY-MM-DD)
     - end_date: Only include videos published before this date (format: YYYY-MM-DD)
-    - extract_links: Whether to extract external links (default: false)
+    - extract_links: Whether to extract external links (default: false). Also accepts
+      browser, http or auto to choose how the links are extracted
+    - refresh: Scrape the about page even if its links are cached (default: false)
+    - full: Return complete API resources in raw_data instead of only the fields
+      the metrics use (default: false)
+    - incremental: Fetch only the uploads added since the channel was last analyzed
+      with incremental=true (default: false)
     """
     try:
         # Get query parameters
@@ -73,17 +228,25 @@ def analyze_channel():
                 }), 400
 
         # Get other parameters
-        extract_links = request.args.get('extract_links', 'false').lower() == 'true'
+        extract_links, links_mode = parse_extract_links(request.args.get('extract_links'))
+        if extract_links is None:
+            return jsonify({
+                "error": "extract_links must be true, false, browser, http or auto"
+            }), 400
+        refresh = request.args.get('refresh', 'false').lower() == 'true'
+        full = request.args.get('full', 'false').lower() == 'true'
+        incremental = request.args.get('incremental', 'false').lower() == 'true'
         debug = request.args.get('debug', 'false').lower() == 'true'
 
         # Check if Playwright is available
-        if extract_links and not youtube_analyzer.PLAYWRIGHT_AVAILABLE:
+        if extract_links and not youtube_analyzer.links_extraction_available(links_mode):
             return jsonify({
                 "error": "Playwright is not available. Cannot extract external links.",
                 "solution": "Install Playwright: pip install playwright and then run: playwright install"
             }), 500
 
         # Analyze the channel
+        stats = {"round_trips": 0}
         try:
             result = youtube_analyzer.analyze_youtube_channel(
                 channel_id=channel_id,
@@ -93,9 +256,16 @@ def analyze_channel():
                 start_date=start_date,
                 end_date=end_date,
                 extract_links=extract_links,
+                links_mode=links_mode,
+                refresh_links=refresh,
+                full=full,
+                incremental=incremental,
+                stats=stats,
                 headless=True,  # Always run in headless mode for API
                 verbose=debug   # Show debug info if requested
             )
+        except youtube_analyzer.QuotaExceededError as e:
+            return quota_exceeded_response(e)
         except Exception as e:
             print(f"Error in analyze_channel with extract_links={extract_links}: {str(e)}")
             print(traceback.format_exc())
@@ -120,8 +290,11 @@ def analyze_channel():
                     link['url'] = direct_url
 
         # Return the metrics as JSON
+        result['stats'] = stats
         return jsonify(result)
 
+    except youtube_analyzer.QuotaExceededError as e:
+        return quota_exceeded_response(e)
     except Exception as e:
         # Log the full exception for debugging
         print(f"Error in analyze_channel: {str(e)}")
@@ -138,7 +311,12 @@ def search_channels():
 
     Query parameters:
     - query: Search query for YouTube channels
-    - max_results: Maximum number of results to return (default: 5)
+    - max_results: Maximum number of results to return (default: 5, max: SEARCH_MAX_RESULTS).
+      More than 50 results are requested page by page
+    - quota_budget: Stop searching before a page of results would take the search over
+      this many API quota units
+    - stream: Return one channel per line as newline-delimited JSON as each page of
+      results arrives, followed by a line with the count and stats (default: false)
     """
     try:
         # Get query parameters
@@ -154,28 +332,53 @@ def search_channels():
         try:
             max_results = int(max_results)
             # Limit max_results to a reasonable range
-            max_results = min(max(1, max_results), 50)
+            max_results = min(max(1, max_results), youtube_analyzer.SEARCH_MAX_RESULTS)
         except ValueError:
             return jsonify({
                 "error": "max_results parameter must be an integer"
             }), 400
 
+        try:
+            quota_budget = parse_quota_budget(request.args.get('quota_budget'))
+        except ValueError:
+            return jsonify({
+                "error": "quota_budget parameter must be a positive integer"
+            }), 400
+        stream = request.args.get('stream', 'false').lower() == 'true'
+
         # Search for channels
-        channels = youtube_analyzer.search_youtube_channels(query, max_results=max_results)
+        stats = {"round_trips": 0}
+        if stream:
+            def lines():
+                count = 0
+                for channel in youtube_analyzer.iter_search_channels(query, max_results=max_results,
+                                                                     quota_budget=quota_budget, stats=stats):
+                    count += 1
+                    yield {"channel": channel}
+                yield {"query": query, "count": count, "stats": stats}
+
+            return ndjson_response(lines())
+
+        channels = youtube_analyzer.search_youtube_channels(query, max_results=max_results, stats=stats,
+                                                            quota_budget=quota_budget)
 
         if not channels:
             return jsonify({
                 "message": "No channels found matching your search query",
-                "channels": []
+                "channels": [],
+                "stats": stats
             })
 
         # Return the search results as JSON
         return jsonify({
             "query": query,
             "count": len(channels),
-            "channels": channels
+            "channels": channels,
+            "stats": stats
         })
 
+    except youtube_analyzer.QuotaExceededError as e:
+        return quota_exceeded_response(e)
     except Exception as e:
         # Log the full exception for debugging
         print(f"Error in search_channels: {str(e)}")
@@ -192,11 +395,22 @@ def analyze_search_results():
 
     Query parameters:
     - query: Search query for YouTube channels
-    - max_results: Maximum number of results to analyze (default: 5)
+    - max_results: Maximum number of results to analyze (default: 5, max: SEARCH_MAX_RESULTS).
+      More than 50 results are searched and analyzed page by page
+    - quota_budget: Stop searching before a page of results would take the search over
+      this many API quota units. The analysis is not counted
+    - stream: Return one analyzed channel per line as newline-delimited JSON as each page
+      of results is analyzed, followed by a line with the query, timestamp and stats
+      (default: false)
+    - workers: Number of channels analyzed in parallel (default: ANALYZE_MAX_WORKERS)
     - days: Only include videos from the last X days
     - start_date: Only include videos published after this date (format: YYYY-MM-DD)
     - end_date: Only include videos published before this date (format: YYYY-MM-DD)
-    - extract_links: Whether to extract external links (default: false)
+    - extract_links: Whether to extract external links (default: false). Also accepts
+      browser, http or auto to choose how the links are extracted
+    - refresh: Scrape the about page even if its links are cached (default: false)
+    - incremental: Fetch only the uploads added since each channel was last analyzed
+      with incremental=true (default: false)
     """
     try:
         # Get query parameters
@@ -212,12 +426,31 @@ def analyze_search_results():
         try:
             max_results = int(max_results)
             # Limit max_results to a reasonable range
-            max_results = min(max(1, max_results), 10)  # Lower limit for analysis
+            max_results = min(max(1, max_results), youtube_analyzer.SEARCH_MAX_RESULTS)
         except ValueError:
             return jsonify({
                 "error": "max_results parameter must be an integer"
             }), 400
 
+        try:
+            quota_budget = parse_quota_budget(request.args.get('quota_budget'))
+        except ValueError:
+            return jsonify({
+                "error": "quota_budget parameter must be a positive integer"
+            }), 400
+        stream = request.args.get('stream', 'false').lower() == 'true'
+
+        # Get workers parameter
+        workers = request.args.get('workers', str(youtube_analyzer.ANALYZE_MAX_WORKERS))
+        try:
+            workers = int(workers)
+            # Limit workers to the process-wide concurrency cap
+            workers = min(max(1, workers), youtube_analyzer.ANALYZE_MAX_CONCURRENCY)
+        except ValueError:
+            return jsonify({
+                "error": "workers parameter must be an integer"
+            }), 400
+
         # Get date filtering parameters
         days_ago = request.args.get('days')
         start_date = request.args.get('start_date')
@@ -250,36 +483,71 @@ def analyze_search_results():
                 }), 400
 
         # Get other parameters
-        extract_links = request.args.get('extract_links', 'false').lower() == 'true'
+        extract_links, links_mode = parse_extract_links(request.args.get('extract_links'))
+        if extract_links is None:
+            return jsonify({
+                "error": "extract_links must be true, false, browser, http or auto"
+            }), 400
+        refresh = request.args.get('refresh', 'false').lower() == 'true'
+        incremental = request.args.get('incremental', 'false').lower() == 'true'
         debug = request.args.get('debug', 'false').lower() == 'true'
 
         # Check if Playwright is available
-        if extract_links and not youtube_analyzer.PLAYWRIGHT_AVAILABLE:
+        if extract_links and not youtube_analyzer.links_extraction_available(links_mode):
             return jsonify({
                 "error": "Playwright is not available. Cannot extract external links.",
                 "solution": "Install Playwright: pip install playwright and then run: playwright install"
             }), 500
 
+        def analyze(channels):
+            return youtube_analyzer.analyze_search_results(
+                channels,
+                days_ago=days_ago,
+                start_date=start_date,
+                end_date=end_date,
+                extract_links=extract_links,
+                links_mode=links_mode,
+                refresh_links=refresh,
+                stats=stats,
+                max_workers=workers,
+                incremental=incremental,
+                headless=True,  # Always run in headless mode for API
+                verbose=debug   # Show debug info if requested
+            )
+
         # Search for channels
-        channels = youtube_analyzer.search_youtube_channels(query, max_results=max_results)
+        stats = {"round_trips": 0}
+        if stream:
+            # Analyze each page of search results as it arrives
+            def lines():
+                for channels in youtube_analyzer.iter_search_pages(query, max_results=max_results,
+                                                                   quota_budget=quota_budget, stats=stats):
+                    for channel_id, result in analyze(channels).items():
+                        title, channel = export_channel(channel_id, result)
+                        yield {"title": title, **channel}
+                yield {
+                    "query": query,
+                    "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "stats": stats
+                }
+
+            return ndjson_response(lines())
+
+        channels = youtube_analyzer.search_youtube_channels(query, max_results=max_results, stats=stats,
+                                                            quota_budget=quota_budget)
 
         if not channels:
             return jsonify({
                 "message": "No channels found matching your search query",
-                "channels": []
+                "channels": [],
+                "stats": stats
             })
 
         # Analyze the channels
         try:
-            results = youtube_analyzer.analyze_search_results(
-                channels,
-                days_ago=days_ago,
-                start_date=start_date,
-                end_date=end_date,
-                extract_links=extract_links,
-                headless=True,  # Always run in headless mode for API
-                verbose=debug   # Show debug info if requested
-            )
+            results = analyze(channels)
+        except youtube_analyzer.QuotaExceededError as e:
+            return quota_exceeded_response(e)
         except Exception as e:
             print(f"Error in analyze_search_results with extract_links={extract_links}: {str(e)}")
             print(traceback.format_exc())
@@ -293,33 +561,20 @@ def analyze_search_results():
         export_data = {
             "query": query,
             "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "stats": stats,
             "channels": {}
         }
 
         # Process each channel's data
         for channel_id, result in results.items():
-            metrics = result.get('metrics', {})
-
-            # Process external links to remove YouTube redirect URLs
-            external_links = metrics.get('external_links', [])
-            for link in external_links:
-                if 'url' in link and 'youtube.com/redirect' in link['url']:
-                    # Extract the direct URL from YouTube redirect URLs
-                    direct_url = youtube_analyzer.extract_direct_url(link['url'])
-                    link['url'] = direct_url
-
-            # Add channel data to export
-            export_data["channels"][metrics.get('channel_info', {}).get('title', channel_id)] = {
-                "channel_info": metrics.get('channel_info', {}),
-                "video_metrics": metrics.get('video_metrics', {}),
-                "social_handles": metrics.get('social_handles', {}),
-                "external_links": external_links,
-                "recent_videos": metrics.get('recent_videos', [])
-            }
+            title, channel = export_channel(channel_id, result)
+            export_data["channels"][title] = channel
 
         # Return the analysis results as JSON
         return jsonify(export_data)
 
+    except youtube_analyzer.QuotaExceededError as e:
+        return quota_exceeded_response(e)
     except Exception as e:
         # Log the full exception for debugging
         print(f"Error in analyze_search_results: {str(e)}")
@@ -0,0 +1,83 @@
+"""
+Benchmark: analyzing search results with the sync client vs AsyncYouTubeClient
+
+Runs analyze_search_results (batched, thread pool) and
+analyze_search_results_async at several concurrency limits against the local
+fake API, each with an empty cache. Prints the wall time and API round trips of
+each run and whether the async results match the sync ones. Needs aiohttp.
+
+Usage:
+    python benchmarks/bench_async_client.py [--channels 300] [--latency 0.05]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('CACHE_DB_PATH', os.path.join(tempfile.mkdtemp(), 'cache.db'))
+os.environ.setdefault('YOUTUBE_QUOTA_PER_MINUTE', '0')
+os.environ.setdefault('YOUTUBE_DAILY_QUOTA', '1000000')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import youtube_analyzer
+import youtube_async
+from fake_youtube_api import FakeYouTubeAPI
+
+
+def clear_cache():
+    youtube_analyzer.etag_cache._connect().execute("DELETE FROM cache_entries")
+
+
+def same_results(expected, actual):
+    return list(expected) == list(actual) and all(
+        expected[channel_id]['metrics'] == actual[channel_id]['metrics']
+        and expected[channel_id]['raw_data']['items'] == actual[channel_id]['raw_data']['items']
+        for channel_id in expected
+    )
+
+
+async def analyze_async(api, channels, concurrency, stats):
+    async with youtube_async.AsyncYouTubeClient(concurrency=concurrency, base_url=api.base_url) as client:
+        return await youtube_async.analyze_search_results_async(
+            channels, days_ago=30, extract_links=False, verbose=False, stats=stats, client=client)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--channels', type=int, default=300, help='Existing channels to analyze, one missing channel is added')
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds per HTTP request')
+    parser.add_argument('--workers', type=int, default=16, help='Thread pool size of the sync run')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[20, 50, 100], help='Async concurrency limits to run')
+    args = parser.parse_args()
+
+    if not youtube_async.AIOHTTP_AVAILABLE:
+        sys.exit("aiohttp is not installed")
+
+    api = FakeYouTubeAPI(latency=args.latency).start()
+    api.point(youtube_analyzer)
+    channels = [{'channel_id': f'UC{i}', 'title': f'Channel {i}'} for i in range(args.channels)]
+    channels.append({'channel_id': 'UCmissing', 'title': 'Missing channel'})
+
+    clear_cache()
+    stats = {}
+    started = time.perf_counter()
+    expected = youtube_analyzer.analyze_search_results(
+        channels, days_ago=30, extract_links=False, verbose=False, stats=stats, max_workers=args.workers)
+    elapsed = time.perf_counter() - started
+    print(f"sync batched, {args.workers} workers  {elapsed:6.1f} s  {len(expected)} channels  {stats['round_trips']} round trips")
+
+    for concurrency in args.concurrency:
+        clear_cache()
+        stats = {}
+        started = time.perf_counter()
+        actual = asyncio.run(analyze_async(api, channels, concurrency, stats))
+        elapsed = time.perf_counter() - started
+        print(f"async, concurrency {concurrency:3d}  {elapsed:6.1f} s  {len(actual)} channels  "
+              f"{stats['round_trips']} round trips  identical: {same_results(expected, actual)}")
+    api.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: fetching several channels one by one vs with retrieve_youtube_data_batch
+
+Runs both paths against the local fake API (benchmarks/fake_youtube_api.py),
+where every HTTP request takes a fixed latency, each with an empty cache. Checks
+that they return the same responses, apart from the etag and page size of the
+shared channels.list request, and prints the API calls made and the wall time of each.
+
+Usage:
+    python benchmarks/bench_batch_fetch.py [--channels 10] [--latency 0.05] [--days-ago 3] [--full]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('CACHE_DB_PATH', os.path.join(tempfile.mkdtemp(), 'cache.db'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import youtube_analyzer
+from fake_youtube_api import FakeYouTubeAPI
+
+
+def comparable(data):
+    # The etag and page size describe the channels.list request, which the batch shares between channels
+    if data is None:
+        return None
+    data = dict(data)
+    data.pop('etag', None)
+    if 'pageInfo' in data:
+        data['pageInfo'] = {key: value for key, value in data['pageInfo'].items() if key != 'resultsPerPage'}
+    return data
+
+
+def run(label, api, func):
+    # Start each run cold, without ETags or channel IDs cached by the previous one
+    youtube_analyzer.etag_cache._connect().execute("DELETE FROM cache_entries")
+    stats = {}
+    requests_before = api.requests
+    started = time.perf_counter()
+    result = func(stats)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"{label:14s} {api.requests - requests_before:4d} HTTP requests  {elapsed:7.0f} ms  {stats}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--channels', type=int, default=10, help='Existing channels to fetch, one missing channel is added')
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds per HTTP request')
+    parser.add_argument('--days-ago', type=int, default=3, help='Date filter, 0 for none')
+    parser.add_argument('--full', action='store_true', help='Fetch complete API resources')
+    args = parser.parse_args()
+
+    api = FakeYouTubeAPI(latency=args.latency).start()
+    api.point(youtube_analyzer)
+    channel_ids = [f'UC{i}' for i in range(args.channels)] + ['UCmissing']
+    days_ago = args.days_ago or None
+
+    single = run('per channel', api, lambda stats: {
+        channel_id: youtube_analyzer.retrieve_youtube_data(channel_id=channel_id, days_ago=days_ago, verbose=False, stats=stats, full=args.full)
+        for channel_id in channel_ids
+    })
+    batch = run('batch', api, lambda stats: youtube_analyzer.retrieve_youtube_data_batch(
+        channel_ids, days_ago=days_ago, verbose=False, stats=stats, full=args.full))
+    api.stop()
+
+    identical = all(comparable(single[channel_id]) == comparable(batch[channel_id]) for channel_id in channel_ids)
+    print(f"Identical results: {identical}")
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
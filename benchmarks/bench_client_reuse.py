@@ -0,0 +1,49 @@
+"""
+Microbenchmark: cost of building a YouTube API client per call vs reusing one
+
+Compares build('youtube', 'v3') on every call, as the analyzer used to do,
+with build_from_document from the parsed discovery document and with the
+per-thread client from get_youtube_client. Runs offline, no request is sent.
+
+Usage:
+    python benchmarks/bench_client_reuse.py [--calls 200]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('CACHE_DB_PATH', os.path.join(tempfile.mkdtemp(), 'cache.db'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from googleapiclient.discovery import build, build_from_document
+
+import youtube_analyzer
+
+
+def per_call_ms(func, calls):
+    started = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - started) * 1000 / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calls', type=int, default=200, help='Clients built or fetched per variant')
+    args = parser.parse_args()
+
+    document = youtube_analyzer._get_discovery_document()
+    variants = [
+        ("build('youtube', 'v3') per call", lambda: build('youtube', 'v3', developerKey='key', static_discovery=True)),
+        ("build_from_document per call", lambda: build_from_document(document, developerKey='key')),
+        ("get_youtube_client (cached per thread)", lambda: youtube_analyzer.get_youtube_client('key')),
+    ]
+    for name, func in variants:
+        func()  # Warm up caches and imports
+        print(f"{name:40s} {per_call_ms(func, args.calls):8.3f} ms per call")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Check: spreading API calls over a pool of keys when one key runs out early
+
+Configures three API keys with the same daily budget and runs search and
+batched channel fetches against the local fake API, whose quota for the first
+key is lower than configured. Prints how many rounds completed, the units each
+key used according to the server and to the QuotaLedger, and each key's
+rotation state.
+
+Usage:
+    python benchmarks/bench_key_failover.py [--budget 400] [--first-key-limit 150]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+KEYS = ['key-aaaa', 'key-bbbb', 'key-cccc']
+
+os.environ.setdefault('CACHE_DB_PATH', os.path.join(tempfile.mkdtemp(), 'cache.db'))
+os.environ['YOUTUBE_API_KEYS'] = ','.join(KEYS)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget', type=int, default=400, help='Configured daily quota per key')
+    parser.add_argument('--first-key-limit', type=int, default=150, help='Quota the server allows the first key')
+    parser.add_argument('--rounds', type=int, default=20, help='Rounds of one search and one 5 channel fetch')
+    args = parser.parse_args()
+
+    # The ledger reads the budget at import time
+    os.environ['YOUTUBE_DAILY_QUOTA'] = str(args.budget)
+    import youtube_analyzer
+    from fake_youtube_api import FakeYouTubeAPI
+
+    api = FakeYouTubeAPI(latency=0.005, key_limits={KEYS[0]: args.first_key_limit}).start()
+    api.point(youtube_analyzer)
+
+    completed = 0
+    try:
+        for round_number in range(args.rounds):
+            youtube_analyzer.search_youtube_channels(f'query {round_number}', max_results=5)
+            data = youtube_analyzer.retrieve_youtube_data_batch([f'UC{i}' for i in range(5)], days_ago=3, verbose=False)
+            if not all(data.values()):
+                raise RuntimeError(f"Channels missing from round {round_number}")
+            completed += 1
+    except youtube_analyzer.QuotaExceededError as e:
+        print(f"Stopped after {completed} rounds: {e}")
+    else:
+        print(f"Completed all {completed} rounds")
+    api.stop()
+
+    print(f"Units used according to the server: {json.dumps({key: api.key_used.get(key, 0) for key in KEYS})}")
+    stats = youtube_analyzer.quota_ledger.stats()
+    print(f"Ledger: used {stats['used']}, remaining {stats['remaining']} of {stats['daily_budget']}")
+    for key in stats['keys']:
+        print(f"  {key['id']}: used {key['used']}, remaining {key['remaining']}, in rotation {key['in_rotation']}")
+
+
+if __name__ == '__main__':
+    main()
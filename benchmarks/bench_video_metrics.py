@@ -0,0 +1,131 @@
+"""
+Benchmark: video metrics from columns read in one pass vs the original passes
+
+Generates videos with missing counts and unusual durations, checks that
+extract_account_metrics gives the same output as the original implementation
+in legacy_metrics.py (key order included), and times both on a large channel.
+The view distribution fields added since are left out of the comparison.
+
+Usage:
+    python benchmarks/bench_video_metrics.py [--videos 10000] [--repeat 15]
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('CACHE_DB_PATH', os.path.join(tempfile.mkdtemp(), 'cache.db'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import legacy_metrics
+import youtube_analyzer
+
+ODD_DURATIONS = ['PT5M13S', 'PT1H2M3S', 'PT45S', 'PT2H', 'P1DT2H3M', 'P1D', 'PT', '', 'PT1.5S', 'PT10M', 'PT1H30S', 'garbage', 'P0D']
+
+
+def generate_video(index):
+    statistics = {'viewCount': str(random.randint(0, 10 ** 7))}
+    if random.random() > 0.1:
+        statistics['likeCount'] = str(random.randint(0, 10 ** 5))
+    if random.random() > 0.2:
+        statistics['commentCount'] = str(random.randint(0, 10 ** 4))
+    video = {
+        'id': f'v{index}',
+        'snippet': {
+            'title': f'Video {index}',
+            'publishedAt': f'2024-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}T00:00:{index % 60:02d}Z',
+            'thumbnails': {'high': {'url': 'https://i.ytimg.com/high.jpg'}}
+        },
+        'statistics': statistics
+    }
+    if random.random() > 0.05:
+        if random.random() < 0.3:
+            duration = random.choice(ODD_DURATIONS)
+        else:
+            duration = f'PT{random.randint(0, 3)}H{random.randint(0, 59)}M{random.randint(0, 59)}S'
+        video['contentDetails'] = {'duration': duration}
+    return video
+
+
+def generate_channel(videos):
+    return {
+        'items': [{'id': 'UC1', 'snippet': {'title': 'Channel'}, 'statistics': {'subscriberCount': '5'}}],
+        'video_stats': {'items': [generate_video(index) for index in range(videos)]}
+    }
+
+
+def legacy_metrics_with_averages(data):
+    metrics = legacy_metrics.extract_account_metrics(data)
+    metrics['video_averages'] = legacy_metrics.calculate_video_averages(data['video_stats']['items'])
+    return metrics
+
+
+def legacy_run_youtube_analysis(data):
+    # run_youtube_analysis used to compute the averages a second time
+    metrics = legacy_metrics_with_averages(data)
+    metrics['video_averages'] = legacy_metrics.calculate_video_averages(data['video_stats']['items'])
+    return metrics
+
+
+def without_distribution_fields(metrics, legacy_keys):
+    metrics['video_averages'] = {key: value for key, value in metrics['video_averages'].items() if key in legacy_keys}
+    return metrics
+
+
+def median_ms(func, arg, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(arg)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--videos', type=int, default=10000, help='Videos in the timed channel')
+    parser.add_argument('--repeat', type=int, default=15, help='Runs per variant, the median is printed')
+    args = parser.parse_args()
+    random.seed(7)
+
+    legacy_keys = set(legacy_metrics.calculate_video_averages([]))
+    for videos in (0, 1, 7, 1000):
+        data = generate_channel(videos)
+        expected = json.dumps(legacy_metrics_with_averages(copy.deepcopy(data)))
+        actual = json.dumps(without_distribution_fields(youtube_analyzer.extract_account_metrics(copy.deepcopy(data)), legacy_keys))
+        if actual != expected:
+            sys.exit(f"Output differs from the original implementation for {videos} videos")
+    print("Output identical to the original implementation for 0, 1, 7 and 1000 videos")
+
+    data = generate_channel(args.videos)
+    videos = data['video_stats']['items']
+
+    def legacy_metric_math(_):
+        # The sum/max/min passes of the original extract_account_metrics, then calculate_video_averages
+        sum(int(video.get('statistics', {}).get('viewCount', 0)) for video in videos)
+        sum(int(video.get('statistics', {}).get('likeCount', 0)) for video in videos)
+        sum(int(video.get('statistics', {}).get('commentCount', 0)) for video in videos)
+        max(int(video.get('statistics', {}).get('viewCount', 0)) for video in videos)
+        min(int(video.get('statistics', {}).get('viewCount', 0)) for video in videos)
+        legacy_metrics.calculate_video_averages(videos)
+
+    def metric_math(_):
+        columns = youtube_analyzer.video_columns(videos)
+        youtube_analyzer.video_metrics_from_columns(columns)
+        youtube_analyzer.video_averages_from_columns(columns)
+
+    print(f"{args.videos} videos, median of {args.repeat} runs:")
+    print(f"  original extract_account_metrics + averages  {median_ms(legacy_metrics_with_averages, data, args.repeat):7.1f} ms")
+    print(f"  original, as run_youtube_analysis called it  {median_ms(legacy_run_youtube_analysis, data, args.repeat):7.1f} ms")
+    print(f"  extract_account_metrics                      {median_ms(youtube_analyzer.extract_account_metrics, data, args.repeat):7.1f} ms")
+    print(f"  metric math only: original {median_ms(legacy_metric_math, None, args.repeat):.1f} ms, "
+          f"columns {median_ms(metric_math, None, args.repeat):.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: view distribution statistics with the pure-Python and NumPy engines
+
+Generates channel histories with lognormal views, 1% viral videos, missing
+likes/comments and odd durations. Checks that the original fields match the
+original calculate_video_averages in legacy_metrics.py and that both engines
+give identical output, and compares the percentiles and standard deviation
+with NumPy's own. Then times the statistics step over prebuilt columns.
+The NumPy engine is only checked and timed when NumPy is installed.
+
+Usage:
+    python benchmarks/bench_video_stats.py [--repeat 11]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('CACHE_DB_PATH', os.path.join(tempfile.mkdtemp(), 'cache.db'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import legacy_metrics
+import youtube_analyzer
+
+ODD_DURATIONS = ['PT5M13S', 'PT1H2M3S', 'P1D', '', 'PT1.5S', 'garbage']
+
+
+def generate_video(index):
+    if random.random() < 0.01:
+        views = random.randint(10 ** 7, 5 * 10 ** 9)
+    else:
+        views = int(random.lognormvariate(9, 1.5))
+    statistics = {'viewCount': str(views)}
+    if random.random() > 0.1:
+        statistics['likeCount'] = str(views // random.randint(20, 80))
+    if random.random() > 0.2:
+        statistics['commentCount'] = str(views // random.randint(200, 900))
+    if random.random() < 0.1:
+        duration = random.choice(ODD_DURATIONS)
+    else:
+        duration = f'PT{random.randint(0, 59)}M{random.randint(0, 59)}S'
+    return {
+        'id': f'v{index}',
+        'snippet': {'publishedAt': '2024-01-01T00:00:00Z'},
+        'statistics': statistics,
+        'contentDetails': {'duration': duration}
+    }
+
+
+def generate_videos(count):
+    return [generate_video(index) for index in range(count)]
+
+
+def check(engines):
+    legacy_keys = list(legacy_metrics.calculate_video_averages([]))
+    sizes = [0, 1, 2, 3, 4, 5, 10, 99, 1000] + [random.randint(1, 3000) for _ in range(40)]
+    for size in sizes:
+        videos = generate_videos(size)
+        expected = legacy_metrics.calculate_video_averages(videos)
+        outputs = [youtube_analyzer.calculate_video_averages(videos, engine=engine) for engine in engines]
+        python_output = outputs[0]
+        if {key: python_output[key] for key in legacy_keys} != expected or \
+                any(type(python_output[key]) is not type(expected[key]) for key in legacy_keys):
+            sys.exit(f"Original fields differ from the original calculate_video_averages for {size} videos")
+        if any(json.dumps(output) != json.dumps(python_output) for output in outputs[1:]):
+            sys.exit(f"Engines disagree for {size} videos")
+    print(f"Checked {len(sizes)} histories: original fields unchanged" +
+          (", python and numpy engines identical" if len(engines) > 1 else ""))
+
+
+def check_against_numpy():
+    import numpy
+
+    videos = generate_videos(1000)
+    averages = youtube_analyzer.calculate_video_averages(videos, engine='python')
+    views = numpy.array([int(video['statistics']['viewCount']) for video in videos])
+    print(f"Against NumPy for 1000 videos: median exact {averages['median_views'] == numpy.median(views)}, "
+          f"p90 exact {averages['p90_views'] == numpy.percentile(views, 90)}, "
+          f"std relative difference {abs(averages['views_std'] - views.std()) / views.std():.1e}")
+
+
+def median_ms(func, arg, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(arg)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=11, help='Runs per variant, the median is printed')
+    args = parser.parse_args()
+    random.seed(3)
+
+    engines = ['python', 'numpy'] if youtube_analyzer.NUMPY_AVAILABLE else ['python']
+    if not youtube_analyzer.NUMPY_AVAILABLE:
+        print("NumPy is not installed, only the python engine is checked and timed")
+    check(engines)
+    if youtube_analyzer.NUMPY_AVAILABLE:
+        check_against_numpy()
+
+    for count in (10000, 100000):
+        videos = generate_videos(count)
+        columns = youtube_analyzer.video_columns(videos)
+        line = (f"{count} videos: original calculate_video_averages "
+                f"{median_ms(legacy_metrics.calculate_video_averages, videos, args.repeat):.1f} ms, "
+                f"video_columns {median_ms(youtube_analyzer.video_columns, videos, args.repeat):.1f} ms, stats")
+        for engine in engines:
+            elapsed = median_ms(lambda columns: youtube_analyzer.video_averages_from_columns(columns, engine), columns, args.repeat)
+            line += f" {engine} {elapsed:.2f} ms"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
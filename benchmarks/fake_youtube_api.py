@@ -0,0 +1,198 @@
+"""
+Local stand-in for the YouTube Data API used by the benchmarks
+
+Serves search.list, channels.list, playlistItems.list and videos.list with a
+fixed latency per HTTP request, answers batch requests, honours If-None-Match
+with 304 Not Modified, and can enforce a daily quota per API key. Every channel
+has UPLOADS_PER_CHANNEL uploads, one every 12 hours back from `now`; channel IDs
+ending in "missing" do not exist.
+"""
+import datetime
+import hashlib
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+UPLOADS_PER_CHANNEL = 300
+
+
+class FakeYouTubeAPI:
+    """
+    Threaded fake YouTube Data API server
+
+    Args:
+        latency (float): Seconds every HTTP request (batch or not) takes
+        now (datetime.datetime, optional): Time of the newest upload. Defaults to 6 hours ago,
+            so uploads do not sit exactly on date filter boundaries.
+        search_total (int): Number of results a search pages through
+        key_limits (dict, optional): Daily quota units per API key, unlimited if not listed
+    """
+
+    def __init__(self, latency=0.05, now=None, search_total=1000, key_limits=None):
+        self.latency = latency
+        self.now = now or datetime.datetime.now() - datetime.timedelta(hours=6)
+        self.search_total = search_total
+        self.key_limits = dict(key_limits or {})
+        self.key_used = {}
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    # API responses
+
+    def _upload_time(self, index):
+        return (self.now - datetime.timedelta(hours=12 * index)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    def _channels(self, query):
+        ids = [channel_id for channel_id in query['id'][0].split(',') if not channel_id.endswith('missing')]
+        return {
+            'kind': 'youtube#channelListResponse',
+            'pageInfo': {'totalResults': len(ids), 'resultsPerPage': len(ids)},
+            'items': [{
+                'id': channel_id,
+                'snippet': {'title': channel_id, 'description': 'd', 'publishedAt': '2020-01-01T00:00:00Z', 'thumbnails': {}},
+                'contentDetails': {'relatedPlaylists': {'uploads': 'UU' + channel_id[2:]}},
+                'statistics': {'subscriberCount': '1000', 'videoCount': str(UPLOADS_PER_CHANNEL), 'viewCount': '99999'}
+            } for channel_id in ids]
+        }
+
+    def _search(self, query):
+        size = int(query['maxResults'][0])
+        start = int(query.get('pageToken', ['0'])[0])
+        response = {'items': [{'snippet': {'channelId': f'UC{i}'}} for i in range(start, min(start + size, self.search_total))]}
+        if start + size < self.search_total:
+            response['nextPageToken'] = str(start + size)
+        return response
+
+    def _playlist_items(self, query):
+        channel = query['playlistId'][0][2:]
+        start = int(query.get('pageToken', ['0'])[0])
+        size = int(query.get('maxResults', ['5'])[0])
+        items = [{
+            'snippet': {'publishedAt': self._upload_time(i), 'title': f't{i}'},
+            'contentDetails': {'videoId': f'{channel}_v{i}', 'videoPublishedAt': self._upload_time(i)}
+        } for i in range(start, min(start + size, UPLOADS_PER_CHANNEL))]
+        response = {'items': items, 'pageInfo': {'totalResults': UPLOADS_PER_CHANNEL, 'resultsPerPage': size}}
+        if start + size < UPLOADS_PER_CHANNEL:
+            response['nextPageToken'] = str(start + size)
+        return response
+
+    def _videos(self, query):
+        items = []
+        for video_id in query['id'][0].split(','):
+            channel, index = video_id.rsplit('_v', 1)
+            index = int(index)
+            items.append({
+                'id': video_id,
+                'snippet': {'title': f't{index}', 'publishedAt': self._upload_time(index), 'description': 'x',
+                            'thumbnails': {}, 'channelTitle': channel, 'tags': ['a']},
+                'contentDetails': {'duration': f'PT{index % 50}M{index % 60}S'},
+                'statistics': {'viewCount': str(1000 + (index * 7) % 5000), 'likeCount': str(index * 3),
+                               'commentCount': str(index)}
+            })
+        return {'items': items}
+
+    def respond(self, url, if_none_match=None):
+        """
+        Answer one API request
+
+        Returns:
+            tuple: (HTTP status, response body bytes)
+        """
+        query = parse_qs(url.query)
+        api_key = query.get('key', [None])[0]
+        cost = 100 if url.path.endswith('/search') else 1
+        with self._lock:
+            if api_key in self.key_limits and self.key_used.get(api_key, 0) + cost > self.key_limits[api_key]:
+                error = {'error': {'code': 403, 'message': 'quota',
+                                   'errors': [{'reason': 'quotaExceeded', 'domain': 'youtube.quota'}]}}
+                return 403, json.dumps(error).encode()
+            self.key_used[api_key] = self.key_used.get(api_key, 0) + cost
+
+        endpoint = url.path.rsplit('/', 1)[-1]
+        handler = {'channels': self._channels, 'search': self._search,
+                   'playlistItems': self._playlist_items, 'videos': self._videos}.get(endpoint)
+        if handler is None:
+            return 404, json.dumps({'error': {'code': 404, 'message': 'unknown endpoint'}}).encode()
+        data = handler(query)
+        data['etag'] = '"' + hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest() + '"'
+        if if_none_match and if_none_match == data['etag']:
+            with self._lock:
+                self.not_modified += 1
+            return 304, b''
+        return 200, json.dumps(data).encode()
+
+    # Server
+
+    def start(self):
+        """Start serving on a free local port in a background thread"""
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body, content_type='application/json'):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                api._count_request()
+                status, body = api.respond(urlparse(self.path), self.headers.get('If-None-Match'))
+                self._send(status, body)
+
+            def do_POST(self):
+                api._count_request()
+                body = self.rfile.read(int(self.headers['Content-Length'])).decode()
+                boundary = re.search(r'boundary="?([^";]+)"?', self.headers['Content-Type']).group(1)
+                parts = [part for part in body.split('--' + boundary) if part.strip() and part.strip() != '--']
+                out = []
+                for part in parts:
+                    content_id = re.search(r'Content-ID: <(.+?)>', part).group(1)
+                    url = urlparse(re.search(r'^GET (\S+) HTTP', part, re.M).group(1))
+                    match = re.search(r'^if-none-match: (.+?)\r?$', part, re.M | re.I)
+                    status, payload = api.respond(url, match.group(1).strip() if match else None)
+                    payload = payload.decode()
+                    reason = {200: 'OK', 304: 'Not Modified', 403: 'Forbidden', 404: 'Not Found'}[status]
+                    out.append(f'--batch_response\r\nContent-Type: application/http\r\nContent-ID: <response-{content_id}>\r\n\r\n'
+                               f'HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n'
+                               f'Content-Length: {len(payload)}\r\n\r\n{payload}\r\n')
+                self._send(200, (''.join(out) + '--batch_response--\r\n').encode(),
+                           'multipart/mixed; boundary=batch_response')
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            request_queue_size = 512
+
+        self._server = Server(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def _count_request(self):
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            threading.Event().wait(self.latency)
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def base_url(self):
+        return f'http://127.0.0.1:{self._server.server_port}/youtube/v3/'
+
+    def point(self, youtube_analyzer):
+        """Make youtube_analyzer's googleapiclient clients send their requests to this server"""
+        document = dict(youtube_analyzer._get_discovery_document())
+        document['rootUrl'] = document['baseUrl'] = f'http://127.0.0.1:{self._server.server_port}/'
+        youtube_analyzer._youtube_discovery_document = document
+        youtube_analyzer._youtube_clients.__dict__.clear()
@@ -0,0 +1,222 @@
+"""
+The video metric functions as they were before video_columns
+
+Verbatim copies of extract_account_metrics and calculate_video_averages from
+before metrics were computed from columns, kept so the benchmarks can check the
+current implementation against them and time both.
+"""
+
+
+def extract_account_metrics(data):
+    """
+    Extract metrics from YouTube channel data
+
+    Args:
+        data (dict): The YouTube API response data
+
+    Returns:
+        dict: Dictionary of metrics
+    """
+    metrics = {}
+
+    if not data or 'items' not in data or not data['items']:
+        return metrics
+
+    channel = data['items'][0]
+    snippet = channel.get('snippet', {})
+    statistics = channel.get('statistics', {})
+
+    # Extract channel info
+    # Get thumbnail URLs (different sizes available)
+    thumbnails = snippet.get('thumbnails', {})
+    profile_picture_url = thumbnails.get('high', {}).get('url',
+                         thumbnails.get('medium', {}).get('url',
+                         thumbnails.get('default', {}).get('url', 'Unknown')))
+
+    metrics['channel_info'] = {
+        'id': channel.get('id', 'Unknown'),
+        'title': snippet.get('title', 'Unknown'),
+        'custom_url': snippet.get('customUrl', 'Unknown'),
+        'country': snippet.get('country', 'N/A'),
+        'published_at': snippet.get('publishedAt', 'Unknown'),
+        'subscriber_count': int(statistics.get('subscriberCount', 0)),
+        'video_count': int(statistics.get('videoCount', 0)),
+        'total_views': int(statistics.get('viewCount', 0)),
+        'profile_picture_url': profile_picture_url
+    }
+
+    # Extract video metrics if available
+    if 'video_stats' in data and 'items' in data['video_stats']:
+        videos = data['video_stats']['items']
+
+        if videos:
+            # Calculate video metrics
+            total_views = sum(int(video.get('statistics', {}).get('viewCount', 0)) for video in videos)
+            total_likes = sum(int(video.get('statistics', {}).get('likeCount', 0)) for video in videos)
+            total_comments = sum(int(video.get('statistics', {}).get('commentCount', 0)) for video in videos)
+
+            # Calculate averages
+            avg_views = total_views / len(videos) if videos else 0
+            avg_likes = total_likes / len(videos) if videos else 0
+            avg_comments = total_comments / len(videos) if videos else 0
+
+            # Calculate engagement rate (likes + comments) / views
+            engagement_rate = (total_likes + total_comments) / total_views if total_views > 0 else 0
+
+            # Find max and min views
+            max_views = max(int(video.get('statistics', {}).get('viewCount', 0)) for video in videos) if videos else 0
+            min_views = min(int(video.get('statistics', {}).get('viewCount', 0)) for video in videos) if videos else 0
+
+            # Store metrics
+            metrics['video_metrics'] = {
+                'analyzed_videos_count': len(videos),
+                'avg_views': avg_views,
+                'max_views': max_views,
+                'min_views': min_views,
+                'total_views': total_views,
+                'avg_likes': avg_likes,
+                'avg_comments': avg_comments,
+                'engagement_rate': engagement_rate
+            }
+
+            # Extract recent videos
+            recent_videos = []
+            for video in videos:
+                snippet = video.get('snippet', {})
+                statistics = video.get('statistics', {})
+                video_id = video.get('id', 'Unknown')
+
+                # Create video URL from video ID
+                video_url = f"https://www.youtube.com/watch?v={video_id}" if video_id != 'Unknown' else 'Unknown'
+
+                # Get thumbnail URLs (different sizes available)
+                thumbnails = snippet.get('thumbnails', {})
+                thumbnail_url = thumbnails.get('high', {}).get('url',
+                               thumbnails.get('medium', {}).get('url',
+                               thumbnails.get('default', {}).get('url', 'Unknown')))
+
+                recent_videos.append({
+                    'title': snippet.get('title', 'Unknown'),
+                    'published_at': snippet.get('publishedAt', 'Unknown'),
+                    'views': int(statistics.get('viewCount', 0)),
+                    'likes': int(statistics.get('likeCount', 0)),
+                    'comments': int(statistics.get('commentCount', 0)),
+                    'video_id': video_id,
+                    'video_url': video_url,
+                    'thumbnail_url': thumbnail_url
+                })
+
+            # Sort by published date (newest first)
+            recent_videos.sort(key=lambda x: x['published_at'], reverse=True)
+            metrics['recent_videos'] = recent_videos
+
+    return metrics
+
+
+def calculate_video_averages(videos):
+    """
+    Calculate detailed average statistics for a list of YouTube videos.
+
+    Args:
+        videos (list): List of video data from YouTube API
+
+    Returns:
+        dict: Dictionary containing average statistics and metrics
+    """
+    if not videos:
+        return {
+            "count": 0,
+            "avg_views": 0,
+            "avg_likes": 0,
+            "avg_comments": 0,
+            "engagement_rate": 0,
+            "max_views": 0,
+            "min_views": 0,
+            "avg_duration_seconds": 0,
+            "like_to_view_ratio": 0,
+            "comment_to_view_ratio": 0
+        }
+
+    # Initialize counters
+    total_views = 0
+    total_likes = 0
+    total_comments = 0
+    total_duration_seconds = 0
+    view_counts = []
+
+    # Process each video
+    for video in videos:
+        statistics = video.get('statistics', {})
+        content_details = video.get('contentDetails', {})
+
+        # Extract view count
+        view_count = int(statistics.get('viewCount', 0))
+        view_counts.append(view_count)
+        total_views += view_count
+
+        # Extract like count
+        total_likes += int(statistics.get('likeCount', 0))
+
+        # Extract comment count
+        total_comments += int(statistics.get('commentCount', 0))
+
+        # Extract duration if available
+        duration = content_details.get('duration', '')
+        if duration:
+            try:
+                # Convert ISO 8601 duration to seconds
+                # Example: PT5M13S (5 minutes, 13 seconds)
+                duration_seconds = 0
+
+                # Extract hours
+                if 'H' in duration:
+                    hours_part = duration.split('H')[0].split('T')[1]
+                    duration_seconds += int(hours_part) * 3600
+                    duration = duration.split('H')[1]
+                else:
+                    duration = duration.split('T')[1]
+
+                # Extract minutes
+                if 'M' in duration:
+                    minutes_part = duration.split('M')[0]
+                    duration_seconds += int(minutes_part) * 60
+                    duration = duration.split('M')[1]
+
+                # Extract seconds
+                if 'S' in duration:
+                    seconds_part = duration.split('S')[0]
+                    duration_seconds += int(seconds_part)
+
+                total_duration_seconds += duration_seconds
+            except Exception:
+                # Skip if duration parsing fails
+                pass
+
+    # Calculate averages
+    count = len(videos)
+    avg_views = total_views / count if count > 0 else 0
+    avg_likes = total_likes / count if count > 0 else 0
+    avg_comments = total_comments / count if count > 0 else 0
+    avg_duration_seconds = total_duration_seconds / count if count > 0 else 0
+
+    # Calculate engagement metrics
+    engagement_rate = (total_likes + total_comments) / total_views if total_views > 0 else 0
+    like_to_view_ratio = total_likes / total_views if total_views > 0 else 0
+    comment_to_view_ratio = total_comments / total_views if total_views > 0 else 0
+
+    # Find max and min views
+    max_views = max(view_counts) if view_counts else 0
+    min_views = min(view_counts) if view_counts else 0
+
+    return {
+        "count": count,
+        "avg_views": avg_views,
+        "avg_likes": avg_likes,
+        "avg_comments": avg_comments,
+        "engagement_rate": engagement_rate,
+        "max_views": max_views,
+        "min_views": min_views,
+        "avg_duration_seconds": avg_duration_seconds,
+        "like_to_view_ratio": like_to_view_ratio,
+        "comment_to_view_ratio": comment_to_view_ratio
+    }
@@ -0,0 +1,108 @@
+import argparse
+import os
+import signal
+import socket
+import threading
+import traceback
+
+import youtube_analyzer
+
+
+def worker_loop(name, stop_event, poll_interval=0.5, verbose=False):
+    """
+    Claim links extraction jobs from the queue and run them until stopped
+
+    Args:
+        name (str): Name recorded on claimed jobs
+        stop_event (threading.Event): Set to stop the loop
+        poll_interval (float, optional): Seconds to wait when the queue is empty
+        verbose (bool, optional): Whether to print scraping status messages
+    """
+    queue = youtube_analyzer.scrape_job_queue
+
+    while not stop_event.is_set():
+        try:
+            job = queue.claim(worker=name)
+        except Exception as e:
+            print(f"[{name}] Error claiming job: {e}")
+            stop_event.wait(poll_interval)
+            continue
+
+        if job is None:
+            stop_event.wait(poll_interval)
+            continue
+
+        job_id, payload = job
+        if verbose:
+            print(f"[{name}] Running job {job_id}: {payload}")
+        try:
+            # Scrape in this process, the browsers live here and not in the API workers
+            result = youtube_analyzer.get_channel_links_playwright(verbose=verbose, dispatch='inline', **payload)
+            queue.complete(job_id, result)
+        except Exception as e:
+            print(f"[{name}] Job {job_id} failed: {e}")
+            print(traceback.format_exc())
+            queue.fail(job_id, e)
+
+
+def run_worker(threads=None, poll_interval=0.5, verbose=False):
+    """
+    Run the scraper worker until SIGINT or SIGTERM
+
+    Args:
+        threads (int, optional): Number of jobs processed at the same time. Defaults to BROWSER_POOL_SIZE.
+        poll_interval (float, optional): Seconds to wait when the queue is empty
+        verbose (bool, optional): Whether to print scraping status messages
+    """
+    threads = threads or youtube_analyzer.BROWSER_POOL_SIZE
+    stop_event = threading.Event()
+
+    def handle_signal(signum, frame):
+        print("Stopping scraper worker...")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    base_name = f"{socket.gethostname()}-{os.getpid()}"
+    names = [f"{base_name}-{i}" for i in range(threads)]
+    workers = []
+    for name in names:
+        worker = threading.Thread(target=worker_loop, args=(name, stop_event, poll_interval, verbose), daemon=True)
+        worker.start()
+        workers.append(worker)
+
+    print(f"Scraper worker started with {threads} threads, queue: {youtube_analyzer.scrape_job_queue.path}")
+
+    # Housekeeping: keep this process's jobs alive, retry jobs abandoned by a crashed
+    # worker and drop old results. Heartbeats go out several times per timeout.
+    while not stop_event.wait(youtube_analyzer.SCRAPER_HEARTBEAT_TIMEOUT / 3):
+        try:
+            youtube_analyzer.scrape_job_queue.heartbeat(names)
+            requeued = youtube_analyzer.scrape_job_queue.requeue_stale()
+            if requeued:
+                print(f"Requeued or failed {requeued} stale jobs")
+            youtube_analyzer.scrape_job_queue.purge()
+        except Exception as e:
+            print(f"Error during queue housekeeping: {e}")
+
+    for worker in workers:
+        worker.join(timeout=youtube_analyzer.SCRAPER_JOB_TIMEOUT)
+    youtube_analyzer.shutdown_browser_pools()
+
+
+def main():
+    """
+    Parse command-line arguments and start the scraper worker
+    """
+    parser = argparse.ArgumentParser(description='YouTube channel links scraper worker')
+    parser.add_argument('--threads', type=int, help='Number of jobs processed at the same time (default: BROWSER_POOL_SIZE)')
+    parser.add_argument('--poll-interval', type=float, default=0.5, help='Seconds to wait when the queue is empty')
+    parser.add_argument('--verbose', action='store_true', help='Print scraping status messages')
+    args = parser.parse_args()
+
+    run_worker(threads=args.threads, poll_interval=args.poll_interval, verbose=args.verbose)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+import httplib2
+import pytest
+from googleapiclient.discovery import build_from_document
+
+# Keep the caches and the scrape job queue of the tests out of the real database
+os.environ.setdefault('CACHE_DB_PATH', os.path.join(tempfile.mkdtemp(prefix='youtube-analyzer-tests-'), 'cache.db'))
+os.environ.setdefault('YOUTUBE_QUOTA_PER_MINUTE', '0')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import youtube_analyzer  # noqa: E402
+
+
+class StubHttp:
+    """
+    httplib2 stand-in answering YouTube API requests offline
+
+    quota_exceeded holds the API keys answered with a 403 quotaExceeded error,
+    delays the seconds the next requests take to answer.
+    """
+
+    def __init__(self, quota_exceeded=()):
+        self.requests = []
+        self.quota_exceeded = set(quota_exceeded)
+        self.delays = []
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        self.requests.append(uri)
+        if self.delays:
+            time.sleep(self.delays.pop(0))
+        if any(f'key={api_key}' in uri for api_key in self.quota_exceeded):
+            error = {'error': {'code': 403, 'message': 'quota', 'errors': [{'reason': 'quotaExceeded', 'domain': 'youtube.quota'}]}}
+            return httplib2.Response({'status': 403}), json.dumps(error).encode()
+        if '/search' in uri:
+            data = {'items': [{'snippet': {'channelId': 'UCstubchannel00000000001'}}]}
+        elif '/playlistItems' in uri:
+            data = {'etag': '"uploads"', 'items': []}
+        else:
+            data = {
+                'kind': 'youtube#channelListResponse',
+                'etag': '"channels"',
+                'pageInfo': {'totalResults': 1, 'resultsPerPage': 5},
+                'items': [{'id': 'UCstubchannel00000000001', 'snippet': {'title': 'Stub'}, 'statistics': {},
+                           'contentDetails': {'relatedPlaylists': {'uploads': 'UUstubchannel00000000001'}}}]
+            }
+        return httplib2.Response({'status': 200}), json.dumps(data).encode()
+
+
+@pytest.fixture
+def stub_api(monkeypatch, tmp_path):
+    """Route every API call through StubHttp, with a fresh ledger of 250 units per key"""
+    http = StubHttp()
+    clients = {}
+
+    def get_youtube_client(api_key=None):
+        if api_key not in clients:
+            clients[api_key] = build_from_document(youtube_analyzer._get_discovery_document(), developerKey=api_key, http=http)
+        return clients[api_key]
+
+    monkeypatch.setattr(youtube_analyzer, 'get_youtube_client', get_youtube_client)
+    monkeypatch.setattr(youtube_analyzer, 'YOUTUBE_API_RETRIES', 0)
+    monkeypatch.setattr(youtube_analyzer, 'quota_ledger', youtube_analyzer.QuotaLedger(
+        api_keys=['key-a'], daily_budget=250, per_minute=0, path=str(tmp_path / 'quota.db')))
+    return http
@@ -0,0 +1,40 @@
+import youtube_analyzer
+
+
+class PartialBatch:
+    """Batch request whose response only answers the first call"""
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id=None):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        request_id, request = self.requests[0]
+        self.callback(request_id, request.execute(), None)
+
+
+def test_unanswered_batch_calls_are_sent_individually(stub_api, monkeypatch):
+    client = youtube_analyzer.get_youtube_client('key-a')
+    monkeypatch.setattr(client, 'new_batch_http_request', lambda callback: PartialBatch(callback), raising=False)
+    stats = {}
+    calls = [('channels.list', {'part': 'snippet', 'id': f'UC{i}'}) for i in range(2)]
+
+    results = youtube_analyzer.execute_api_batch(calls, stats=stats, full=True)
+
+    assert [error for _, error in results] == [None, None]
+    assert [response['items'][0]['id'] for response, _ in results] == ['UCstubchannel00000000001'] * 2
+    assert stats['retries'] == 1
+
+
+def test_batch_results_keep_channel_response_fields(stub_api, monkeypatch):
+    # StubHttp does not answer multipart batches, send the playlist calls one by one
+    monkeypatch.setattr(youtube_analyzer, 'execute_api_batch', lambda calls, stats=None, full=False: [
+        (youtube_analyzer.execute_api_call(method, stats=stats, full=full, **params), None) for method, params in calls
+    ])
+    data = youtube_analyzer.retrieve_youtube_data_batch(['UCstubchannel00000000001'], verbose=False, full=True)
+    single = youtube_analyzer.retrieve_youtube_data(channel_id='UCstubchannel00000000001', verbose=False, full=True)
+
+    assert data['UCstubchannel00000000001'] == single
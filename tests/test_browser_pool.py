@@ -0,0 +1,91 @@
+import threading
+
+import pytest
+
+import youtube_analyzer
+
+
+class FakeContext:
+    def close(self):
+        pass
+
+
+class FakeBrowser:
+    def new_context(self, **options):
+        return FakeContext()
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        pass
+
+
+class FakePlaywright:
+    def __init__(self, launch_error=None):
+        self.launch_error = launch_error
+        self.chromium = self
+
+    def launch(self, headless=True):
+        if self.launch_error:
+            raise self.launch_error
+        return FakeBrowser()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def test_startup_failure_fails_queued_jobs(monkeypatch):
+    def broken_sync_playwright():
+        raise RuntimeError("driver missing")
+
+    monkeypatch.setattr(youtube_analyzer, 'sync_playwright', broken_sync_playwright, raising=False)
+    pool = youtube_analyzer.BrowserPool(size=2)
+
+    with pytest.raises(RuntimeError, match="driver missing"):
+        pool.run(lambda context: 'links', timeout=5)
+    # Later calls start new workers and fail the same way instead of hanging
+    with pytest.raises(RuntimeError, match="driver missing"):
+        pool.run(lambda context: 'links', timeout=5)
+
+
+def test_launch_failure_fails_only_that_job(monkeypatch):
+    playwright = FakePlaywright(launch_error=RuntimeError("no chromium"))
+    monkeypatch.setattr(youtube_analyzer, 'sync_playwright', lambda: playwright, raising=False)
+    pool = youtube_analyzer.BrowserPool(size=1)
+
+    with pytest.raises(RuntimeError, match="no chromium"):
+        pool.run(lambda context: 'links', timeout=5)
+    playwright.launch_error = None
+    assert pool.run(lambda context: 'links', timeout=5) == 'links'
+    pool.shutdown()
+
+
+def test_run_times_out(monkeypatch):
+    monkeypatch.setattr(youtube_analyzer, 'sync_playwright', FakePlaywright, raising=False)
+    pool = youtube_analyzer.BrowserPool(size=1)
+    release = threading.Event()
+
+    with pytest.raises(TimeoutError):
+        pool.run(lambda context: release.wait(5), timeout=0.2)
+    release.set()
+    pool.shutdown()
+
+
+def test_stats_count_pages_across_workers(monkeypatch):
+    monkeypatch.setattr(youtube_analyzer, 'sync_playwright', FakePlaywright, raising=False)
+    pool = youtube_analyzer.BrowserPool(size=4, max_pages=3)
+
+    threads = [threading.Thread(target=pool.run, args=(lambda context: None,)) for _ in range(40)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pool.shutdown()
+
+    assert pool.stats['pages'] == 40
+    # Every worker that served a page launched once, plus once per recycle
+    assert 1 <= pool.stats['launches'] - pool.stats['recycles'] <= 4
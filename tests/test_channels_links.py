@@ -0,0 +1,73 @@
+import youtube_analyzer
+
+
+def test_links_not_cached_without_playwright(monkeypatch):
+    monkeypatch.setattr(youtube_analyzer, 'PLAYWRIGHT_AVAILABLE', False)
+    channel_id = 'UCnoplaywright000000000'
+    key = youtube_analyzer._links_cache_key_for_identifier(channel_id)
+
+    results = youtube_analyzer.get_channels_links([channel_id], mode='browser')
+
+    assert results[0]['links'] == []
+    assert results[0]['error'] == "Playwright is not available"
+    assert youtube_analyzer.get_cached_links(key) is None
+
+
+class RecordingQueue:
+    def __init__(self):
+        self.payloads = []
+
+    def submit(self, payload, timeout=None):
+        self.payloads.append(payload)
+        return len(self.payloads)
+
+    def wait(self, job_id, timeout=None):
+        return youtube_analyzer.get_channel_links_playwright(dispatch='inline', verbose=False, **self.payloads[job_id - 1])
+
+
+def test_custom_url_jobs_scrape_custom_url_page(monkeypatch):
+    queue = RecordingQueue()
+    scraped = []
+    monkeypatch.setattr(youtube_analyzer, 'scrape_job_queue', queue)
+    monkeypatch.setattr(youtube_analyzer, 'extract_channel_links',
+                        lambda url, **kwargs: scraped.append(url) or youtube_analyzer._empty_links_result(url))
+
+    youtube_analyzer.get_channels_links(['https://www.youtube.com/c/SomeCustomName'], mode='http', dispatch='worker')
+
+    assert queue.payloads[0]['custom_url'] == 'SomeCustomName'
+    assert 'username' not in queue.payloads[0]
+    assert scraped == ['https://www.youtube.com/c/SomeCustomName/about']
+    assert youtube_analyzer.get_cached_links('c:somecustomname') is not None
+
+
+def test_identifier_to_channel_kwargs():
+    kwargs = youtube_analyzer._identifier_to_channel_kwargs
+    assert kwargs('https://www.youtube.com/c/Name') == {'custom_url': 'Name'}
+    assert kwargs('https://www.youtube.com/user/Name') == {'username': 'Name'}
+    assert kwargs('https://www.youtube.com/@name') == {'handle': '@name'}
+    assert kwargs('https://www.youtube.com/channel/UCexamplechannel0000000a') == {'channel_id': 'UCexamplechannel0000000a'}
+
+
+def test_stuck_browser_batch_times_out(monkeypatch):
+    engine = youtube_analyzer.AsyncLinksEngine()
+    cancelled = []
+
+    async def scrape_many(identifiers, verbose=False):
+        try:
+            await youtube_analyzer.asyncio.sleep(30)
+        except youtube_analyzer.asyncio.CancelledError:
+            cancelled.append(identifiers)
+            raise
+
+    monkeypatch.setattr(engine, 'scrape_many', scrape_many)
+    monkeypatch.setattr(youtube_analyzer, 'PLAYWRIGHT_AVAILABLE', True)
+    monkeypatch.setattr(youtube_analyzer, 'BROWSER_JOB_TIMEOUT', 0.2)
+    monkeypatch.setattr(youtube_analyzer, 'get_links_engine', lambda headless=True: engine)
+    channel_id = 'UCstuckbrowser0000000000'
+
+    results = youtube_analyzer.get_channels_links([channel_id], mode='browser')
+
+    assert results[0]['links'] == []
+    assert "did not finish within 0.2 seconds" in results[0]['error']
+    engine.shutdown()
+    assert cancelled == [[channel_id]]
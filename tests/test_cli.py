@@ -0,0 +1,38 @@
+import youtube_analyzer
+
+
+def run_search(monkeypatch, pages, error):
+    def iter_search_pages(query, max_results=5, quota_budget=None):
+        yield from pages
+        raise error
+
+    exported = []
+    monkeypatch.setattr(youtube_analyzer, 'iter_search_pages', iter_search_pages)
+    monkeypatch.setattr(youtube_analyzer, 'analyze_search_results',
+                        lambda channels, **kwargs: {channel['channel_id']: {'channel': channel} for channel in channels})
+    monkeypatch.setattr(youtube_analyzer, 'export_to_json',
+                        lambda results, query, output=None: exported.append(dict(results)) or 'results.json')
+    monkeypatch.setattr('sys.argv', ['youtube_analyzer.py', 'search', 'cooking', '--no-links'])
+    youtube_analyzer.main()
+    return exported
+
+
+def test_search_reports_network_errors(monkeypatch, capsys):
+    exported = run_search(monkeypatch, [], ConnectionError("network is unreachable"))
+
+    output = capsys.readouterr().out
+    assert "Error searching for channels: network is unreachable" in output
+    assert "No channels found matching your search query." in output
+    assert exported == []
+
+
+def test_search_reports_quota_and_exports_analyzed_pages(monkeypatch, capsys):
+    page = [{'channel_id': 'UC1', 'title': 'One'}]
+    error = youtube_analyzer.QuotaExceededError("Daily YouTube API quota exceeded", retry_after=59.5)
+
+    exported = run_search(monkeypatch, [page], error)
+
+    output = capsys.readouterr().out
+    assert "YouTube API quota exceeded: Daily YouTube API quota exceeded" in output
+    assert "Try again in 60 seconds" in output
+    assert list(exported[0]) == ['UC1']
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+import youtube_analyzer
+
+URL = 'https://www.youtube.com/channel/UCconsent000000000000001/about'
+
+
+class FakeButton:
+    def __init__(self, page):
+        self.page = page
+        self.first = self
+
+    def is_visible(self):
+        return self.page.dialog
+
+    def click(self):
+        if self.page.click_error:
+            raise self.page.click_error
+        self.page.clicked = True
+
+
+class FakePage:
+    def __init__(self, dialog=False, click_error=None):
+        self.dialog = dialog
+        self.click_error = click_error
+        self.clicked = False
+
+    def goto(self, url, **kwargs):
+        pass
+
+    def wait_for_selector(self, selector, timeout=None):
+        pass
+
+    def locator(self, selector):
+        return FakeButton(self)
+
+    def evaluate(self, script, arg=None):
+        return {'channel_name': 'Consent', 'links': []}
+
+    def close(self):
+        pass
+
+
+class FakeContext:
+    def __init__(self, page):
+        self.page = page
+
+    def new_page(self):
+        return self.page
+
+    def storage_state(self):
+        return {'cookies': [{'name': 'SOCS'}], 'origins': []}
+
+
+@pytest.fixture
+def consent_path(monkeypatch, tmp_path):
+    path = tmp_path / 'consent_state.json'
+    monkeypatch.setattr(youtube_analyzer, 'CONSENT_STATE_PATH', str(path))
+    return path
+
+
+def scrape(page):
+    return youtube_analyzer._scrape_about_page(FakeContext(page), URL, verbose=False)
+
+
+def test_saved_state_alone_does_not_report_consent_skipped(consent_path):
+    consent_path.write_text('{}')
+
+    assert scrape(FakePage(dialog=False))['consent'] == 'not_shown'
+
+
+def test_clicked_dialog_is_accepted_and_saved(consent_path):
+    page = FakePage(dialog=True)
+
+    assert scrape(page)['consent'] == 'accepted'
+    assert page.clicked
+    assert json.loads(consent_path.read_text())['cookies'] == [{'name': 'SOCS'}]
+
+
+def test_dialog_that_could_not_be_clicked_is_not_accepted(consent_path):
+    result = scrape(FakePage(dialog=True, click_error=RuntimeError('detached')))
+
+    assert result['consent'] == 'not_accepted'
+    assert not consent_path.exists()
@@ -0,0 +1,26 @@
+import youtube_analyzer
+
+CHANNEL = {'id': 'UCincremental00000000001', 'contentDetails': {'relatedPlaylists': {'uploads': 'UUincremental00000000001'}}}
+
+
+def fake_execute_api_call(method, stats=None, full=False, **params):
+    if method == 'playlistItems.list':
+        return {'items': [
+            {'contentDetails': {'videoId': f'v{i}'}, 'snippet': {'publishedAt': f'2024-01-{20 - i:02d}T00:00:00Z'}}
+            for i in range(3)
+        ]}
+    return {'items': [{'id': video_id, 'statistics': {'viewCount': '1'}} for video_id in params['id'].split(',')]}
+
+
+def test_channel_state_lookups_are_counted_once(monkeypatch, tmp_path):
+    cache = youtube_analyzer.SQLiteCache('channel_state', ttl=3600, path=str(tmp_path / 'state.db'))
+    monkeypatch.setattr(youtube_analyzer, 'channel_state', cache)
+    monkeypatch.setattr(youtube_analyzer, 'execute_api_call', fake_execute_api_call)
+
+    youtube_analyzer.retrieve_uploads_incremental(CHANNEL)
+    youtube_analyzer.retrieve_uploads_incremental(CHANNEL)
+    # Stored without full resources, so this one cannot reuse the state
+    youtube_analyzer.retrieve_uploads_incremental(CHANNEL, full=True)
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (1, 2)
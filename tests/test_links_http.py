@@ -0,0 +1,120 @@
+import json
+import os
+
+import pytest
+
+import youtube_analyzer
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, text):
+        self.text = text
+        self.urls = []
+
+    def get(self, url, timeout=None):
+        self.urls.append(url)
+        return FakeResponse(self.text)
+
+
+def test_parse_yt_initial_data_var_assignment():
+    data = youtube_analyzer.parse_yt_initial_data(read_fixture('about_view_model.html'))
+
+    assert data['metadata']['channelMetadataRenderer']['externalId'] == 'UCexamplechannel0000000a'
+    # The JSON is read to its end even with ';' and '</b>' inside strings
+    assert data['metadata']['channelMetadataRenderer']['description'] == 'Reviews; tutorials </b> and "news".'
+
+
+def test_parse_yt_initial_data_window_assignment():
+    data = youtube_analyzer.parse_yt_initial_data(read_fixture('about_legacy.html'))
+
+    assert data['metadata']['channelMetadataRenderer']['externalId'] == 'UClegacychannel00000000b'
+
+
+def test_parse_yt_initial_data_missing():
+    assert youtube_analyzer.parse_yt_initial_data(read_fixture('about_no_initial_data.html')) is None
+    assert youtube_analyzer.parse_yt_initial_data('<script>var ytInitialData = {"broken": </script>') is None
+
+
+def test_extract_links_from_about_channel_view_model():
+    data = youtube_analyzer.parse_yt_initial_data(read_fixture('about_view_model.html'))
+
+    result = youtube_analyzer.extract_links_from_initial_data(data, 'https://www.youtube.com/@examplechan/about')
+
+    assert result['channel_name'] == 'Example Channel'
+    assert result['channel_id'] == '@examplechan'
+    assert result['subscriber_count'] == '1.23M subscribers'
+    assert result['description'].startswith('Reviews; tutorials')
+    assert result['links'] == [
+        {'text': 'twitter.com/examplechan',
+         'url': 'https://www.youtube.com/redirect?event=channel_description&redir_token=QUFFLUhqbQ'
+                '&q=https%3A%2F%2Ftwitter.com%2Fexamplechan'},
+        {'text': 'example.com', 'url': 'https://example.com/'},
+        {'text': 'youtube.com/@examplechan/store', 'url': 'https://www.youtube.com/@examplechan/store'},
+    ]
+    assert youtube_analyzer.extract_direct_url(result['links'][0]['url']) == 'https://twitter.com/examplechan'
+
+
+def test_extract_links_from_legacy_about_renderer():
+    data = youtube_analyzer.parse_yt_initial_data(read_fixture('about_legacy.html'))
+
+    result = youtube_analyzer.extract_links_from_initial_data(
+        data, 'https://www.youtube.com/channel/UClegacychannel00000000b/about')
+
+    assert result['channel_name'] == 'Legacy Channel'
+    assert result['channel_id'] == 'UClegacychannel00000000b'
+    assert result['subscriber_count'] == '10.5K subscribers'
+    assert result['description'] == 'An older about page.'
+    # Links without a URL are skipped
+    assert result['links'] == [
+        {'text': 'Instagram', 'url': 'https://www.instagram.com/legacychan/'},
+        {'text': 'Website', 'url': 'https://legacy.example.org'},
+    ]
+
+
+def test_extract_links_without_about_section():
+    assert youtube_analyzer.extract_links_from_initial_data({'metadata': {}}, 'https://www.youtube.com/@x/about') is None
+
+
+def test_get_channel_links_http_from_fixture(monkeypatch):
+    session = FakeSession(read_fixture('about_view_model.html'))
+    monkeypatch.setattr(youtube_analyzer, 'get_http_session', lambda: session)
+
+    result = youtube_analyzer.get_channel_links_http('@examplechan', verbose=False)
+
+    assert session.urls == ['https://www.youtube.com/@examplechan/about']
+    assert result['source'] == 'http'
+    assert len(result['links']) == 3
+
+
+@pytest.mark.parametrize('about', [
+    {'links': 'not a list'},
+    {'links': [{'channelExternalLinkViewModel': None}]},
+])
+def test_auto_mode_falls_back_to_browser_when_initial_data_changed(monkeypatch, about):
+    data = {'metadata': {'channelMetadataRenderer': {'title': 'Changed'}}, 'aboutChannelViewModel': about}
+    html = '<script>var ytInitialData = ' + json.dumps(data) + ';</script>'
+    monkeypatch.setattr(youtube_analyzer, 'get_http_session', lambda: FakeSession(html))
+    monkeypatch.setattr(youtube_analyzer, 'PLAYWRIGHT_AVAILABLE', True)
+    browser_result = youtube_analyzer._empty_links_result('@changed')
+    monkeypatch.setattr(youtube_analyzer, 'get_channel_links', lambda url, headless=True, verbose=True: dict(browser_result))
+
+    result = youtube_analyzer.extract_channel_links('https://www.youtube.com/@changed/about', mode='auto', verbose=False)
+
+    assert result['source'] == 'browser'
+    with pytest.raises(Exception):
+        youtube_analyzer.extract_channel_links('https://www.youtube.com/@changed/about', mode='http', verbose=False)
@@ -0,0 +1,160 @@
+import asyncio
+import socket
+
+import pytest
+
+import app
+import youtube_analyzer
+import youtube_async
+
+
+def search(query):
+    return list(youtube_analyzer.iter_search_channels(query, max_results=5, use_cache=False))
+
+
+def test_budget_rejects_calls_before_they_are_sent(stub_api):
+    with youtube_analyzer.quota_scope('/api/search'):
+        search('first')
+    with youtube_analyzer.quota_scope('/api/analyze'):
+        search('second')
+    assert len(stub_api.requests) == 4
+
+    with pytest.raises(youtube_analyzer.QuotaExceededError) as error:
+        search('third')
+    assert error.value.retry_after > 0
+    assert len(stub_api.requests) == 4
+
+    stats = youtube_analyzer.quota_ledger.stats()
+    assert stats['used'] == 202
+    assert stats['remaining'] == 48
+    assert stats['by_method'] == {'search.list': {'units': 200, 'calls': 2}, 'channels.list': {'units': 2, 'calls': 2}}
+    assert stats['by_endpoint'] == {'/api/search': {'units': 101, 'calls': 2}, '/api/analyze': {'units': 101, 'calls': 2}}
+
+
+def test_per_minute_bucket_rejects_calls(monkeypatch, tmp_path):
+    monkeypatch.setattr(youtube_analyzer, 'YOUTUBE_QUOTA_WAIT', 0.1)
+    ledger = youtube_analyzer.QuotaLedger(api_keys=['key-a'], daily_budget=10 ** 6, per_minute=300,
+                                          path=str(tmp_path / 'quota.db'))
+    ledger.charge('search.list', 3)
+
+    with pytest.raises(youtube_analyzer.QuotaExceededError) as error:
+        ledger.charge('search.list')
+    assert 0 < error.value.retry_after <= 60
+    assert ledger.stats()['used'] == 300
+
+
+def test_quota_exceeded_key_is_taken_out_of_rotation(stub_api, monkeypatch, tmp_path):
+    monkeypatch.setattr(youtube_analyzer, 'quota_ledger', youtube_analyzer.QuotaLedger(
+        api_keys=['key-a', 'key-b'], daily_budget=1000, per_minute=0, path=str(tmp_path / 'pool.db')))
+    stub_api.quota_exceeded.add('key-a')
+
+    assert len(search('failover')) == 1
+    keys = youtube_analyzer.quota_ledger.stats()['keys']
+    assert [key['in_rotation'] for key in keys] == [False, True]
+
+    stub_api.quota_exceeded.add('key-b')
+    with pytest.raises(youtube_analyzer.QuotaExceededError):
+        search('exhausted')
+
+
+def test_api_answers_429_with_retry_after(stub_api):
+    client = app.app.test_client()
+    assert client.get('/api/search?query=one').status_code == 200
+    assert client.get('/api/search?query=two').status_code == 200
+
+    response = client.get('/api/search?query=three')
+
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+    health = client.get('/api/health').get_json()
+    assert health['quota']['remaining'] == 48
+    assert health['quota']['by_endpoint']['/api/search'] == {'units': 202, 'calls': 4}
+
+
+@pytest.fixture
+def hedging(stub_api, monkeypatch):
+    """Hedge channels.list calls that take longer than 50 ms"""
+    monkeypatch.setattr(youtube_analyzer, 'YOUTUBE_API_HEDGE', True)
+    monkeypatch.setattr(youtube_analyzer.api_latency, 'percentile', lambda method, fraction: 0.05)
+    stub_api.delays = [0.5]
+    return stub_api
+
+
+def test_hedge_is_skipped_when_no_key_can_pay_for_it(hedging, monkeypatch, tmp_path):
+    monkeypatch.setattr(youtube_analyzer, 'quota_ledger', youtube_analyzer.QuotaLedger(
+        api_keys=['key-a'], daily_budget=1, per_minute=0, path=str(tmp_path / 'hedge.db')))
+    stats = {}
+
+    youtube_analyzer.execute_api_call('channels.list', stats=stats, part='snippet', id='UC1')
+
+    assert stats.get('hedged') is None
+    assert stats['hedges_skipped'] == 1
+    assert len(hedging.requests) == 1
+
+
+def test_losing_hedge_attempt_is_recorded_as_abandoned(hedging):
+    stats = {}
+
+    youtube_analyzer.execute_api_call('channels.list', stats=stats, part='snippet', id='UC1')
+
+    assert stats['hedged'] == 1
+    assert stats['hedge_wins'] == 1
+    assert stats['abandoned'] == 1
+    quota = youtube_analyzer.quota_ledger.stats()
+    assert quota['used'] == 2
+    assert quota['by_method']['abandoned'] == {'units': 0, 'calls': 1}
+
+
+def test_async_client_keeps_retry_after():
+    from aiohttp import web
+
+    async def unavailable(request):
+        return web.Response(status=503, headers={'Retry-After': '3'})
+
+    async def send():
+        server_app = web.Application()
+        server_app.router.add_get('/youtube/v3/videos', unavailable)
+        runner = web.AppRunner(server_app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            async with youtube_async.AsyncYouTubeClient(base_url=f'http://127.0.0.1:{port}/youtube/v3/') as client:
+                await client._get('videos.list', 'key-a', {'part': 'statistics', 'id': 'v1'})
+        finally:
+            await runner.cleanup()
+
+    with pytest.raises(youtube_analyzer.HttpError) as error:
+        asyncio.run(send())
+    assert error.value.resp.status == 503
+    assert youtube_analyzer.retry_delay(0, error.value) == 3
+
+
+def test_unhedged_call_is_sent_from_the_calling_thread(stub_api, monkeypatch):
+    class NoExecutor:
+        def submit(self, *args, **kwargs):
+            raise AssertionError("unhedged calls must not use the executor")
+
+    monkeypatch.setattr(youtube_analyzer, '_api_call_executor', NoExecutor())
+    monkeypatch.setattr(youtube_analyzer, 'YOUTUBE_API_HEDGE', False)
+
+    response = youtube_analyzer.execute_api_call('channels.list', part='snippet', id='UC1')
+
+    assert response['items'][0]['id'] == 'UCstubchannel00000000001'
+    assert len(stub_api.requests) == 1
+
+
+def test_unhedged_socket_timeout_is_counted(stub_api, monkeypatch):
+    monkeypatch.setattr(youtube_analyzer, 'YOUTUBE_API_RETRIES', 0)
+
+    def request(*args, **kwargs):
+        raise socket.timeout('timed out')
+
+    monkeypatch.setattr(stub_api, 'request', request)
+    stats = {}
+
+    with pytest.raises(TimeoutError, match='channels.list did not answer'):
+        youtube_analyzer.execute_api_call('channels.list', stats=stats, part='snippet', id='UC1')
+
+    assert stats['timeouts'] == 1
@@ -0,0 +1,98 @@
+import pytest
+
+import youtube_analyzer
+
+
+def make_queue(tmp_path):
+    return youtube_analyzer.ScrapeJobQueue(str(tmp_path / 'queue.db'))
+
+
+def backdate(queue, job_id, seconds):
+    queue._connect().execute(
+        "UPDATE scrape_jobs SET created_at = created_at - ?, deadline = deadline - ?, claimed_at = claimed_at - ?, "
+        "heartbeat_at = heartbeat_at - ? WHERE id = ?",
+        (seconds, seconds, seconds, seconds, job_id)
+    )
+
+
+def status(queue, job_id):
+    return queue._connect().execute("SELECT status FROM scrape_jobs WHERE id = ?", (job_id,)).fetchone()[0]
+
+
+def test_requeue_stale_requeues_job_of_crashed_worker(tmp_path):
+    queue = make_queue(tmp_path)
+    job_id = queue.submit({'channel_id': 'UC1'}, timeout=600)
+    assert queue.claim('crashed')[0] == job_id
+    backdate(queue, job_id, 120)
+
+    assert queue.requeue_stale(max_age=60) == 1
+    assert status(queue, job_id) == 'pending'
+    assert queue.claim('other')[0] == job_id
+
+
+def silence_heartbeat(queue, job_id, seconds):
+    queue._connect().execute("UPDATE scrape_jobs SET heartbeat_at = heartbeat_at - ? WHERE id = ?", (seconds, job_id))
+
+
+def test_requeue_stale_defaults_requeue_job_of_crashed_worker(tmp_path):
+    queue = make_queue(tmp_path)
+    job_id = queue.submit({'channel_id': 'UC1'})
+    queue.claim('crashed')
+    silence_heartbeat(queue, job_id, youtube_analyzer.SCRAPER_HEARTBEAT_TIMEOUT + 1)
+
+    assert queue.requeue_stale() == 1
+    assert status(queue, job_id) == 'pending'
+    assert queue.claim('other')[0] == job_id
+
+
+def test_requeue_stale_defaults_keep_jobs_with_heartbeat(tmp_path):
+    queue = make_queue(tmp_path)
+    job_id = queue.submit({'channel_id': 'UC1'})
+    queue.claim('slow')
+    silence_heartbeat(queue, job_id, youtube_analyzer.SCRAPER_HEARTBEAT_TIMEOUT + 1)
+
+    assert queue.heartbeat(['slow', 'idle']) == 1
+    assert queue.requeue_stale() == 0
+    assert status(queue, job_id) == 'running'
+
+
+def test_wait_raises_when_job_was_purged(tmp_path):
+    queue = make_queue(tmp_path)
+    job_id = queue.submit({'channel_id': 'UC1'})
+    queue._connect().execute("DELETE FROM scrape_jobs WHERE id = ?", (job_id,))
+
+    with pytest.raises(RuntimeError, match=f"Scrape job {job_id} no longer exists"):
+        queue.wait(job_id, timeout=1)
+
+
+def test_requeue_stale_fails_job_past_deadline(tmp_path):
+    queue = make_queue(tmp_path)
+    job_id = queue.submit({'channel_id': 'UC1'}, timeout=youtube_analyzer.SCRAPER_JOB_TIMEOUT)
+    queue.claim('crashed')
+    backdate(queue, job_id, youtube_analyzer.SCRAPER_JOB_TIMEOUT + 1)
+
+    assert queue.requeue_stale(max_age=youtube_analyzer.SCRAPER_JOB_TIMEOUT) == 1
+    assert status(queue, job_id) == 'failed'
+    assert queue.claim('other') is None
+
+
+def test_requeue_stale_leaves_recent_jobs_running(tmp_path):
+    queue = make_queue(tmp_path)
+    job_id = queue.submit({'channel_id': 'UC1'}, timeout=600)
+    queue.claim('busy')
+
+    assert queue.requeue_stale(max_age=60) == 0
+    assert status(queue, job_id) == 'running'
+
+
+def test_purge_deletes_abandoned_running_jobs(tmp_path):
+    queue = make_queue(tmp_path)
+    old_job = queue.submit({'channel_id': 'UC1'}, timeout=10)
+    queue.claim('crashed')
+    backdate(queue, old_job, 7200)
+    new_job = queue.submit({'channel_id': 'UC2'}, timeout=600)
+    queue.claim('busy')
+
+    assert queue.purge(older_than=3600) == 1
+    assert queue.stats() == {'running': 1}
+    assert status(queue, new_job) == 'running'
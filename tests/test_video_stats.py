@@ -0,0 +1,49 @@
+import pytest
+
+import youtube_analyzer
+
+np = pytest.importorskip('numpy')
+
+
+def columns(views):
+    return {
+        'views': views,
+        'likes': [view_count // 10 for view_count in views],
+        'comments': [view_count // 100 for view_count in views],
+        'duration_seconds': [index * 61 for index in range(len(views))],
+        'published_at': [None] * len(views)
+    }
+
+
+# The outlier threshold of [0, 0, 0, 4] is exactly 0 + 1.5 * 0 = 0, of [10, 20, 30, 40, 70] it is 30 + 1.5 * 20 = 60
+VIEWS = [
+    [],
+    [0],
+    [7, 7],
+    [0, 0, 0, 4],
+    [10, 20, 30, 40, 70],
+    [10, 20, 30, 40, 60],
+    # float64 cannot tell these apart, Python integers can
+    [2 ** 53, 2 ** 53, 2 ** 53, 2 ** 53 + 1],
+    [2 ** 53 + 1, 2 ** 53 + 3, 2 ** 53 + 5, 2 ** 54 + 1],
+    [1, 2, 3, 4, 2 ** 60],
+    # Sums beyond 64 bits fall back to Python integers
+    [2 ** 62, 2 ** 62, 2 ** 62],
+]
+
+
+@pytest.mark.parametrize('views', VIEWS)
+def test_numpy_and_python_engines_agree(views):
+    python = youtube_analyzer.video_averages_from_columns(columns(views), engine='python')
+    numpy = youtube_analyzer.video_averages_from_columns(columns(views), engine='numpy')
+
+    assert numpy == python
+    assert all(type(numpy[key]) is type(python[key]) for key in python)
+
+
+def test_outlier_threshold_is_compared_exactly():
+    views = [2 ** 53, 2 ** 53, 2 ** 53, 2 ** 53 + 1]
+
+    averages = youtube_analyzer.video_averages_from_columns(columns(views), engine='numpy')
+
+    assert averages['outlier_count'] == 1
@@ -1,18 +1,145 @@
 import json
 import datetime
+import hashlib
+import math
+import random
 import time
 import argparse
+import atexit
+import queue
+import threading
+import asyncio
+import contextvars
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from urllib.parse import urlparse, parse_qs, unquote
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from googleapiclient.errors import HttpError
+import httplib2
 import os
+import re
+import sqlite3
+import unicodedata
+import requests
+from requests.adapters import HTTPAdapter
+from zoneinfo import ZoneInfo
 
 
 API_KEY = os.environ.get('YOUTUBE_API_KEY') 
+# Pool of API keys (comma-separated, usually from different projects); calls are
+# spread across them by remaining quota. Defaults to the single YOUTUBE_API_KEY.
+API_KEYS = [k.strip() for k in os.environ.get('YOUTUBE_API_KEYS', '').split(',') if k.strip()] or [API_KEY]
+API_KEY = API_KEY or API_KEYS[0]
+YOUTUBE_API_TIMEOUT = float(os.environ.get('YOUTUBE_API_TIMEOUT', '30'))
+# Maximum number of uploads fetched per channel when a date filter is set.
+# Without a date filter only the latest UNFILTERED_MAX_VIDEOS uploads are analyzed.
+YOUTUBE_MAX_VIDEOS = int(os.environ.get('YOUTUBE_MAX_VIDEOS', '500'))
+UNFILTERED_MAX_VIDEOS = 50
+# Channels analyzed at the same time by one analyze_search_results call, and by
+# all calls in the process together
+ANALYZE_MAX_WORKERS = int(os.environ.get('ANALYZE_MAX_WORKERS', '4'))
+ANALYZE_MAX_CONCURRENCY = int(os.environ.get('ANALYZE_MAX_CONCURRENCY', '16'))
+# YouTube Data API quota per key: daily budget in units (reset at midnight Pacific
+# time), per-minute rate shared by the calls of one process, how long a call may
+# wait for the per-minute rate before it is rejected, and how long a key that hit
+# the API's rate limit is left out of rotation
+YOUTUBE_DAILY_QUOTA = int(os.environ.get('YOUTUBE_DAILY_QUOTA', '10000'))
+YOUTUBE_QUOTA_PER_MINUTE = int(os.environ.get('YOUTUBE_QUOTA_PER_MINUTE', '1000'))
+YOUTUBE_QUOTA_WAIT = float(os.environ.get('YOUTUBE_QUOTA_WAIT', '10'))
+YOUTUBE_KEY_COOLDOWN = float(os.environ.get('YOUTUBE_KEY_COOLDOWN', '60'))
+# Resilience for API calls: retries of transient errors (5xx, 429, timeouts and
+# dropped connections) with jittered exponential backoff, a deadline for each
+# attempt, and optionally a duplicate of slow list calls sent after the method's
+# p95 latency (never earlier than YOUTUBE_API_HEDGE_MIN_DELAY)
+YOUTUBE_API_RETRIES = int(os.environ.get('YOUTUBE_API_RETRIES', '3'))
+YOUTUBE_API_BACKOFF = float(os.environ.get('YOUTUBE_API_BACKOFF', '0.5'))
+YOUTUBE_API_BACKOFF_MAX = float(os.environ.get('YOUTUBE_API_BACKOFF_MAX', '8'))
+YOUTUBE_API_CALL_TIMEOUT = float(os.environ.get('YOUTUBE_API_CALL_TIMEOUT', '20'))
+YOUTUBE_API_HEDGE = os.environ.get('YOUTUBE_API_HEDGE', 'false').lower() == 'true'
+YOUTUBE_API_HEDGE_MIN_DELAY = float(os.environ.get('YOUTUBE_API_HEDGE_MIN_DELAY', '0.2'))
+QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+# Quota units per call, every method not listed here costs 1
+API_QUOTA_COSTS = {
+    'search.list': 100,
+}
+# Partial-response masks (fields=) with only what the metrics, search results and
+# export code read, plus etag/nextPageToken for revalidation and paging
+API_THUMBNAIL_FIELDS = 'thumbnails(default/url,medium/url,high/url)'
+API_FIELD_MASKS = {
+    'search.list': 'nextPageToken,items/snippet/channelId',
+    'channels.list': (
+        'etag,items(id,snippet(title,description,customUrl,country,publishedAt,' + API_THUMBNAIL_FIELDS + '),'
+        'contentDetails/relatedPlaylists/uploads,statistics(viewCount,subscriberCount,videoCount))'
+    ),
+    'playlistItems.list': 'etag,nextPageToken,items(snippet/publishedAt,contentDetails/videoId)',
+    'videos.list': (
+        'etag,items(id,snippet(title,publishedAt,' + API_THUMBNAIL_FIELDS + '),'
+        'contentDetails/duration,statistics(viewCount,likeCount,commentCount))'
+    ),
+}
+
+# Browser pool settings for channel links extraction
+BROWSER_POOL_SIZE = int(os.environ.get('BROWSER_POOL_SIZE', '2'))
+BROWSER_MAX_PAGES = int(os.environ.get('BROWSER_MAX_PAGES', '50'))
+# Seconds a caller waits for a pooled browser to finish its job
+BROWSER_JOB_TIMEOUT = float(os.environ.get('BROWSER_JOB_TIMEOUT', '120'))
+SCRAPER_MAX_CONCURRENCY = int(os.environ.get('SCRAPER_MAX_CONCURRENCY', '5'))
+SCRAPER_WAIT_TIMEOUT = int(os.environ.get('SCRAPER_WAIT_TIMEOUT', '3000'))
+SCRAPER_BLOCK_RESOURCES = os.environ.get('SCRAPER_BLOCK_RESOURCES', 'true').lower() == 'true'
+SCRAPER_BLOCKED_RESOURCE_TYPES = [t.strip() for t in os.environ.get('SCRAPER_BLOCKED_RESOURCE_TYPES', 'image,media,font,stylesheet').split(',') if t.strip()]
+SCRAPER_BLOCKED_DOMAINS = [d.strip().lower() for d in os.environ.get(
+    'SCRAPER_BLOCKED_DOMAINS',
+    'doubleclick.net,googlesyndication.com,googleadservices.com,google-analytics.com,'
+    'googletagmanager.com,googletagservices.com,adservice.google.com,imasdk.googleapis.com'
+).split(',') if d.strip()]
+# How channel links are extracted: 'browser' (Playwright), 'http' (ytInitialData) or 'auto'
+LINK_EXTRACTION_MODES = ('browser', 'http', 'auto')
+LINK_EXTRACTION_MODE = os.environ.get('LINK_EXTRACTION_MODE', 'auto')
+# Persistent cache settings (all caches share one SQLite file)
+CACHE_DB_PATH = os.environ.get('CACHE_DB_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'youtube_analyzer.sqlite3'))
+LINK_CACHE_TTL = int(os.environ.get('LINK_CACHE_TTL', str(7 * 24 * 3600)))
+LINK_CACHE_NEGATIVE_TTL = int(os.environ.get('LINK_CACHE_NEGATIVE_TTL', '3600'))
+LINK_CACHE_MAX_ENTRIES = int(os.environ.get('LINK_CACHE_MAX_ENTRIES', '20000'))
+# Stored API responses revalidated with If-None-Match (ETags)
+ETAG_CACHE_TTL = int(os.environ.get('ETAG_CACHE_TTL', str(7 * 24 * 3600)))
+ETAG_CACHE_MAX_ENTRIES = int(os.environ.get('ETAG_CACHE_MAX_ENTRIES', '50000'))
+# Per-channel state for incremental refreshes: the uploads seen so far and the
+# last statistics of the videos in the analysis window. Statistics younger than
+# CHANNEL_STATS_MAX_AGE seconds are reused instead of requested again.
+CHANNEL_STATE_TTL = int(os.environ.get('CHANNEL_STATE_TTL', str(30 * 24 * 3600)))
+CHANNEL_STATE_MAX_ENTRIES = int(os.environ.get('CHANNEL_STATE_MAX_ENTRIES', '20000'))
+CHANNEL_STATS_MAX_AGE = int(os.environ.get('CHANNEL_STATS_MAX_AGE', '0'))
+# Search results by normalized query: fresh for SEARCH_CACHE_TTL seconds, then
+# served for up to SEARCH_CACHE_STALE_TTL more while being refreshed in the background
+SEARCH_CACHE_TTL = int(os.environ.get('SEARCH_CACHE_TTL', '3600'))
+SEARCH_CACHE_STALE_TTL = int(os.environ.get('SEARCH_CACHE_STALE_TTL', '86400'))
+SEARCH_CACHE_MAX_ENTRIES = int(os.environ.get('SEARCH_CACHE_MAX_ENTRIES', '5000'))
+# Most channels a deep search returns; search.list stops paging at about 500 results
+SEARCH_MAX_RESULTS = int(os.environ.get('SEARCH_MAX_RESULTS', '500'))
+# Index of handles, usernames and custom URLs resolved to channel IDs
+CHANNEL_ID_CACHE_TTL = int(os.environ.get('CHANNEL_ID_CACHE_TTL', str(30 * 24 * 3600)))
+CHANNEL_ID_CACHE_MAX_ENTRIES = int(os.environ.get('CHANNEL_ID_CACHE_MAX_ENTRIES', '100000'))
+# Where links extraction runs: 'inline' in the calling process, or 'worker' to hand
+# jobs to a separate scraper_worker.py process through a SQLite job queue
+SCRAPER_DISPATCH = os.environ.get('SCRAPER_DISPATCH', 'inline')
+SCRAPER_QUEUE_DB_PATH = os.environ.get('SCRAPER_QUEUE_DB_PATH') or CACHE_DB_PATH
+SCRAPER_JOB_TIMEOUT = float(os.environ.get('SCRAPER_JOB_TIMEOUT', '60'))
+# Seconds a running job can go without a heartbeat from its worker process before
+# the worker is presumed dead and the job is put back in the queue
+SCRAPER_HEARTBEAT_TIMEOUT = float(os.environ.get('SCRAPER_HEARTBEAT_TIMEOUT', '15'))
+# Saved browser storage state with the accepted cookie consent, reused by new contexts
+CONSENT_STATE_PATH = os.environ.get('CONSENT_STATE_PATH') or os.path.join(os.path.dirname(CACHE_DB_PATH), 'consent_state.json')
+# Engine for the distribution statistics of channel videos: 'numpy', 'python', or
+# 'auto' to use NumPy when it is installed
+VIDEO_STATS_ENGINE = os.environ.get('VIDEO_STATS_ENGINE', 'auto')
+SCRAPER_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
 # Import Playwright for scraping channel links
 try:
     from playwright.sync_api import sync_playwright
+    from playwright.async_api import async_playwright
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     print("Warning: Playwright not installed. Channel links extraction will not be available.")
@@ -20,537 +147,3753 @@ except ImportError:
     print("Then: playwright install")
     PLAYWRIGHT_AVAILABLE = False
 
+# Import NumPy for vectorized video statistics
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+_sqlite_local = threading.local()
+
+
+def get_sqlite_connection(path=None):
+    """
+    Get this thread's connection to a local SQLite database, opening it on first use
+
+    Connections run in WAL mode with a busy timeout so several processes can share
+    the file. They are never reused across a fork.
+
+    Args:
+        path (str, optional): Database file path. Defaults to CACHE_DB_PATH.
+
+    Returns:
+        sqlite3.Connection: Connection in autocommit mode
+    """
+    path = path or CACHE_DB_PATH
+    connections = getattr(_sqlite_local, 'connections', None)
+    if connections is None or getattr(_sqlite_local, 'pid', None) != os.getpid():
+        connections = _sqlite_local.connections = {}
+        _sqlite_local.pid = os.getpid()
+
+    connection = connections.get(path)
+    if connection is None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connections[path] = connection
+    return connection
+
+
+class SQLiteCache:
+    """
+    Persistent key/value cache stored in a local SQLite file
+
+    The file can be shared by several processes (e.g. gunicorn workers), each
+    thread uses its own connection and the database runs in WAL mode. Entries
+    expire after their TTL, the least recently used entries are evicted once a
+    namespace holds more than max_entries, and hit/miss counts are stored in the
+    database so they cover all workers.
+    """
+
+    def __init__(self, namespace, ttl, max_entries=None, path=None):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path or CACHE_DB_PATH
+        self._schema_pid = None
+
+    def _connect(self):
+        connection = get_sqlite_connection(self.path)
+        # The tables only need creating once per process
+        if self._schema_pid != os.getpid():
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS cache_entries_accessed ON cache_entries (namespace, accessed_at)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_stats ("
+                "namespace TEXT PRIMARY KEY, hits INTEGER NOT NULL DEFAULT 0, misses INTEGER NOT NULL DEFAULT 0)"
+            )
+            self._schema_pid = os.getpid()
+        return connection
+
+    def _count(self, connection, column):
+        connection.execute(
+            f"INSERT INTO cache_stats (namespace, {column}) VALUES (?, 1) "
+            f"ON CONFLICT(namespace) DO UPDATE SET {column} = {column} + 1",
+            (self.namespace,)
+        )
+
+    def get(self, key, count=True):
+        """
+        Get a cached value
+
+        Args:
+            key (str): The cache key
+            count (bool, optional): Whether to record the lookup as a hit or miss. Defaults to True.
+
+        Returns:
+            The cached value, or None if it is missing or expired
+        """
+        connection = self._connect()
+        now = time.time()
+        row = connection.execute(
+            "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+            (self.namespace, key)
+        ).fetchone()
+
+        if row is None or row[1] <= now:
+            if count:
+                self._count(connection, 'misses')
+            return None
+
+        connection.execute(
+            "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+            (now, self.namespace, key)
+        )
+        if count:
+            self._count(connection, 'hits')
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl=None):
+        """
+        Store a value
+
+        Args:
+            key (str): The cache key
+            value: JSON-serializable value to store
+            ttl (int, optional): Seconds before the entry expires. Defaults to the cache TTL.
+        """
+        connection = self._connect()
+        now = time.time()
+        connection.execute(
+            "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+            (self.namespace, key, json.dumps(value), now + (self.ttl if ttl is None else ttl), now)
+        )
+
+        if self.max_entries:
+            # Drop expired entries first, then the least recently used ones over the limit
+            connection.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?",
+                (self.namespace, now)
+            )
+            connection.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+                "SELECT key FROM cache_entries WHERE namespace = ? ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.namespace, self.namespace, self.max_entries)
+            )
+
+    def record(self, hit):
+        """
+        Record a hit or miss for a lookup resolved outside get()
+
+        Args:
+            hit (bool): Whether the lookup was a hit
+        """
+        self._count(self._connect(), 'hits' if hit else 'misses')
+
+    def delete(self, key):
+        """
+        Remove a value from the cache
+        """
+        self._connect().execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+            (self.namespace, key)
+        )
+
+    def stats(self):
+        """
+        Get hit/miss counts and the number of stored entries
+
+        Returns:
+            dict: Cache statistics
+        """
+        connection = self._connect()
+        row = connection.execute(
+            "SELECT hits, misses FROM cache_stats WHERE namespace = ?", (self.namespace,)
+        ).fetchone()
+        hits, misses = row if row else (0, 0)
+        entries = connection.execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE namespace = ? AND expires_at > ?",
+            (self.namespace, time.time())
+        ).fetchone()[0]
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses > 0 else 0,
+            'entries': entries
+        }
+
+
+link_cache = SQLiteCache('channel_links', ttl=LINK_CACHE_TTL, max_entries=LINK_CACHE_MAX_ENTRIES)
+etag_cache = SQLiteCache('api_etags', ttl=ETAG_CACHE_TTL, max_entries=ETAG_CACHE_MAX_ENTRIES)
+channel_state = SQLiteCache('channel_state', ttl=CHANNEL_STATE_TTL, max_entries=CHANNEL_STATE_MAX_ENTRIES)
+channel_ids = SQLiteCache('channel_ids', ttl=CHANNEL_ID_CACHE_TTL, max_entries=CHANNEL_ID_CACHE_MAX_ENTRIES)
+search_cache = SQLiteCache('search_results', ttl=SEARCH_CACHE_TTL + SEARCH_CACHE_STALE_TTL, max_entries=SEARCH_CACHE_MAX_ENTRIES)
+
+
+class ScrapeJobQueue:
+    """
+    Local job queue for links extraction, stored in SQLite
+
+    API workers submit jobs and wait for their results with a deadline, while a
+    separate scraper_worker.py process owns the browsers and claims jobs one at a
+    time. Jobs whose deadline passes before a worker claims them are skipped.
+    While a job runs, its worker process refreshes the job's heartbeat, so jobs
+    held by a crashed worker can be told apart from slow ones and requeued.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or SCRAPER_QUEUE_DB_PATH
+        self._schema_pid = None
+
+    def _connect(self):
+        connection = get_sqlite_connection(self.path)
+        if self._schema_pid != os.getpid():
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS scrape_jobs ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, payload TEXT NOT NULL, status TEXT NOT NULL, "
+                "result TEXT, error TEXT, worker TEXT, created_at REAL NOT NULL, deadline REAL NOT NULL, "
+                "claimed_at REAL, finished_at REAL, heartbeat_at REAL)"
+            )
+            # Queues created before heartbeats were added lack the column
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(scrape_jobs)")}
+            if 'heartbeat_at' not in columns:
+                try:
+                    connection.execute("ALTER TABLE scrape_jobs ADD COLUMN heartbeat_at REAL")
+                except sqlite3.OperationalError as e:
+                    # Another process added it first
+                    if 'duplicate column' not in str(e):
+                        raise
+            connection.execute("CREATE INDEX IF NOT EXISTS scrape_jobs_status ON scrape_jobs (status, id)")
+            self._schema_pid = os.getpid()
+        return connection
+
+    def submit(self, payload, timeout=None):
+        """
+        Add a job to the queue
+
+        Args:
+            payload (dict): Keyword arguments for get_channel_links_playwright
+            timeout (float, optional): Seconds the caller is willing to wait for the result
+
+        Returns:
+            int: The job ID
+        """
+        timeout = SCRAPER_JOB_TIMEOUT if timeout is None else timeout
+        now = time.time()
+        cursor = self._connect().execute(
+            "INSERT INTO scrape_jobs (payload, status, created_at, deadline) VALUES (?, 'pending', ?, ?)",
+            (json.dumps(payload), now, now + timeout)
+        )
+        return cursor.lastrowid
+
+    def claim(self, worker='worker'):
+        """
+        Claim the oldest pending job that can still finish before its deadline
+
+        Args:
+            worker (str, optional): Name of the claiming worker
+
+        Returns:
+            tuple: (job_id, payload), or None if there is no pending job
+        """
+        connection = self._connect()
+        now = time.time()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "UPDATE scrape_jobs SET status = 'expired', finished_at = ? WHERE status = 'pending' AND deadline <= ?",
+                (now, now)
+            )
+            row = connection.execute(
+                "SELECT id, payload FROM scrape_jobs WHERE status = 'pending' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                connection.execute(
+                    "UPDATE scrape_jobs SET status = 'running', worker = ?, claimed_at = ?, heartbeat_at = ? WHERE id = ?",
+                    (worker, now, now, row[0])
+                )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def heartbeat(self, workers):
+        """
+        Record that the given workers are still alive and working on their running jobs
+
+        Args:
+            workers (list): Names the workers claimed their jobs with
+
+        Returns:
+            int: Number of running jobs refreshed
+        """
+        workers = list(workers)
+        if not workers:
+            return 0
+        cursor = self._connect().execute(
+            f"UPDATE scrape_jobs SET heartbeat_at = ? WHERE status = 'running' AND worker IN ({', '.join('?' * len(workers))})",
+            (time.time(), *workers)
+        )
+        return cursor.rowcount
+
+    def complete(self, job_id, result):
+        """
+        Store the result of a finished job
+        """
+        self._connect().execute(
+            "UPDATE scrape_jobs SET status = 'done', result = ?, finished_at = ? WHERE id = ?",
+            (json.dumps(result), time.time(), job_id)
+        )
+
+    def fail(self, job_id, error):
+        """
+        Mark a job as failed
+        """
+        self._connect().execute(
+            "UPDATE scrape_jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+            (str(error), time.time(), job_id)
+        )
+
+    def wait(self, job_id, timeout=None):
+        """
+        Wait for a job's result
+
+        Args:
+            job_id (int): The job ID returned by submit
+            timeout (float, optional): Seconds to wait before giving up
+
+        Returns:
+            dict: The job result
+
+        Raises:
+            TimeoutError: If the job did not finish in time
+            RuntimeError: If the job failed, expired or no longer exists
+        """
+        timeout = SCRAPER_JOB_TIMEOUT if timeout is None else timeout
+        connection = self._connect()
+        deadline = time.time() + timeout
+        delay = 0.05
+        while True:
+            row = connection.execute(
+                "SELECT status, result, error FROM scrape_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                # Deleted by purge while we were waiting
+                raise RuntimeError(f"Scrape job {job_id} no longer exists")
+            status, result, error = row
+            if status == 'done':
+                return json.loads(result)
+            if status in ('failed', 'expired'):
+                raise RuntimeError(error or f"Scrape job {job_id} {status}")
+            if time.time() >= deadline:
+                # Stop a worker from picking it up after we have given up
+                connection.execute(
+                    "UPDATE scrape_jobs SET status = 'expired', finished_at = ? WHERE id = ? AND status = 'pending'",
+                    (time.time(), job_id)
+                )
+                raise TimeoutError(f"Scrape job {job_id} did not finish within {timeout:.1f} seconds")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+
+    def run(self, payload, timeout=None):
+        """
+        Submit a job and wait for its result
+        """
+        timeout = SCRAPER_JOB_TIMEOUT if timeout is None else timeout
+        return self.wait(self.submit(payload, timeout=timeout), timeout=timeout)
+
+    def requeue_stale(self, max_age=None):
+        """
+        Recover running jobs whose worker has stopped sending heartbeats
+
+        A job without a heartbeat for max_age seconds that can still finish
+        before its deadline is put back in the queue. A running job past its
+        deadline is marked as failed, so its waiter stops and purge can delete it.
+
+        Args:
+            max_age (float, optional): Seconds without a heartbeat. Defaults to SCRAPER_HEARTBEAT_TIMEOUT.
+
+        Returns:
+            int: Number of requeued or failed jobs
+        """
+        max_age = SCRAPER_HEARTBEAT_TIMEOUT if max_age is None else max_age
+        connection = self._connect()
+        now = time.time()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            failed = connection.execute(
+                "UPDATE scrape_jobs SET status = 'failed', error = 'Worker did not finish the job before its deadline', "
+                "finished_at = ? WHERE status = 'running' AND deadline <= ?",
+                (now, now)
+            ).rowcount
+            requeued = connection.execute(
+                "UPDATE scrape_jobs SET status = 'pending', worker = NULL, claimed_at = NULL, heartbeat_at = NULL "
+                "WHERE status = 'running' AND COALESCE(heartbeat_at, claimed_at) <= ?",
+                (now - max_age,)
+            ).rowcount
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return failed + requeued
+
+    def purge(self, older_than=3600):
+        """
+        Delete finished jobs older than older_than seconds
+
+        Running jobs whose deadline passed more than older_than seconds ago are
+        deleted too, in case no worker recovered them.
+
+        Returns:
+            int: Number of deleted jobs
+        """
+        cutoff = time.time() - older_than
+        cursor = self._connect().execute(
+            "DELETE FROM scrape_jobs WHERE (status IN ('done', 'failed', 'expired') AND finished_at <= ?) "
+            "OR (status = 'running' AND deadline <= ?)",
+            (cutoff, cutoff)
+        )
+        return cursor.rowcount
+
+    def stats(self):
+        """
+        Count jobs by status
+
+        Returns:
+            dict: Number of jobs for each status
+        """
+        rows = self._connect().execute("SELECT status, COUNT(*) FROM scrape_jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+
+scrape_job_queue = ScrapeJobQueue()
+
+
+class QuotaExceededError(Exception):
+    """
+    Raised when a YouTube Data API call would exceed the quota budget
+
+    Attributes:
+        retry_after (float): Seconds until the call can be retried
+    """
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at rate_per_minute
+    """
+
+    def __init__(self, rate_per_minute):
+        self.capacity = rate_per_minute
+        self._tokens = float(rate_per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.capacity / 60.0)
+        self._updated = now
+
+    def acquire(self, tokens, timeout=0):
+        """
+        Take tokens from the bucket, waiting up to timeout seconds for them
+
+        Requests larger than the capacity are let through once the bucket is full.
+
+        Args:
+            tokens (int): Number of tokens to take
+            timeout (float, optional): Maximum seconds to wait. Defaults to 0.
+
+        Returns:
+            float: 0 if the tokens were taken, otherwise the seconds until they would be available
+        """
+        tokens = min(tokens, self.capacity)
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return 0
+                wait = (tokens - self._tokens) * 60.0 / self.capacity
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return wait
+            time.sleep(min(wait, remaining))
+
+    def release(self, tokens):
+        """
+        Put back tokens taken for work that was not done
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + min(tokens, self.capacity))
+
+    def available(self):
+        """
+        Get the number of tokens currently in the bucket
+        """
+        with self._lock:
+            self._refill()
+            return int(self._tokens)
+
+
+_quota_endpoint = contextvars.ContextVar('quota_endpoint', default='cli')
+
+
+@contextmanager
+def quota_scope(endpoint):
+    """
+    Attribute the quota spent inside the with block to an endpoint (e.g. '/api/search')
+    """
+    token = _quota_endpoint.set(endpoint)
+    try:
+        yield
+    finally:
+        _quota_endpoint.reset(token)
+
+
+def api_key_id(api_key):
+    """
+    Get a short identifier for an API key that is safe to store and report
+    """
+    if not api_key:
+        return 'default'
+    return hashlib.sha256(api_key.encode()).hexdigest()[:12]
+
+
+class QuotaLedger:
+    """
+    Records and enforces YouTube Data API quota usage for a pool of API keys
+
+    Units are recorded in SQLite by Pacific-time day, key, method and endpoint,
+    so every worker process sharing the file counts against the same daily
+    budget per key. Each call is assigned the key with the most budget left:
+    it waits for that key's per-minute token bucket (kept per process) for up
+    to YOUTUBE_QUOTA_WAIT seconds, and is rejected with QuotaExceededError if
+    no key can take it. Keys the API reports as exhausted are taken out of
+    rotation until the daily reset, rate-limited keys for YOUTUBE_KEY_COOLDOWN
+    seconds.
+    """
+
+    def __init__(self, api_keys=None, daily_budget=YOUTUBE_DAILY_QUOTA, per_minute=YOUTUBE_QUOTA_PER_MINUTE, path=None):
+        self.api_keys = list(api_keys if api_keys is not None else API_KEYS)
+        self.daily_budget = daily_budget
+        self.per_minute = per_minute
+        self.buckets = {api_key: TokenBucket(per_minute) for api_key in self.api_keys} if per_minute > 0 else {}
+        self.path = path or CACHE_DB_PATH
+        self._cooldowns = {}
+        self._schema_pid = None
+
+    def _connect(self):
+        connection = get_sqlite_connection(self.path)
+        if self._schema_pid != os.getpid():
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS quota_key_usage ("
+                "day TEXT NOT NULL, key_id TEXT NOT NULL, method TEXT NOT NULL, endpoint TEXT NOT NULL, "
+                "units INTEGER NOT NULL DEFAULT 0, calls INTEGER NOT NULL DEFAULT 0, "
+                "PRIMARY KEY (day, key_id, method, endpoint))"
+            )
+            self._schema_pid = os.getpid()
+        return connection
+
+    @staticmethod
+    def cost(method):
+        """
+        Get the quota units a call to method costs
+        """
+        return API_QUOTA_COSTS.get(method, 1)
+
+    @staticmethod
+    def _today():
+        return datetime.datetime.now(QUOTA_TIMEZONE).date().isoformat()
+
+    @staticmethod
+    def seconds_until_reset():
+        """
+        Get the seconds until the daily quota resets at midnight Pacific time
+        """
+        now = datetime.datetime.now(QUOTA_TIMEZONE)
+        midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time(), tzinfo=QUOTA_TIMEZONE)
+        return (midnight - now).total_seconds()
+
+    def _used_by_key(self, connection, day):
+        rows = connection.execute(
+            "SELECT key_id, COALESCE(SUM(units), 0) FROM quota_key_usage WHERE day = ? GROUP BY key_id", (day,)
+        ).fetchall()
+        return dict(rows)
+
+    def _cooldown_left(self, api_key):
+        return max(0, self._cooldowns.get(api_key, 0) - time.monotonic())
+
+    def _acquire(self, api_key, units, timeout):
+        bucket = self.buckets.get(api_key)
+        return bucket.acquire(units, timeout=timeout) if bucket is not None else 0
+
+    def _release(self, api_key, units):
+        bucket = self.buckets.get(api_key)
+        if bucket is not None:
+            bucket.release(units)
+
+    def _reserve(self, api_key, calls, units, day):
+        """Record the units against api_key unless that would go over its daily budget"""
+        connection = self._connect()
+        key_id = api_key_id(api_key)
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            used = self._used_by_key(connection, day).get(key_id, 0)
+            if used + units > self.daily_budget:
+                connection.execute("ROLLBACK")
+                return False
+            for method, count in calls.items():
+                connection.execute(
+                    "INSERT INTO quota_key_usage (day, key_id, method, endpoint, units, calls) VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(day, key_id, method, endpoint) DO UPDATE SET "
+                    "units = units + excluded.units, calls = calls + excluded.calls",
+                    (day, key_id, method, _quota_endpoint.get(), self.cost(method) * count, count)
+                )
+            connection.execute("DELETE FROM quota_key_usage WHERE day < ?",
+                               ((datetime.date.fromisoformat(day) - datetime.timedelta(days=7)).isoformat(),))
+            connection.execute("COMMIT")
+            return True
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
+            raise
+
+    def charge(self, method, calls=1, timeout=None):
+        """
+        Reserve the quota for one or more calls to method before they are sent
+
+        Args:
+            method (str): API method such as 'search.list'
+            calls (int, optional): Number of calls. Defaults to 1.
+            timeout (float, optional): Seconds to wait for per-minute budget. Defaults to YOUTUBE_QUOTA_WAIT.
+
+        Returns:
+            str: The API key the calls must be sent with
+
+        Raises:
+            QuotaExceededError: If no key has enough daily or per-minute budget left
+        """
+        return self.charge_calls({method: calls}, timeout=timeout)
+
+    def charge_calls(self, calls, timeout=None):
+        """
+        Reserve the quota for a group of calls sent with the same key (e.g. one batch)
+
+        Args:
+            calls (dict): Number of calls by API method
+            timeout (float, optional): Seconds to wait for per-minute budget. Defaults to YOUTUBE_QUOTA_WAIT.
+
+        Returns:
+            str: The API key the calls must be sent with
+
+        Raises:
+            QuotaExceededError: If no key has enough daily or per-minute budget left
+        """
+        units = sum(self.cost(method) * count for method, count in calls.items())
+        timeout = YOUTUBE_QUOTA_WAIT if timeout is None else timeout
+
+        while True:
+            day = self._today()
+            used = self._used_by_key(self._connect(), day)
+            candidates = sorted(
+                (api_key for api_key in self.api_keys
+                 if not self._cooldown_left(api_key) and used.get(api_key_id(api_key), 0) + units <= self.daily_budget),
+                key=lambda api_key: used.get(api_key_id(api_key), 0)
+            )
+            if not candidates:
+                cooldowns = [self._cooldown_left(api_key) for api_key in self.api_keys if self._cooldown_left(api_key)]
+                raise QuotaExceededError(
+                    f"Daily YouTube API quota exceeded on all {len(self.api_keys)} API key(s) "
+                    f"({self.daily_budget} units per key, this request needs {units})",
+                    retry_after=min(cooldowns) if cooldowns else self.seconds_until_reset()
+                )
+
+            # Use the first key with per-minute budget available now, otherwise wait for the one with most budget left
+            api_key = next((api_key for api_key in candidates if not self._acquire(api_key, units, 0)), None)
+            if api_key is None:
+                api_key = candidates[0]
+                wait = self._acquire(api_key, units, timeout)
+                if wait:
+                    raise QuotaExceededError(
+                        f"Per-minute YouTube API quota exceeded on all API keys ({self.per_minute} units per minute per key)",
+                        retry_after=wait
+                    )
+
+            if self._reserve(api_key, calls, units, day):
+                return api_key
+            # Another worker used up this key's budget in the meantime, pick again
+            self._release(api_key, units)
+
+    def exhaust(self, api_key):
+        """
+        Take a key out of rotation until the daily reset, e.g. after the API reported quotaExceeded
+        """
+        day = self._today()
+        key_id = api_key_id(api_key)
+        connection = self._connect()
+        used = self._used_by_key(connection, day).get(key_id, 0)
+        if used < self.daily_budget:
+            connection.execute(
+                "INSERT INTO quota_key_usage (day, key_id, method, endpoint, units, calls) VALUES (?, ?, 'quotaExceeded', ?, ?, 0) "
+                "ON CONFLICT(day, key_id, method, endpoint) DO UPDATE SET units = units + excluded.units",
+                (day, key_id, _quota_endpoint.get(), self.daily_budget - used)
+            )
+
+    def record_abandoned(self, api_key, calls=1):
+        """
+        Record calls that were charged and sent but whose answer was not used, e.g. a losing hedge
+
+        Their units were counted when they were charged, so they appear under the
+        'abandoned' method with their number of calls only.
+        """
+        self._connect().execute(
+            "INSERT INTO quota_key_usage (day, key_id, method, endpoint, units, calls) VALUES (?, ?, 'abandoned', ?, 0, ?) "
+            "ON CONFLICT(day, key_id, method, endpoint) DO UPDATE SET calls = calls + excluded.calls",
+            (self._today(), api_key_id(api_key), _quota_endpoint.get(), calls)
+        )
+
+    def cool_down(self, api_key, seconds=None):
+        """
+        Take a key out of rotation in this process for a while, e.g. after the API reported rateLimitExceeded
+        """
+        self._cooldowns[api_key] = time.monotonic() + (YOUTUBE_KEY_COOLDOWN if seconds is None else seconds)
+
+    def handle_error(self, api_key, error):
+        """
+        Take api_key out of rotation if error is the API reporting its quota or rate limit
+
+        Args:
+            api_key (str): The key the failed call was sent with
+            error (Exception): The error raised by the call, or None
+
+        Returns:
+            bool: True if the key was taken out and the call can be retried with another key
+        """
+        reason = quota_error_reason(error)
+        if reason is None:
+            return False
+        if reason == 'rateLimitExceeded':
+            self.cool_down(api_key)
+        else:
+            self.exhaust(api_key)
+        return True
+
+    def stats(self):
+        """
+        Get today's quota usage and what is left
+
+        Returns:
+            dict: Budget, used and remaining units overall and per key, and units by method and endpoint
+        """
+        day = self._today()
+        rows = self._connect().execute(
+            "SELECT key_id, method, endpoint, units, calls FROM quota_key_usage WHERE day = ?", (day,)
+        ).fetchall()
+
+        by_method = {}
+        by_endpoint = {}
+        used_by_key = {}
+        for key_id, method, endpoint, units, calls in rows:
+            used_by_key[key_id] = used_by_key.get(key_id, 0) + units
+            for totals, name in ((by_method, method), (by_endpoint, endpoint)):
+                entry = totals.setdefault(name, {'units': 0, 'calls': 0})
+                entry['units'] += units
+                entry['calls'] += calls
+
+        keys = []
+        for api_key in self.api_keys:
+            used = used_by_key.get(api_key_id(api_key), 0)
+            bucket = self.buckets.get(api_key)
+            keys.append({
+                'id': api_key_id(api_key),
+                'used': used,
+                'remaining': max(0, self.daily_budget - used),
+                'per_minute_available': bucket.available() if bucket is not None else None,
+                'cooling_down': round(self._cooldown_left(api_key), 1),
+                'in_rotation': used < self.daily_budget and not self._cooldown_left(api_key)
+            })
+
+        used = sum(key['used'] for key in keys)
+        return {
+            'day': day,
+            'daily_budget': self.daily_budget * len(self.api_keys),
+            'used': used,
+            'remaining': sum(key['remaining'] for key in keys),
+            'resets_in': int(self.seconds_until_reset()),
+            'per_minute': self.per_minute if self.per_minute > 0 else None,
+            'keys': keys,
+            'by_method': by_method,
+            'by_endpoint': by_endpoint
+        }
+
+
+quota_ledger = QuotaLedger()
+
+
+def quota_error_reason(error):
+    """
+    Get the reason when an HttpError is the API reporting an exhausted quota or rate limit
+
+    Returns:
+        str: 'quotaExceeded', 'dailyLimitExceeded' or 'rateLimitExceeded', or None for other errors
+    """
+    if not isinstance(error, HttpError) or error.resp.status not in (403, 429):
+        return None
+    content = str(error.content)
+    for reason in ('quotaExceeded', 'dailyLimitExceeded', 'rateLimitExceeded'):
+        if reason in content:
+            return reason
+    return None
+
+
+_youtube_discovery_document = None
+_youtube_discovery_lock = threading.Lock()
+_youtube_clients = threading.local()
+
+
+def _get_discovery_document():
+    """
+    Load the YouTube Data API discovery document bundled with google-api-python-client
+
+    The document is parsed once per process, so building a client never
+    fetches or parses it again.
+
+    Returns:
+        dict: The parsed discovery document
+    """
+    global _youtube_discovery_document
+    with _youtube_discovery_lock:
+        if _youtube_discovery_document is None:
+            document = get_static_doc('youtube', 'v3')
+            if document is None:
+                raise RuntimeError("The YouTube Data API discovery document is not bundled with google-api-python-client")
+            _youtube_discovery_document = json.loads(document)
+        return _youtube_discovery_document
+
+
+def get_youtube_client(api_key=None):
+    """
+    Get this thread's YouTube Data API client, building it on first use
+
+    googleapiclient clients are not thread-safe, so each thread gets its own
+    client. Each client keeps its own httplib2 connection, which stays open
+    between calls.
+
+    Args:
+        api_key (str, optional): The API key to use. Defaults to API_KEY.
+
+    Returns:
+        googleapiclient.discovery.Resource: The YouTube API client
+    """
+    api_key = api_key or API_KEY
+    clients = getattr(_youtube_clients, 'clients', None)
+    if clients is None:
+        clients = _youtube_clients.clients = {}
+
+    client = clients.get(api_key)
+    if client is None:
+        # The socket timeout never outlasts the call deadline, so an abandoned request frees its thread by then
+        http = httplib2.Http(timeout=min(YOUTUBE_API_TIMEOUT, YOUTUBE_API_CALL_TIMEOUT))
+        client = build_from_document(_get_discovery_document(), developerKey=api_key, http=http)
+        clients[api_key] = client
+    return client
+
+
+def youtube_request(youtube, method, **params):
+    """
+    Build (without executing) a YouTube Data API request
+
+    Args:
+        youtube: The YouTube API client
+        method (str): API method such as 'channels.list'
+        **params: Parameters for the API method
+
+    Returns:
+        googleapiclient.http.HttpRequest: The request
+    """
+    resource_name, method_name = method.split('.')
+    return getattr(getattr(youtube, resource_name)(), method_name)(**params)
+
+
+_stats_lock = threading.Lock()
+
+
+def add_to_stats(stats, key, value=1):
+    """
+    Add to a counter in a stats dictionary, if one is being collected
+
+    The dictionary may be shared by the threads analyzing channels in parallel.
+
+    Args:
+        stats (dict or None): Stats dictionary updated in place
+        key (str): The counter to add to
+        value (int or float, optional): Amount to add. Defaults to 1.
+    """
+    if stats is not None:
+        with _stats_lock:
+            stats[key] = stats.get(key, 0) + value
+
+
+def count_round_trip(stats, count=1):
+    """
+    Add HTTP round trips to a stats dictionary, if one is being collected
+
+    Args:
+        stats (dict or None): Stats dictionary updated in place
+        count (int, optional): Number of round trips to add. Defaults to 1.
+    """
+    add_to_stats(stats, 'round_trips', count)
+
+
+# API methods whose responses are stored with their ETag and revalidated
+ETAG_METHODS = ('channels.list', 'playlistItems.list', 'videos.list')
+
+
+def lookup_etag(method, params):
+    """
+    Find the stored response for a call, to revalidate it with If-None-Match
+
+    Args:
+        method (str): API method such as 'channels.list'
+        params (dict): Parameters of the call
+
+    Returns:
+        tuple: (cache key, stored entry or None), both None if the method is not revalidated
+    """
+    if method not in ETAG_METHODS:
+        return None, None
+
+    cache_key = f"{method}:{json.dumps(params, sort_keys=True)}"
+    return cache_key, etag_cache.get(cache_key, count=False)
+
+
+def _make_conditional(request, method, params):
+    """
+    Add If-None-Match to a request whose response is stored in etag_cache
+
+    Args:
+        request: The googleapiclient HttpRequest
+        method (str): API method such as 'channels.list'
+        params (dict): Parameters of the call
+
+    Returns:
+        tuple: (cache key, stored entry), both None if the method is not revalidated
+    """
+    cache_key, cached = lookup_etag(method, params)
+    if cached is not None:
+        request.headers['if-none-match'] = cached['etag']
+    return cache_key, cached
+
+
+def resolve_conditional(cache_key, cached, response, error, elapsed, stats=None):
+    """
+    Resolve the outcome of a conditional request
+
+    A 304 Not Modified is answered with the stored body and counted in stats as
+    'not_modified', 'bytes_saved' and 'seconds_saved'. A fresh response with an
+    ETag is stored for the next request.
+
+    Returns:
+        tuple: (response, error) with 304 errors replaced by the stored body
+    """
+    if cache_key is None:
+        return response, error
+
+    if cached is not None and isinstance(error, HttpError) and error.resp.status == 304:
+        etag_cache.record(True)
+        add_to_stats(stats, 'not_modified')
+        add_to_stats(stats, 'bytes_saved', cached['bytes'])
+        add_to_stats(stats, 'seconds_saved', round(max(0, cached['elapsed'] - elapsed), 3))
+        return cached['body'], None
+
+    if error is None and response is not None:
+        etag_cache.record(False)
+
+    if error is None and response is not None and response.get('etag'):
+        body = json.dumps(response)
+        etag_cache.set(cache_key, {'etag': response['etag'], 'body': response, 'bytes': len(body), 'elapsed': elapsed})
+    return response, error
+
+
+def _send(youtube, method, params, stats=None):
+    """
+    Send one API request, revalidating stored responses with their ETag
+
+    Returns:
+        dict: The API response
+    """
+    request = youtube_request(youtube, method, **params)
+    cache_key, cached = _make_conditional(request, method, params)
+    count_round_trip(stats)
+    started = time.monotonic()
+    try:
+        response, error = request.execute(), None
+    except HttpError as e:
+        response, error = None, e
+
+    response, error = resolve_conditional(cache_key, cached, response, error, time.monotonic() - started, stats)
+    if error is not None:
+        raise error
+    return response
+
+
+def with_field_mask(method, params):
+    """
+    Add the method's partial-response mask to the call parameters
+
+    Args:
+        method (str): API method such as 'channels.list'
+        params (dict): Parameters of the call, an explicit 'fields' is kept
+
+    Returns:
+        dict: The parameters with 'fields' set
+    """
+    if 'fields' in params or method not in API_FIELD_MASKS:
+        return params
+    return dict(params, fields=API_FIELD_MASKS[method])
+
+
+class LatencyTracker:
+    """
+    Thread-safe record of the latest call latencies per API method
+
+    Args:
+        window (int, optional): Latencies kept per method. Defaults to 200.
+        min_samples (int, optional): Calls needed before percentiles are reported. Defaults to 20.
+    """
+
+    def __init__(self, window=200, min_samples=20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, method, seconds):
+        with self._lock:
+            samples = self._samples.setdefault(method, [])
+            samples.append(seconds)
+            if len(samples) > self.window:
+                del samples[0]
+
+    def percentile(self, method, fraction):
+        """
+        Get a latency percentile for a method
+
+        Returns:
+            float: The latency in seconds, or None until min_samples calls were recorded
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(method, []))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    def stats(self):
+        """
+        Get the median and p95 latency of each method
+
+        Returns:
+            dict: Method -> {'calls', 'p50', 'p95'} with latencies in seconds
+        """
+        with self._lock:
+            methods = {method: len(samples) for method, samples in self._samples.items()}
+        return {
+            method: {'calls': calls, 'p50': self.percentile(method, 0.5), 'p95': self.percentile(method, 0.95)}
+            for method, calls in methods.items()
+        }
+
+
+api_latency = LatencyTracker()
+# Only methods costing 1 unit are hedged, a duplicate search.list would cost 100
+HEDGE_METHODS = ('channels.list', 'playlistItems.list', 'videos.list')
+# Hedges in flight at once; an abandoned request keeps its executor thread until it answers
+_hedge_slots = threading.BoundedSemaphore(ANALYZE_MAX_CONCURRENCY)
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+_api_call_executor = ThreadPoolExecutor(max_workers=4 * ANALYZE_MAX_CONCURRENCY, thread_name_prefix='youtube-api')
+atexit.register(_api_call_executor.shutdown, wait=False)
+
+
+def is_retryable(error):
+    """
+    Check whether a failed API call may succeed if it is sent again
+
+    Quota errors are not retryable here, they are handled by switching keys.
+    """
+    if isinstance(error, HttpError):
+        return error.resp.status in RETRYABLE_STATUSES and quota_error_reason(error) is None
+    return isinstance(error, (TimeoutError, ConnectionError, httplib2.HttpLib2Error))
+
+
+def retry_delay(attempt, error=None):
+    """
+    Get the seconds to wait before retry number attempt (starting at 0)
+
+    Uses full jitter: a random delay up to YOUTUBE_API_BACKOFF * 2 ** attempt,
+    capped at YOUTUBE_API_BACKOFF_MAX, unless the error carries a Retry-After.
+    """
+    retry_after = error.resp.get('retry-after') if isinstance(error, HttpError) else None
+    if retry_after:
+        try:
+            return min(float(retry_after), YOUTUBE_API_BACKOFF_MAX)
+        except ValueError:
+            pass
+    return random.uniform(0, min(YOUTUBE_API_BACKOFF_MAX, YOUTUBE_API_BACKOFF * 2 ** attempt))
+
+
+def _send_with_key(method, params, stats=None, api_key=None):
+    """Send the call with api_key (already charged) or a newly charged key, switching keys when one runs out of quota"""
+    while True:
+        api_key = api_key or quota_ledger.charge(method)
+        started = time.monotonic()
+        try:
+            response = _send(get_youtube_client(api_key), method, params, stats=stats)
+        except HttpError as e:
+            # Retry with another key if this one ran out of quota
+            if not quota_ledger.handle_error(api_key, e):
+                raise
+            api_key = None
+            continue
+        api_latency.record(method, time.monotonic() - started)
+        return response
+
+
+def _send_hedged(method, params, stats=None):
+    """
+    Send one attempt of an API call within YOUTUBE_API_CALL_TIMEOUT
+
+    With YOUTUBE_API_HEDGE, a duplicate of a HEDGE_METHODS call is sent when the
+    first request has not answered after the method's p95 latency, and whichever
+    answers first is used. The duplicate is only sent if a key can pay for it
+    right away and fewer than ANALYZE_MAX_CONCURRENCY hedges are in flight.
+    Requests still running when the call returns or times out are recorded as
+    abandoned in the quota ledger. Counted in stats as 'hedged', 'hedge_wins',
+    'hedges_skipped' and 'abandoned'.
+
+    Calls that cannot be hedged (hedging off, other methods, or no p95 yet) are
+    sent from the calling thread, bounded by the client's socket timeout.
+
+    Raises:
+        TimeoutError: If no request answered within YOUTUBE_API_CALL_TIMEOUT
+    """
+    hedge_delay = None
+    if YOUTUBE_API_HEDGE and method in HEDGE_METHODS:
+        p95 = api_latency.percentile(method, 0.95)
+        if p95 is not None:
+            hedge_delay = max(YOUTUBE_API_HEDGE_MIN_DELAY, p95)
+
+    if hedge_delay is None:
+        try:
+            return _send_with_key(method, params, stats)
+        except TimeoutError as e:
+            add_to_stats(stats, 'timeouts')
+            raise TimeoutError(f"{method} did not answer within {min(YOUTUBE_API_TIMEOUT, YOUTUBE_API_CALL_TIMEOUT):g} seconds") from e
+
+    keys = {}
+
+    def submit(api_key):
+        # Each request runs in its own copy of the context so it is charged to the caller's endpoint
+        future = _api_call_executor.submit(contextvars.copy_context().run, _send_with_key, method, params, stats, api_key)
+        keys[future] = api_key
+        return future
+
+    def abandon(futures):
+        for future in futures:
+            if not future.done():
+                quota_ledger.record_abandoned(keys[future])
+                add_to_stats(stats, 'abandoned')
+
+    started = time.monotonic()
+    first = submit(quota_ledger.charge(method))
+    hedge = None
+    pending = {first}
+    error = None
+    while pending:
+        now = time.monotonic()
+        timeout = started + YOUTUBE_API_CALL_TIMEOUT - now
+        if hedge_delay is not None:
+            timeout = min(timeout, started + hedge_delay - now)
+        done, pending = wait(pending, timeout=max(0, timeout), return_when=FIRST_COMPLETED)
+
+        for future in done:
+            if future.exception() is None:
+                if future is hedge:
+                    add_to_stats(stats, 'hedge_wins')
+                abandon(pending)
+                return future.result()
+            error = future.exception()
+
+        if done:
+            continue
+        if time.monotonic() - started >= YOUTUBE_API_CALL_TIMEOUT:
+            add_to_stats(stats, 'timeouts')
+            abandon(pending)
+            raise TimeoutError(f"{method} did not answer within {YOUTUBE_API_CALL_TIMEOUT:g} seconds")
+        if hedge_delay is not None:
+            hedge_delay = None
+            hedge = _submit_hedge(method, submit, stats)
+            if hedge is not None:
+                pending.add(hedge)
+    raise error
+
+
+def _submit_hedge(method, submit, stats=None):
+    """Send a hedge of a call if a hedge slot is free and a key can pay for it without waiting"""
+    if not _hedge_slots.acquire(blocking=False):
+        add_to_stats(stats, 'hedges_skipped')
+        return None
+    try:
+        api_key = quota_ledger.charge(method, timeout=0)
+    except QuotaExceededError:
+        _hedge_slots.release()
+        add_to_stats(stats, 'hedges_skipped')
+        return None
+    hedge = submit(api_key)
+    hedge.add_done_callback(lambda future: _hedge_slots.release())
+    add_to_stats(stats, 'hedged')
+    return hedge
+
+
+def execute_api_call(method, stats=None, full=False, **params):
+    """
+    Execute a YouTube Data API call using this thread's shared client
+
+    Transient errors are retried up to YOUTUBE_API_RETRIES times with jittered
+    exponential backoff, counted in stats as 'retries'.
+
+    Args:
+        method (str): API method such as 'channels.list'
+        stats (dict, optional): Dictionary whose 'round_trips' count is incremented
+        full (bool, optional): Return complete resources instead of the fields in API_FIELD_MASKS
+        **params: Parameters for the API method
+
+    Returns:
+        dict: The API response
+    """
+    if not full:
+        params = with_field_mask(method, params)
+    for attempt in range(YOUTUBE_API_RETRIES + 1):
+        try:
+            return _send_hedged(method, params, stats=stats)
+        except Exception as e:
+            if attempt == YOUTUBE_API_RETRIES or not is_retryable(e):
+                raise
+            add_to_stats(stats, 'retries')
+            time.sleep(retry_delay(attempt, e))
+
+
+API_MAX_IDS_PER_REQUEST = 50
+
+
+def chunk_ids(ids, size=API_MAX_IDS_PER_REQUEST):
+    """
+    Split a list of IDs into the chunks accepted by the API's id parameter
+
+    Args:
+        ids (list): IDs to split
+        size (int, optional): Maximum IDs per chunk. Defaults to 50.
+
+    Returns:
+        list: List of ID lists
+    """
+    return [ids[i:i + size] for i in range(0, len(ids), size)]
+
+
+API_MAX_BATCH_REQUESTS = 50
+
+
+def execute_api_batch(calls, stats=None, full=False):
+    """
+    Execute several YouTube Data API calls as batched HTTP requests
+
+    The calls are sent in multipart batches of up to 50 requests, so many
+    small requests (such as one playlistItems.list per channel) share a
+    single HTTP round trip. If the batch endpoint itself fails, the calls
+    are executed one at a time instead. Each batch is sent with one API key;
+    calls rejected because that key ran out of quota are retried individually
+    with another key.
+
+    Args:
+        calls (list): List of (method, params) tuples, e.g. ('playlistItems.list', {...})
+        stats (dict, optional): Dictionary whose 'round_trips' count is incremented
+        full (bool, optional): Return complete resources instead of the fields in API_FIELD_MASKS
+
+    Returns:
+        list: One (response, exception) tuple per call, in the order of calls
+    """
+    if not full:
+        calls = [(method, with_field_mask(method, params)) for method, params in calls]
+    results = [None] * len(calls)
+
+    def store(request_id, response, exception):
+        results[int(request_id)] = (response, exception)
+
+    for offset in range(0, len(calls), API_MAX_BATCH_REQUESTS):
+        chunk = calls[offset:offset + API_MAX_BATCH_REQUESTS]
+        method_counts = {}
+        for method, _ in chunk:
+            method_counts[method] = method_counts.get(method, 0) + 1
+        api_key = quota_ledger.charge_calls(method_counts)
+        youtube = get_youtube_client(api_key)
+
+        batch = youtube.new_batch_http_request(callback=store)
+        conditionals = []
+        for index, (method, params) in enumerate(chunk, offset):
+            request = youtube_request(youtube, method, **params)
+            conditionals.append(_make_conditional(request, method, params))
+            batch.add(request, request_id=str(index))
+
+        count_round_trip(stats)
+        started = time.monotonic()
+        try:
+            batch.execute()
+            elapsed = (time.monotonic() - started) / len(chunk)
+            for index, (cache_key, cached) in enumerate(conditionals, offset):
+                if results[index] is None:
+                    # Retried individually below, like a transient error
+                    results[index] = (None, ConnectionError(f"Batch response had no answer for {calls[index][0]} call {index}"))
+                    continue
+                response, error = results[index]
+                results[index] = resolve_conditional(cache_key, cached, response, error, elapsed, stats)
+        except Exception as e:
+            if not (isinstance(e, HttpError) or is_retryable(e)):
+                raise
+            # The batch request failed as a whole, send the calls individually.
+            # Their quota was already charged above.
+            for index, (method, params) in enumerate(chunk, offset):
+                try:
+                    results[index] = (_send(youtube, method, params, stats=stats), None)
+                except Exception as e:
+                    if not (isinstance(e, HttpError) or is_retryable(e)):
+                        raise
+                    results[index] = (None, e)
+
+        # Retry the calls this key had no quota left for with another key, and
+        # the calls that failed with a transient error with backoff
+        exhausted = [index for index in range(offset, offset + len(chunk)) if quota_error_reason(results[index][1])]
+        if exhausted:
+            quota_ledger.handle_error(api_key, results[exhausted[0]][1])
+        transient = [index for index in range(offset, offset + len(chunk)) if is_retryable(results[index][1])]
+        for index in exhausted + transient:
+            method, params = calls[index]
+            if index in transient:
+                add_to_stats(stats, 'retries')
+            try:
+                results[index] = (execute_api_call(method, stats=stats, full=True, **params), None)
+            except Exception as e:
+                if not (isinstance(e, HttpError) or is_retryable(e)):
+                    raise
+                results[index] = (None, e)
+
+    return results
+
+
+def build_date_filter(days_ago=None, start_date=None, end_date=None):
+    """
+    Build the publishedAt bounds used to filter videos by date
+
+    Args:
+        days_ago (int, optional): Only include videos from the last X days
+        start_date (str, optional): Only include videos published after this date (format: YYYY-MM-DD)
+        end_date (str, optional): Only include videos published before this date (format: YYYY-MM-DD)
+
+    Returns:
+        dict: ISO timestamps under 'cutoff', 'start' and 'end' (None when unset),
+            or None if no date filtering was requested
+    """
+    if days_ago is None and start_date is None and end_date is None:
+        return None
+
+    # Calculate cutoff date if days_ago is specified
+    cutoff_date_str = None
+    if days_ago is not None:
+        cutoff_date = datetime.datetime.now() - datetime.timedelta(days=days_ago)
+        cutoff_date_str = cutoff_date.isoformat() + 'Z'
+
+    # Convert start_date and end_date to ISO format if provided
+    start_date_str = None
+    if start_date is not None:
+        try:
+            start_date_obj = datetime.datetime.strptime(start_date, "%Y-%m-%d")
+            start_date_str = start_date_obj.isoformat() + 'Z'
+        except ValueError:
+            print(f"Warning: Invalid start_date format. Expected YYYY-MM-DD, got {start_date}")
+
+    end_date_str = None
+    if end_date is not None:
+        try:
+            # Set end_date to the end of the day (23:59:59)
+            end_date_obj = datetime.datetime.strptime(end_date, "%Y-%m-%d")
+            end_date_obj = end_date_obj.replace(hour=23, minute=59, second=59)
+            end_date_str = end_date_obj.isoformat() + 'Z'
+        except ValueError:
+            print(f"Warning: Invalid end_date format. Expected YYYY-MM-DD, got {end_date}")
+
+    return {'cutoff': cutoff_date_str, 'start': start_date_str, 'end': end_date_str}
+
+
+def video_matches_date_filter(published_at, date_filter):
+    """
+    Check whether a publishedAt timestamp falls inside a date filter
+
+    Args:
+        published_at (str): The video's publishedAt timestamp
+        date_filter (dict): Bounds returned by build_date_filter
+
+    Returns:
+        bool: True if the video meets all the specified date criteria
+    """
+    if date_filter['cutoff'] is not None and published_at < date_filter['cutoff']:
+        return False
+
+    if date_filter['start'] is not None and published_at < date_filter['start']:
+        return False
+
+    if date_filter['end'] is not None and published_at > date_filter['end']:
+        return False
+
+    return True
+
+
+def filter_items_by_date(items, date_filter):
+    """
+    Filter playlist items by their publishedAt date
+
+    Args:
+        items (list): playlistItems resources
+        date_filter (dict): Bounds returned by build_date_filter
+
+    Returns:
+        list: The items that meet the date criteria
+    """
+    return [item for item in items if video_matches_date_filter(item['snippet']['publishedAt'], date_filter)]
+
+
+def resolve_max_videos(date_filter, max_videos=None):
+    """
+    Get the maximum number of uploads to fetch for a channel
+
+    Args:
+        date_filter (dict or None): Bounds returned by build_date_filter
+        max_videos (int, optional): Explicit maximum, used as is when given
+
+    Returns:
+        int: max_videos, YOUTUBE_MAX_VIDEOS when filtering by date, otherwise UNFILTERED_MAX_VIDEOS
+    """
+    if max_videos is not None:
+        return max_videos
+    return YOUTUBE_MAX_VIDEOS if date_filter is not None else UNFILTERED_MAX_VIDEOS
+
+
+def upload_page_params(uploads_playlist_id, page_token, remaining):
+    """Build the playlistItems.list parameters for one page of uploads"""
+    params = {
+        'part': "snippet,contentDetails",
+        'playlistId': uploads_playlist_id,
+        'maxResults': min(50, remaining)  # 50 is the maximum allowed by the API
+    }
+    if page_token:
+        params['pageToken'] = page_token
+    return params
+
+
+def read_upload_page(videos_response, date_filter, remaining):
+    """
+    Filter one page of uploads and decide whether another page is needed
+
+    Uploads come back newest first, so once a page contains a video older than
+    the days_ago/start_date bound, later pages only hold older videos.
+
+    Returns:
+        tuple: (items to keep, next page token or None to stop)
+    """
+    items = videos_response.get('items', [])
+    next_page_token = videos_response.get('nextPageToken')
+
+    if date_filter is not None:
+        lower_bounds = [bound for bound in (date_filter['cutoff'], date_filter['start']) if bound is not None]
+        if lower_bounds and any(item['snippet']['publishedAt'] < max(lower_bounds) for item in items):
+            next_page_token = None
+        items = filter_items_by_date(items, date_filter)
+
+    items = items[:remaining]
+    if len(items) >= remaining:
+        next_page_token = None
+    return items, next_page_token
+
+
+def iter_upload_pages(uploads_playlist_id, date_filter=None, max_videos=None, stats=None, full=False):
+    """
+    Page through a channel's uploads playlist, newest first
+
+    Pages are requested lazily. Iteration stops at the last page, once the
+    date filter's lower bound is passed, or after max_videos videos.
+
+    Args:
+        uploads_playlist_id (str): The channel's uploads playlist ID
+        date_filter (dict, optional): Bounds returned by build_date_filter
+        max_videos (int, optional): Maximum number of videos, see resolve_max_videos
+        stats (dict, optional): Dictionary whose 'round_trips' count is incremented
+        full (bool, optional): Fetch complete resources instead of the fields in API_FIELD_MASKS
+
+    Yields:
+        tuple: (playlist items, video resources with statistics) for each page
+    """
+    remaining = resolve_max_videos(date_filter, max_videos)
+    page_token = None
+
+    while remaining > 0:
+        videos_response = execute_api_call('playlistItems.list', stats=stats, full=full,
+                                           **upload_page_params(uploads_playlist_id, page_token, remaining))
+        items, page_token = read_upload_page(videos_response, date_filter, remaining)
+
+        # Get detailed stats for the videos on this page
+        video_stats_items = []
+        video_ids = [item['contentDetails']['videoId'] for item in items]
+        if video_ids:
+            video_stats_response = execute_api_call(
+                'videos.list',
+                stats=stats,
+                full=full,
+                part="statistics,contentDetails,snippet",
+                id=','.join(video_ids)
+            )
+            video_stats_items = video_stats_response.get('items', [])
+
+        yield items, video_stats_items
+
+        remaining -= len(items)
+        if not page_token:
+            break
+
+
+def channel_alias_key(username=None, handle=None, custom_url=None):
+    """
+    Build the resolution index key for a handle, username or custom URL name
+
+    Returns:
+        str: The key, or None if no alias was provided
+    """
+    if handle:
+        return '@' + handle.lstrip('@').lower()
+    if username:
+        return f"user:{username.lower()}"
+    if custom_url:
+        return f"c:{custom_url.lower()}"
+    return None
+
+
+def channel_alias_from_identifier(identifier):
+    """
+    Split a @handle or channel URL into channel_alias_key arguments
+
+    Returns:
+        dict: {'handle'}, {'username'} or {'custom_url'}, or an empty dict for channel IDs
+            and URLs that already contain the channel ID
+    """
+    if 'youtube.com' in identifier:
+        path_parts = urlparse(identifier).path.strip('/').split('/')
+        if path_parts[0] == 'channel':
+            return {}
+        if len(path_parts) > 1 and path_parts[0] == 'user':
+            return {'username': path_parts[1]}
+        if len(path_parts) > 1 and path_parts[0] == 'c':
+            return {'custom_url': path_parts[1]}
+        if path_parts[0].startswith('@'):
+            return {'handle': path_parts[0]}
+        return {}
+    if identifier.startswith('UC') and len(identifier) == 24:
+        return {}
+    return {'handle': identifier}
+
+
+def lookup_channel_id(username=None, handle=None, custom_url=None):
+    """
+    Look up the channel ID of a handle, username or custom URL in the resolution index
+
+    The index is shared by the API and scraping paths, hits and misses are counted
+    in channel_ids.stats().
+
+    Returns:
+        str: The channel ID, or None if it is not known
+    """
+    key = channel_alias_key(username, handle, custom_url)
+    if key is None:
+        return None
+    try:
+        return channel_ids.get(key)
+    except sqlite3.Error as e:
+        print(f"Warning: Could not read channel ID index: {e}")
+        return None
+
+
+def remember_channel_id(channel_id, username=None, handle=None, custom_url=None):
+    """
+    Store the channel ID a handle, username or custom URL resolved to
+    """
+    key = channel_alias_key(username, handle, custom_url)
+    if key is None or not channel_id:
+        return
+    try:
+        channel_ids.set(key, channel_id)
+    except sqlite3.Error as e:
+        print(f"Warning: Could not write channel ID index: {e}")
+
+
+def forget_channel_id(username=None, handle=None, custom_url=None):
+    """
+    Remove a handle, username or custom URL from the resolution index
+    """
+    key = channel_alias_key(username, handle, custom_url)
+    if key is None:
+        return
+    try:
+        channel_ids.delete(key)
+    except sqlite3.Error as e:
+        print(f"Warning: Could not write channel ID index: {e}")
+
+
+def channel_lookup(channel_id=None, username=None, handle=None):
+    """
+    Get the channels.list parameters for a channel, resolving handles and usernames through the index
+
+    Returns:
+        tuple: (parameters or None if no identifier was provided, True if a stored channel ID is used)
+    """
+    if channel_id:
+        return {'id': channel_id}, False
+    resolved = lookup_channel_id(username=username, handle=handle)
+    if resolved:
+        return {'id': resolved}, True
+    if username:
+        return {'forUsername': username}, False
+    if handle:
+        return {'forHandle': handle.lstrip('@')}, False
+    return None, False
+
+
+def accept_channel_lookup(response, username=None, handle=None, resolved=False):
+    """
+    Check a channels.list response and keep the resolution index up to date
+
+    A stored channel ID no longer matches when the channel is gone, or when its
+    handle (snippet.customUrl) is not the one that was requested. The entry is
+    then removed, and the caller should look the channel up by name again.
+
+    Args:
+        response (dict): The channels.list response
+        username (str, optional): The username that was looked up
+        handle (str, optional): The handle that was looked up
+        resolved (bool, optional): Whether the request used a stored channel ID
+
+    Returns:
+        bool: False if the stored channel ID did not match and was removed
+    """
+    channel = (response.get('items') or [None])[0]
+    custom_url = ((channel or {}).get('snippet') or {}).get('customUrl')
+    if resolved and (channel is None or (handle and custom_url and channel_alias_key(handle=custom_url) != channel_alias_key(handle=handle))):
+        forget_channel_id(username=username, handle=handle)
+        return False
+
+    if channel is not None:
+        # Storing a confirmed entry again also renews its TTL
+        remember_channel_id(channel['id'], username=username, handle=handle)
+        if custom_url and custom_url.startswith('@'):
+            remember_channel_id(channel['id'], handle=custom_url)
+    return True
+
+
+def _uploads_in_window(uploads, date_filter, remaining):
+    """Get the uploads a full fetch would analyze, from a newest first list of {'id', 'publishedAt'}"""
+    if date_filter is not None:
+        uploads = [upload for upload in uploads if video_matches_date_filter(upload['publishedAt'], date_filter)]
+    return uploads[:remaining]
+
+
+def _uploads_cover_window(uploads, date_filter, remaining, complete):
+    """
+    Check whether a newest first prefix of the uploads playlist holds the whole analysis window
+
+    It does if it is the complete playlist, already holds the maximum number of
+    videos, or reaches past the date filter's lower bound.
+    """
+    if complete or len(_uploads_in_window(uploads, date_filter, remaining)) >= remaining:
+        return True
+    if date_filter is None or not uploads:
+        return False
+    lower_bounds = [bound for bound in (date_filter['cutoff'], date_filter['start']) if bound is not None]
+    return bool(lower_bounds) and uploads[-1]['publishedAt'] < max(lower_bounds)
+
+
+def retrieve_uploads_incremental(channel, date_filter=None, max_videos=None, stats=None, full=False):
+    """
+    Get the video resources of a channel's analysis window, reusing its stored state
+
+    The uploads playlist is paged only until it reaches a video seen by the
+    previous refresh; the stored list of uploads supplies the rest. Statistics
+    are then requested only for the videos inside the window (and only if
+    older than CHANNEL_STATS_MAX_AGE). The first refresh of a channel, or one
+    whose window reaches further back than the stored uploads, pages the
+    playlist like iter_upload_pages. The state is saved in channel_state and
+    the result matches what iter_upload_pages returns for the same window.
+
+    Counted in stats as 'new_uploads' and 'stats_reused'.
+
+    Args:
+        channel (dict): The channel resource from channels.list
+        date_filter (dict, optional): Bounds returned by build_date_filter
+        max_videos (int, optional): Maximum number of videos, see resolve_max_videos
+        stats (dict, optional): Dictionary whose 'round_trips' count is incremented
+        full (bool, optional): Fetch complete resources instead of the fields in API_FIELD_MASKS
+
+    Returns:
+        list: videos resources of the window, newest first
+    """
+    uploads_playlist_id = channel['contentDetails']['relatedPlaylists']['uploads']
+    remaining = resolve_max_videos(date_filter, max_videos)
+    state = channel_state.get(channel['id'], count=False)
+    if state is not None and (state['full'] != full or state['uploads_playlist_id'] != uploads_playlist_id):
+        state = None
+    # Counted once, after deciding whether the stored state is usable
+    channel_state.record(state is not None)
+    stored = state['uploads'] if state else []
+    known = {upload['id']: index for index, upload in enumerate(stored)}
+
+    # Page from the newest upload until the stored uploads take over, or the window is covered
+    seen = []
+    page_token = None
+    while True:
+        page = execute_api_call('playlistItems.list', stats=stats, full=full,
+                                **upload_page_params(uploads_playlist_id, page_token, 50))
+        page_token = page.get('nextPageToken')
+        uploads = None
+        for item in page.get('items', []):
+            video_id = item['contentDetails']['videoId']
+            if video_id in known:
+                merged = seen + stored[known[video_id]:]
+                if _uploads_cover_window(merged, date_filter, remaining, state['complete']):
+                    uploads, complete = merged, state['complete']
+                    break
+                # The window reaches past the stored uploads, page the rest of the playlist
+                known = {}
+            seen.append({'id': video_id, 'publishedAt': item['snippet']['publishedAt']})
+        if uploads is not None:
+            break
+        if not page_token or _uploads_cover_window(seen, date_filter, remaining, False):
+            uploads, complete = seen, not page_token
+            break
+
+    stored_ids = {upload['id'] for upload in stored}
+    add_to_stats(stats, 'new_uploads', sum(1 for upload in uploads if upload['id'] not in stored_ids))
+
+    # Refresh the statistics of the videos in the window
+    window = [upload['id'] for upload in _uploads_in_window(uploads, date_filter, remaining)]
+    snapshots = state['videos'] if state else {}
+    now = time.time()
+    stale = [video_id for video_id in window
+             if video_id not in snapshots or now - snapshots[video_id]['fetched_at'] >= CHANNEL_STATS_MAX_AGE]
+    add_to_stats(stats, 'stats_reused', len(window) - len(stale))
+    for ids in chunk_ids(stale):
+        response = execute_api_call('videos.list', stats=stats, full=full,
+                                    part="statistics,contentDetails,snippet", id=','.join(ids))
+        for video in response.get('items', []):
+            snapshots[video['id']] = {'video': video, 'fetched_at': now}
+
+    # Keep the uploads a later window may need, and the statistics of this window
+    if len(uploads) > YOUTUBE_MAX_VIDEOS + 50:
+        uploads, complete = uploads[:YOUTUBE_MAX_VIDEOS + 50], False
+    snapshots = {video_id: snapshots[video_id] for video_id in window if video_id in snapshots}
+    channel_state.set(channel['id'], {
+        'uploads_playlist_id': uploads_playlist_id,
+        'full': full,
+        'newest_video_id': uploads[0]['id'] if uploads else None,
+        'newest_published_at': uploads[0]['publishedAt'] if uploads else None,
+        'uploads': uploads,
+        'complete': complete,
+        'videos': snapshots,
+        'refreshed_at': now,
+    })
+    return [snapshots[video_id]['video'] for video_id in window if video_id in snapshots]
+
+
+def retrieve_youtube_data(channel_id=None, username=None, handle=None, days_ago=None, start_date=None, end_date=None, verbose=True, stats=None, max_videos=None, full=False, incremental=False):
+    """
+    Retrieve YouTube channel data using the YouTube Data API
+
+    Args:
+        channel_id (str, optional): The YouTube channel ID
+        username (str, optional): The YouTube username
+        handle (str, optional): The YouTube handle (with or without @)
+        days_ago (int, optional): Only include videos from the last X days
+        start_date (str, optional): Only include videos published after this date (format: YYYY-MM-DD)
+        end_date (str, optional): Only include videos published before this date (format: YYYY-MM-DD)
+        verbose (bool, optional): Whether to print status messages. Defaults to True.
+        stats (dict, optional): Dictionary whose 'round_trips' count is incremented
+            for every API request made
+        max_videos (int, optional): Maximum number of videos to fetch, see resolve_max_videos
+        full (bool, optional): Keep complete API resources instead of the fields the metrics use
+        incremental (bool, optional): Fetch only the uploads added since the channel was last
+            retrieved this way, see retrieve_uploads_incremental
+
+    Returns:
+        dict: The channel data response
+    """
+    # You'll need to set up a YouTube API key
+    # Get it from https://console.developers.google.com/
+    try:
+        # Determine which parameter to use for the API call, handles and usernames
+        # seen before are requested by their channel ID
+        lookup, resolved = channel_lookup(channel_id, username, handle)
+        if lookup is None:
+            if verbose:
+                print("Error: You must provide either a channel_id, username, or handle.")
+            return None
+
+        # Execute the request
+        response = execute_api_call('channels.list', stats=stats, full=full, part="snippet,contentDetails,statistics", **lookup)
+        if not accept_channel_lookup(response, username, handle, resolved):
+            # The stored channel ID is out of date, look the channel up by name
+            lookup, resolved = channel_lookup(channel_id, username, handle)
+            response = execute_api_call('channels.list', stats=stats, full=full, part="snippet,contentDetails,statistics", **lookup)
+            accept_channel_lookup(response, username, handle, resolved)
+
+        # Check if any channels were found
+        if not response.get('items'):
+            if verbose:
+                print("No channel found with the provided identifier.")
+            return None
+
+        # Get the uploads playlist ID
+        channel = response['items'][0]
+        uploads_playlist_id = channel['contentDetails']['relatedPlaylists']['uploads']
+
+        # Get the channel's videos and their stats, page by page
+        date_filter = build_date_filter(days_ago, start_date, end_date)
+        all_video_stats = []
+        if incremental:
+            all_video_stats = retrieve_uploads_incremental(channel, date_filter, max_videos, stats=stats, full=full)
+        else:
+            for _, video_stats_items in iter_upload_pages(uploads_playlist_id, date_filter, max_videos, stats=stats, full=full):
+                all_video_stats.extend(video_stats_items)
+
+        # Add video stats to the response
+        response['video_stats'] = {'items': all_video_stats}
+
+        return response
+
+    except QuotaExceededError:
+        raise
+    except HttpError as e:
+        if verbose:
+            print(f"YouTube API Error: {e}")
+        return None
+    except Exception as e:
+        if verbose:
+            print(f"Error retrieving YouTube data: {e}")
+        return None
+
+
+def retrieve_youtube_data_batch(channel_ids, days_ago=None, start_date=None, end_date=None, verbose=True, stats=None, max_videos=None, full=False):
+    """
+    Retrieve YouTube channel data for several channels with as few round trips as possible
+
+    Channel details are fetched 50 IDs per channels.list call, the uploads
+    playlists are paged through together as batched HTTP requests (one batch
+    per page), and the video statistics of all channels are fetched 50 IDs
+    per videos.list call.
+
+    Args:
+        channel_ids (list): YouTube channel IDs
+        days_ago (int, optional): Only include videos from the last X days
+        start_date (str, optional): Only include videos published after this date (format: YYYY-MM-DD)
+        end_date (str, optional): Only include videos published before this date (format: YYYY-MM-DD)
+        verbose (bool, optional): Whether to print status messages. Defaults to True.
+        stats (dict, optional): Dictionary whose 'round_trips' count is incremented
+            for every API request made
+        max_videos (int, optional): Maximum number of videos per channel, see resolve_max_videos
+        full (bool, optional): Keep complete API resources instead of the fields the metrics use
+
+    Returns:
+        dict: Dictionary mapping each channel ID to the response retrieve_youtube_data
+            would return for it, or None if the channel could not be retrieved. The
+            etag and pageInfo.resultsPerPage are those of the shared channels.list
+            request.
+    """
+    results = {channel_id: None for channel_id in channel_ids}
+    unique_ids = [channel_id for channel_id in results if channel_id]
+    if not unique_ids:
+        return results
+
+    # Get the channel details, up to 50 per request
+    channels = {}
+    envelopes = {}
+    for chunk in chunk_ids(unique_ids):
+        response = execute_api_call('channels.list', stats=stats, full=full, part="snippet,contentDetails,statistics",
+                                    id=','.join(chunk), maxResults=len(chunk))
+        # The fields around the items (etag, and kind and pageInfo with full) are shared by the chunk's channels
+        envelope = {key: value for key, value in response.items() if key != 'items'}
+        if 'pageInfo' in envelope:
+            envelope['pageInfo'] = dict(envelope['pageInfo'], totalResults=1)
+        for channel in response.get('items', []):
+            channels[channel['id']] = channel
+            envelopes[channel['id']] = envelope
+
+    if verbose:
+        for channel_id in unique_ids:
+            if channel_id not in channels:
+                print(f"No channel found with the provided identifier: {channel_id}")
+
+    # Page through each channel's uploads, one batch of playlistItems requests per page
+    date_filter = build_date_filter(days_ago, start_date, end_date)
+    remaining = {}
+    page_tokens = {}
+    video_ids_by_channel = {}
+    pending = [channel_id for channel_id in unique_ids if channel_id in channels]
+    for channel_id in pending:
+        remaining[channel_id] = resolve_max_videos(date_filter, max_videos)
+        video_ids_by_channel[channel_id] = []
+
+    while pending:
+        calls = [('playlistItems.list', upload_page_params(
+            channels[channel_id]['contentDetails']['relatedPlaylists']['uploads'],
+            page_tokens.get(channel_id),
+            remaining[channel_id]
+        )) for channel_id in pending]
+
+        next_pending = []
+        for channel_id, (videos_response, error) in zip(pending, execute_api_batch(calls, stats=stats, full=full)):
+            if error is not None or videos_response is None:
+                if verbose:
+                    print(f"YouTube API Error for channel {channel_id}: {error}")
+                del video_ids_by_channel[channel_id]
+                continue
+
+            items, page_tokens[channel_id] = read_upload_page(videos_response, date_filter, remaining[channel_id])
+            video_ids_by_channel[channel_id].extend(item['contentDetails']['videoId'] for item in items)
+            remaining[channel_id] -= len(items)
+            if page_tokens[channel_id]:
+                next_pending.append(channel_id)
+        pending = next_pending
+
+    # Get detailed stats for the videos of all channels, up to 50 per request
+    all_video_ids = [video_id for video_ids in video_ids_by_channel.values() for video_id in video_ids]
+    video_stats = {}
+    for chunk in chunk_ids(list(dict.fromkeys(all_video_ids))):
+        video_stats_response = execute_api_call('videos.list', stats=stats, full=full,
+                                                part="statistics,contentDetails,snippet", id=','.join(chunk))
+        for video in video_stats_response.get('items', []):
+            video_stats[video['id']] = video
+
+    for channel_id, video_ids in video_ids_by_channel.items():
+        response = dict(envelopes[channel_id], items=[channels[channel_id]])
+        response['video_stats'] = {'items': [video_stats[video_id] for video_id in video_ids if video_id in video_stats]}
+        results[channel_id] = response
+
+    return results
+
+
+def extract_direct_url(youtube_redirect_url):
+    """
+    Extract the actual direct URL from a YouTube redirect URL
+
+    Args:
+        youtube_redirect_url (str): YouTube redirect URL
+
+    Returns:
+        str: The actual direct URL or the original URL if not a redirect
+    """
+    # Check if it's a YouTube redirect URL
+    if 'youtube.com/redirect' in youtube_redirect_url:
+        try:
+            # Parse the URL and extract the 'q' parameter which contains the actual URL
+            parsed_url = urlparse(youtube_redirect_url)
+            query_params = parse_qs(parsed_url.query)
+
+            if 'q' in query_params:
+                # URL decode the 'q' parameter to get the actual URL
+                direct_url = unquote(query_params['q'][0])
+                return direct_url
+        except Exception as e:
+            print(f"Error extracting direct URL: {e}")
+
+    # If not a redirect or if there was an error, return the original URL
+    return youtube_redirect_url
+
+
+# Selectors tried, in order, while scraping a channel's about page
+COOKIE_SELECTORS = [
+    "button[aria-label='Accept all']",
+    "button[aria-label='Accept cookies']",
+    "button:has-text('Accept all')",
+    "button:has-text('Accept cookies')",
+    "button:has-text('I agree')"
+]
+LINK_SECTION_SELECTORS = ["#links-section", "#link-list-container", "a[href^='https://www.youtube.com/redirect']"]
+CHANNEL_NAME_SELECTORS = [
+    "#channel-name",
+    "#channel-header-container h1",
+    "ytd-channel-name #text"
+]
+SUBSCRIBER_SELECTORS = [
+    "#subscriber-count",
+    "yt-formatted-string.ytd-c4-tabbed-header-renderer",
+    "#meta-contents #metadata-line"
+]
+DESCRIPTION_SELECTORS = [
+    "#description",
+    "ytd-channel-about-metadata-renderer #description",
+    "#meta-contents #description"
+]
+COOKIE_SELECTOR = ", ".join(COOKIE_SELECTORS)
+LINKS_SELECTOR = ", ".join(LINK_SECTION_SELECTORS)
+COOKIE_OR_LINKS_SELECTOR = ", ".join(COOKIE_SELECTORS + LINK_SECTION_SELECTORS)
+EXTRACT_CHANNEL_SELECTORS = {
+    'channelName': CHANNEL_NAME_SELECTORS,
+    'subscribers': SUBSCRIBER_SELECTORS,
+    'description': DESCRIPTION_SELECTORS
+}
+
+# Script run in the about page to collect external links from the links section
+EXTRACT_LINKS_SCRIPT = '''
+() => {
+    // Try different selectors for the links section
+    const linkSelectors = [
+        '#link-list-container', // Older layout
+        '#links-section',       // Newer layout
+        'ytd-channel-about-metadata-renderer #links-container' // Another possible layout
+    ];
+
+    let links = [];
+
+    // Try each selector
+    for (const selector of linkSelectors) {
+        const linksSection = document.querySelector(selector);
+        if (linksSection) {
+            console.log('Found links section with selector: ' + selector);
+
+            // Try different selectors for the actual links
+            const linkElementSelectors = [
+                'a.yt-simple-endpoint',
+                'a[href]',
+                'ytd-channel-about-metadata-renderer a[href]'
+            ];
+
+            for (const linkSelector of linkElementSelectors) {
+                const linkElements = linksSection.querySelectorAll(linkSelector);
+                if (linkElements && linkElements.length > 0) {
+                    console.log('Found ' + linkElements.length + ' links with selector: ' + linkSelector);
+
+                    links = Array.from(linkElements)
+                        .filter(link => {
+                            // Filter out YouTube internal links
+                            const href = link.href;
+                            return href &&
+                                   (href.includes('youtube.com/redirect') ||
+                                    (!href.includes('youtube.com/') &&
+                                     !href.startsWith('javascript:') &&
+                                     href !== '#'));
+                        })
+                        .map(link => {
+                            return {
+                                text: link.textContent.trim() || 'Link',
+                                url: link.href
+                            };
+                        });
+
+                    if (links.length > 0) {
+                        break; // Found links, no need to try other selectors
+                    }
+                }
+            }
+
+            if (links.length > 0) {
+                break; // Found links, no need to try other sections
+            }
+        }
+    }
+
+    // If no links found with the above selectors, try a more general approach
+    if (links.length === 0) {
+        console.log('Trying general approach to find links...');
+        // Look for any links in the about section
+        const aboutSection = document.querySelector('ytd-channel-about-metadata-renderer');
+        if (aboutSection) {
+            const allLinks = aboutSection.querySelectorAll('a[href]');
+            links = Array.from(allLinks)
+                .filter(link => {
+                    // Filter out YouTube internal links
+                    const href = link.href;
+                    return href &&
+                           !href.includes('youtube.com/') &&
+                           !href.startsWith('javascript:') &&
+                           href !== '#';
+                })
+                .map(link => {
+                    return {
+                        text: link.textContent.trim() || 'Link',
+                        url: link.href
+                    };
+                });
+        }
+    }
+
+    return links;
+}
+'''
+
+# Script collecting channel name, subscriber text, description and links in one call.
+# For each field the selectors are tried in order and the first visible match wins,
+# the same way the fields used to be probed one at a time with page.is_visible.
+EXTRACT_CHANNEL_SCRIPT = '''
+(selectors) => {
+    const extractLinks = ''' + EXTRACT_LINKS_SCRIPT.strip() + ''';
+
+    const firstVisible = (candidates) => {
+        for (const selector of candidates) {
+            const element = document.querySelector(selector);
+            if (!element) {
+                continue;
+            }
+            const rect = element.getBoundingClientRect();
+            if (rect.width > 0 && rect.height > 0 && getComputedStyle(element).visibility !== 'hidden') {
+                return element;
+            }
+        }
+        return null;
+    };
+
+    const nameElement = firstVisible(selectors.channelName);
+    const subscriberElement = firstVisible(selectors.subscribers);
+
+    let description = '';
+    for (const selector of selectors.description) {
+        const element = firstVisible([selector]);
+        if (element) {
+            description = element.textContent.trim();
+            if (description) {
+                break;
+            }
+        }
+    }
+
+    return {
+        channel_name: nameElement ? nameElement.textContent.trim() : null,
+        subscriber_text: subscriberElement ? subscriberElement.textContent.trim() : null,
+        description: description,
+        links: extractLinks()
+    };
+}
+'''
+
+
+# Rough transfer sizes used to estimate the bytes saved by blocked requests,
+# aborted requests are never downloaded so their real size is unknown
+BLOCKED_BYTES_ESTIMATES = {
+    'image': 30000,
+    'media': 500000,
+    'font': 40000,
+    'stylesheet': 20000,
+    'script': 60000
+}
+
+
+def _should_block_request(resource_type, url):
+    """
+    Decide whether a request made while scraping should be aborted
+
+    Args:
+        resource_type (str): Playwright resource type of the request
+        url (str): URL of the request
+
+    Returns:
+        bool: True if the request should be blocked
+    """
+    if resource_type in SCRAPER_BLOCKED_RESOURCE_TYPES:
+        return True
+    host = (urlparse(url).hostname or '').lower()
+    return any(host == domain or host.endswith('.' + domain) for domain in SCRAPER_BLOCKED_DOMAINS)
+
+
+def _record_request(network_stats, resource_type, blocked):
+    """
+    Count a request in the network stats returned with the scrape result
+    """
+    if blocked:
+        network_stats['blocked_requests'] += 1
+        network_stats['blocked_by_type'][resource_type] = network_stats['blocked_by_type'].get(resource_type, 0) + 1
+        network_stats['blocked_bytes_estimate'] += BLOCKED_BYTES_ESTIMATES.get(resource_type, 5000)
+    else:
+        network_stats['allowed_requests'] += 1
+
+
+def _new_network_stats():
+    """
+    Create empty network stats for a scraping session
+    """
+    return {
+        'blocked_requests': 0,
+        'blocked_bytes_estimate': 0,
+        'blocked_by_type': {},
+        'allowed_requests': 0
+    }
+
+
+def block_heavy_resources(context):
+    """
+    Abort images, media, fonts, stylesheets and ad/tracking requests in a browser context
+
+    Args:
+        context: Playwright browser context to intercept requests on
+
+    Returns:
+        dict: Network stats, updated as the context makes requests
+    """
+    network_stats = _new_network_stats()
+
+    def handle_route(route):
+        request = route.request
+        blocked = _should_block_request(request.resource_type, request.url)
+        _record_request(network_stats, request.resource_type, blocked)
+        if blocked:
+            route.abort()
+        else:
+            route.continue_()
+
+    context.route("**/*", handle_route)
+    return network_stats
+
+
+async def block_heavy_resources_async(context):
+    """
+    Async version of block_heavy_resources for playwright.async_api contexts
+    """
+    network_stats = _new_network_stats()
+
+    async def handle_route(route):
+        request = route.request
+        blocked = _should_block_request(request.resource_type, request.url)
+        _record_request(network_stats, request.resource_type, blocked)
+        if blocked:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await context.route("**/*", handle_route)
+    return network_stats
+
+
+def scrape_context_options():
+    """
+    Get the options used to create a scraping browser context
+
+    When a consent state has been saved, contexts start from it so the cookie
+    dialog does not show up again.
+
+    Returns:
+        dict: Keyword arguments for browser.new_context
+    """
+    options = {'user_agent': SCRAPER_USER_AGENT}
+    if os.path.exists(CONSENT_STATE_PATH):
+        options['storage_state'] = CONSENT_STATE_PATH
+    return options
+
+
+def save_consent_state(state):
+    """
+    Save a browser storage state captured right after accepting cookies
+
+    Args:
+        state (dict): The result of context.storage_state()
+    """
+    directory = os.path.dirname(CONSENT_STATE_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Write to a temporary file first so other workers never read a partial file
+    temp_path = f"{CONSENT_STATE_PATH}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(temp_path, CONSENT_STATE_PATH)
+
+
+def _consent_status(seen, accepted):
+    """
+    Describe how cookie consent was handled for a scrape
+
+    Args:
+        seen (bool): Whether the consent dialog showed up on the page
+        accepted (bool): Whether its accept button was clicked
+
+    Returns:
+        str: 'accepted' if the dialog was shown and accepted, 'not_accepted' if it
+            was shown but clicking it failed, or 'not_shown' if it never appeared
+    """
+    if accepted:
+        return 'accepted'
+    return 'not_accepted' if seen else 'not_shown'
+
+
+class BrowserPool:
+    """
+    Long-lived pool of Chromium browsers used for channel links extraction
+
+    Each browser is owned by its own worker thread (the Playwright sync API is
+    bound to the thread that started it). Jobs are handed to whichever worker is
+    free, run inside a fresh browser context, and the context is closed afterwards.
+    A browser is relaunched after it has served max_pages pages or when it crashes.
+    If Playwright itself cannot start, the worker exits and, once no worker is
+    left, the jobs still queued fail with its error.
+    """
+
+    def __init__(self, size=BROWSER_POOL_SIZE, max_pages=BROWSER_MAX_PAGES, headless=True):
+        self.size = max(1, size)
+        self.max_pages = max(1, max_pages)
+        self.headless = headless
+        self._jobs = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {'launches': 0, 'recycles': 0, 'crashes': 0, 'pages': 0}
+
+    def _start_workers(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Browser pool has been shut down")
+            while len(self._workers) < self.size:
+                worker = threading.Thread(target=self._worker_loop, name=f"browser-pool-{len(self._workers)}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def _launch(self, playwright):
+        add_to_stats(self.stats, 'launches')
+        return playwright.chromium.launch(headless=self.headless)
+
+    def _worker_loop(self):
+        try:
+            with sync_playwright() as p:
+                self._serve_jobs(p)
+        except Exception as e:
+            self._worker_failed(e)
+
+    def _worker_failed(self, error):
+        with self._lock:
+            self._workers.remove(threading.current_thread())
+            if self._workers:
+                # The remaining workers take over the queued jobs
+                return
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None and job[1].set_running_or_notify_cancel():
+                job[1].set_exception(error)
+
+    def _serve_jobs(self, p):
+        browser = None
+        pages_served = 0
+
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            func, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                # Recycle the browser after too many pages or if it has died
+                if browser is not None and (pages_served >= self.max_pages or not browser.is_connected()):
+                    add_to_stats(self.stats, 'recycles')
+                    try:
+                        browser.close()
+                    except Exception:
+                        pass
+                    browser = None
+                if browser is None:
+                    browser = self._launch(p)
+                    pages_served = 0
+
+                context = browser.new_context(**scrape_context_options())
+                try:
+                    future.set_result(func(context))
+                finally:
+                    pages_served += 1
+                    add_to_stats(self.stats, 'pages')
+                    try:
+                        context.close()
+                    except Exception:
+                        pass
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                # Drop the browser so the next job gets a fresh one
+                if browser is not None and not browser.is_connected():
+                    add_to_stats(self.stats, 'crashes')
+                    browser = None
+
+        if browser is not None:
+            try:
+                browser.close()
+            except Exception:
+                pass
+
+    def run(self, func, timeout=None):
+        """
+        Run func(context) on a pooled browser and return its result
+
+        Args:
+            func (callable): Function receiving a fresh browser context
+            timeout (float, optional): Seconds to wait for the result. Defaults to BROWSER_JOB_TIMEOUT.
+
+        Returns:
+            The value returned by func
+
+        Raises:
+            TimeoutError: If no worker finished the job within timeout seconds
+        """
+        timeout = BROWSER_JOB_TIMEOUT if timeout is None else timeout
+        self._start_workers()
+        future = Future()
+        self._jobs.put((func, future))
+        try:
+            return future.result(timeout=timeout)
+        except FuturesTimeoutError:
+            # Keep a worker from picking the job up later
+            future.cancel()
+            raise TimeoutError(f"Browser pool did not finish the job within {timeout:g} seconds")
+
+    def shutdown(self, wait=True):
+        """
+        Close all browsers and stop the worker threads
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+        for _ in workers:
+            self._jobs.put(None)
+        if wait:
+            for worker in workers:
+                worker.join(timeout=10)
+
+
+_browser_pools = {}
+_browser_pools_lock = threading.Lock()
+
+
+def get_browser_pool(headless=True):
+    """
+    Get the process-wide browser pool, creating it on first use
+
+    Args:
+        headless (bool): Whether the pooled browsers run in headless mode
+
+    Returns:
+        BrowserPool: The shared browser pool
+    """
+    with _browser_pools_lock:
+        pool = _browser_pools.get(headless)
+        if pool is None:
+            pool = BrowserPool(headless=headless)
+            _browser_pools[headless] = pool
+        return pool
+
+
+def shutdown_browser_pools():
+    """
+    Shut down all browser pools and links engines, closing every pooled browser
+    """
+    with _browser_pools_lock:
+        pools = list(_browser_pools.values()) + list(_links_engines.values())
+        _browser_pools.clear()
+        _links_engines.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+atexit.register(shutdown_browser_pools)
+
+
+def get_channel_links(url, headless=True, verbose=True):
+    """
+    Get all external links from a YouTube channel's about page
+
+    Args:
+        url (str): YouTube channel URL
+        headless (bool): Whether to run browser in headless mode
+        verbose (bool, optional): Whether to print status messages. Defaults to True.
+
+    Returns:
+        dict: Dictionary containing channel info and links
+    """
+    # Make sure the URL is a YouTube channel
+    if 'youtube.com' not in url:
+        raise ValueError("URL must be a YouTube channel URL")
+
+    # Ensure the URL points to the about page
+    if not url.endswith('/about'):
+        if url.endswith('/'):
+            url = url + 'about'
+        else:
+            url = url + '/about'
+
+    def scrape(context):
+        network_stats = block_heavy_resources(context) if SCRAPER_BLOCK_RESOURCES else None
+        result = _scrape_about_page(context, url, verbose=verbose)
+        if network_stats is not None:
+            result['network'] = network_stats
+            if verbose:
+                print(f"Blocked {network_stats['blocked_requests']} requests "
+                      f"(~{network_stats['blocked_bytes_estimate'] // 1024} KB)")
+        return result
+
+    pool = get_browser_pool(headless=headless)
+    return pool.run(scrape)
+
+
+def _channel_id_from_url(url):
+    """
+    Extract the channel ID (or @handle) from a channel about page URL
+
+    Args:
+        url (str): YouTube channel URL
+
+    Returns:
+        str: The channel ID, the @handle, or "Unknown"
+    """
+    channel_id = "Unknown"
+    parsed_url = urlparse(url)
+    path_parts = parsed_url.path.strip('/').split('/')
+
+    if 'channel' in path_parts:
+        # URL format: youtube.com/channel/CHANNEL_ID/about
+        idx = path_parts.index('channel')
+        if idx + 1 < len(path_parts):
+            channel_id = path_parts[idx + 1]
+    elif '@' in path_parts[0]:
+        # URL format: youtube.com/@USERNAME/about
+        # We'll use the handle as the ID
+        channel_id = path_parts[0]
+
+    return channel_id
+
+
+def _build_links_result(url, extracted):
+    """
+    Build the get_channel_links result from the values returned by EXTRACT_CHANNEL_SCRIPT
+
+    Args:
+        url (str): URL of the channel's about page
+        extracted (dict): Values collected in the page
+
+    Returns:
+        dict: Dictionary containing channel info and links
+    """
+    subscriber_text = extracted.get('subscriber_text')
+    return {
+        'channel_name': extracted.get('channel_name') or "Unknown",
+        'channel_id': _channel_id_from_url(url),
+        'subscriber_count': subscriber_text if subscriber_text and 'subscribers' in subscriber_text.lower() else "Unknown",
+        'description': extracted.get('description') or "",
+        'links': extracted.get('links') or []
+    }
+
+
+def _scrape_about_page(context, url, verbose=True):
+    """
+    Scrape a YouTube channel's about page using an existing browser context
+
+    Args:
+        context: Playwright browser context to open the page in
+        url (str): URL of the channel's about page
+        verbose (bool, optional): Whether to print status messages. Defaults to True.
+
+    Returns:
+        dict: Dictionary containing channel info and links
+    """
+    page = context.new_page()
+
+    # Navigate to the about page
+    if verbose:
+        print(f"Navigating to {url}")
+    try:
+        # Use a shorter timeout and don't wait for network to be idle
+        page.goto(url, wait_until="domcontentloaded", timeout=15000)
+        if verbose:
+            print("Page loaded")
+    except Exception as e:
+        if verbose:
+            print(f"Error loading page: {e}")
+        raise
+
+    consent_seen = consent_accepted = False
+    try:
+        # Wait once for either a cookie consent button or the links section
+        page.wait_for_selector(COOKIE_OR_LINKS_SELECTOR, timeout=SCRAPER_WAIT_TIMEOUT)
+
+        # Accept cookies if the dialog appeared, then wait for the links section
+        consent_button = page.locator(COOKIE_SELECTOR).first
+        if consent_button.is_visible():
+            consent_seen = True
+            if verbose:
+                print("Accepting cookies")
+            consent_button.click()
+            consent_accepted = True
+            try:
+                page.wait_for_selector(LINKS_SELECTOR, timeout=SCRAPER_WAIT_TIMEOUT)
+            finally:
+                # Save the consent so later contexts skip the dialog
+                save_consent_state(context.storage_state())
+    except Exception as e:
+        if verbose:
+            print(f"Warning during page load: {e}")
+            print("Continuing anyway...")
+
+    # Collect name, subscribers, description and links in a single round trip
+    if verbose:
+        print("Extracting channel info and links...")
+    extracted = page.evaluate(EXTRACT_CHANNEL_SCRIPT, EXTRACT_CHANNEL_SELECTORS)
+    result = _build_links_result(url, extracted)
+    result['consent'] = _consent_status(consent_seen, consent_accepted)
+
+    if verbose:
+        print(f"Found {len(result['links'])} links")
+
+    # Close the page, the context is closed by the browser pool
+    page.close()
+
+    return result
+
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """
+    Get the shared requests session used for browserless about page fetches
+
+    Returns:
+        requests.Session: Session with pooled keep-alive connections
+    """
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(10, SCRAPER_MAX_CONCURRENCY * 2))
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update({
+                'User-Agent': SCRAPER_USER_AGENT,
+                'Accept-Language': 'en-US,en;q=0.9'
+            })
+            # Pre-accept the cookie consent so EU requests get the channel page
+            session.cookies.set('CONSENT', 'YES+cb', domain='.youtube.com')
+            session.cookies.set('SOCS', 'CAI', domain='.youtube.com')
+            _http_session = session
+        return _http_session
+
+
+def parse_yt_initial_data(html):
+    """
+    Parse the ytInitialData JSON embedded in a YouTube page
+
+    Args:
+        html (str): The page HTML
+
+    Returns:
+        dict: The parsed ytInitialData, or None if it is missing or invalid
+    """
+    match = re.search(r'(?:var\s+ytInitialData|window\["ytInitialData"\])\s*=\s*', html)
+    if not match:
+        return None
+    try:
+        data, _ = json.JSONDecoder().raw_decode(html, match.end())
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _find_values(data, key):
+    """
+    Yield every value stored under key anywhere in a nested JSON structure
+    """
+    stack = [data]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            for k, v in current.items():
+                if k == key:
+                    yield v
+                if isinstance(v, (dict, list)):
+                    stack.append(v)
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+
+
+def _json_text(value):
+    """
+    Get plain text from a ytInitialData text value (string, simpleText, runs or content)
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        if 'simpleText' in value:
+            return value['simpleText']
+        if 'content' in value:
+            return value['content']
+        if 'runs' in value:
+            return ''.join(run.get('text', '') for run in value['runs'])
+    return None
+
+
+def _absolute_youtube_url(url):
+    if url and url.startswith('/'):
+        return 'https://www.youtube.com' + url
+    return url
+
+
+def extract_links_from_initial_data(data, url):
+    """
+    Build a get_channel_links result from a channel's ytInitialData
+
+    Supports the current about panel (aboutChannelViewModel) and the older
+    channelAboutFullMetadataRenderer layout.
+
+    Args:
+        data (dict): The parsed ytInitialData
+        url (str): URL of the channel's about page
+
+    Returns:
+        dict: Dictionary containing channel info and links, or None if the data has no about section
+    """
+    about = next(_find_values(data, 'aboutChannelViewModel'), None)
+    legacy_about = next(_find_values(data, 'channelAboutFullMetadataRenderer'), None)
+    if about is None and legacy_about is None:
+        return None
+
+    channel_metadata = data.get('metadata', {}).get('channelMetadataRenderer', {})
+    links = []
+    channel_name = channel_metadata.get('title')
+    subscriber_text = None
+    description = None
+
+    if about is not None:
+        subscriber_text = _json_text(about.get('subscriberCountText'))
+        description = _json_text(about.get('description'))
+        for link in about.get('links', []):
+            view_model = link.get('channelExternalLinkViewModel', {})
+            link_text = _json_text(view_model.get('link'))
+            title = _json_text(view_model.get('title'))
+            href = next((value.get('url') for value in _find_values(view_model, 'urlEndpoint') if isinstance(value, dict)), None)
+            if href:
+                links.append({'text': link_text or title or 'Link', 'url': _absolute_youtube_url(href)})
+    else:
+        channel_name = channel_name or _json_text(legacy_about.get('title'))
+        subscriber_text = _json_text(legacy_about.get('subscriberCountText'))
+        description = _json_text(legacy_about.get('description'))
+        for link in legacy_about.get('primaryLinks', []):
+            href = link.get('navigationEndpoint', {}).get('urlEndpoint', {}).get('url')
+            if href:
+                links.append({'text': _json_text(link.get('title')) or 'Link', 'url': _absolute_youtube_url(href)})
+
+    if not subscriber_text:
+        subscriber_text = next((_json_text(value) for value in _find_values(data, 'subscriberCountText')), None)
+
+    return _build_links_result(url, {
+        'channel_name': channel_name,
+        'subscriber_text': subscriber_text,
+        'description': description or channel_metadata.get('description'),
+        'links': links
+    })
+
+
+def get_channel_links_http(url, verbose=True):
+    """
+    Get channel info and external links without a browser, from the page's ytInitialData
+
+    Args:
+        url (str): YouTube channel URL
+        verbose (bool, optional): Whether to print status messages. Defaults to True.
+
+    Returns:
+        dict: Dictionary containing channel info and links, or None if the page has no usable ytInitialData
+    """
+    url = _about_url_for_identifier(url)
+    if verbose:
+        print(f"Fetching {url} over HTTP")
+    response = get_http_session().get(url, timeout=10)
+    response.raise_for_status()
+
+    data = parse_yt_initial_data(response.text)
+    if data is None:
+        if verbose:
+            print("ytInitialData not found in the page")
+        return None
+
+    result = extract_links_from_initial_data(data, url)
+    if result is None:
+        if verbose:
+            print("ytInitialData has no about section")
+        return None
+
+    # The page names its channel ID, remember what the handle or custom URL resolved to
+    alias = channel_alias_from_identifier(url)
+    channel_id = data.get('metadata', {}).get('channelMetadataRenderer', {}).get('externalId')
+    if alias and channel_id:
+        remember_channel_id(channel_id, **alias)
+
+    if verbose:
+        print(f"Found {len(result['links'])} links")
+    result['source'] = 'http'
+    return result
+
+
+def links_extraction_available(mode=None):
+    """
+    Check whether channel links can be extracted with the given mode
+
+    Args:
+        mode (str, optional): 'browser', 'http' or 'auto'. Defaults to LINK_EXTRACTION_MODE.
+
+    Returns:
+        bool: False only when the mode needs Playwright and it is not installed
+    """
+    return PLAYWRIGHT_AVAILABLE or (mode or LINK_EXTRACTION_MODE) != 'browser'
+
+
+def extract_channel_links(url, mode=None, headless=True, verbose=True):
+    """
+    Get channel info and external links using the requested extraction mode
+
+    Args:
+        url (str): YouTube channel URL
+        mode (str, optional): 'browser' to always use Playwright, 'http' to only parse
+            ytInitialData, or 'auto' to parse ytInitialData and fall back to Playwright
+            when it is missing or cannot be read. Defaults to LINK_EXTRACTION_MODE.
+        headless (bool): Whether to run browser in headless mode
+        verbose (bool, optional): Whether to print status messages. Defaults to True.
+
+    Returns:
+        dict: Dictionary containing channel info and links
+    """
+    mode = mode or LINK_EXTRACTION_MODE
+    if mode not in LINK_EXTRACTION_MODES:
+        raise ValueError(f"mode must be one of {', '.join(LINK_EXTRACTION_MODES)}")
+
+    if mode in ('http', 'auto'):
+        try:
+            result = get_channel_links_http(url, verbose=verbose)
+        except Exception as e:
+            # Network errors, and ytInitialData whose shape has changed
+            if mode == 'http':
+                raise
+            if verbose:
+                print(f"HTTP extraction failed, falling back to Playwright: {e}")
+            result = None
+        if result is not None:
+            return result
+        if mode == 'http':
+            raise ValueError("Could not find ytInitialData in the channel page")
+        if not PLAYWRIGHT_AVAILABLE:
+            raise RuntimeError("ytInitialData not found and Playwright is not available")
+
+    result = get_channel_links(url, headless=headless, verbose=verbose)
+    result['source'] = 'browser'
+    return result
 
-def retrieve_youtube_data(channel_id=None, username=None, handle=None, days_ago=None, start_date=None, end_date=None, verbose=True):
+
+def build_about_url(channel_id=None, username=None, handle=None, custom_url=None):
     """
-    Retrieve YouTube channel data using the YouTube Data API
+    Build the about page URL for a YouTube channel
 
     Args:
         channel_id (str, optional): The YouTube channel ID
         username (str, optional): The YouTube username
         handle (str, optional): The YouTube handle (with or without @)
-        days_ago (int, optional): Only include videos from the last X days
-        start_date (str, optional): Only include videos published after this date (format: YYYY-MM-DD)
-        end_date (str, optional): Only include videos published before this date (format: YYYY-MM-DD)
-        verbose (bool, optional): Whether to print status messages. Defaults to True.
+        custom_url (str, optional): The name of a youtube.com/c/ custom URL
 
     Returns:
-        dict: The channel data response
+        str: The about page URL, or None if no identifier was provided
     """
-    # You'll need to set up a YouTube API key
-    # Get it from https://console.developers.google.com/
-    api_key = API_KEY
+    if channel_id:
+        return f"https://www.youtube.com/channel/{channel_id}/about"
+    elif username:
+        return f"https://www.youtube.com/user/{username}/about"
+    elif handle:
+        # Remove @ if it exists
+        if handle.startswith('@'):
+            handle = handle[1:]
+        return f"https://www.youtube.com/@{handle}/about"
+    elif custom_url:
+        return f"https://www.youtube.com/c/{custom_url}/about"
+    return None
 
-    try:
-        # Initialize the YouTube API client
-        youtube = build('youtube', 'v3', developerKey=api_key)
-
-        # Determine which parameter to use for the API call
-        if channel_id:
-            request = youtube.channels().list(
-                part="snippet,contentDetails,statistics",
-                id=channel_id
-            )
-        elif username:
-            request = youtube.channels().list(
-                part="snippet,contentDetails,statistics",
-                forUsername=username
-            )
-        elif handle:
-            # Remove @ if it exists
-            if handle.startswith('@'):
-                handle = handle[1:]
-            request = youtube.channels().list(
-                part="snippet,contentDetails,statistics",
-                forHandle=handle
-            )
-        else:
-            if verbose:
-                print("Error: You must provide either a channel_id, username, or handle.")
-            return None
 
-        # Execute the request
-        response = request.execute()
+def _empty_links_result(identifier=None, error=None):
+    """
+    Build the result returned when channel links could not be extracted
 
-        # Check if any channels were found
-        if not response.get('items'):
-            if verbose:
-                print("No channel found with the provided identifier.")
-            return None
+    Args:
+        identifier (str, optional): The channel identifier that was requested
+        error (str, optional): The error message to include
 
-        # Get the uploads playlist ID
-        channel = response['items'][0]
-        uploads_playlist_id = channel['contentDetails']['relatedPlaylists']['uploads']
+    Returns:
+        dict: Dictionary with the same keys as get_channel_links
+    """
+    result = {
+        'channel_name': 'Unknown',
+        'channel_id': identifier or 'Unknown',
+        'subscriber_count': 'Unknown',
+        'description': '',
+        'links': []
+    }
+    if error is not None:
+        result['error'] = error
+    return result
 
-        # Get the channel's videos
-        videos_request = youtube.playlistItems().list(
-            part="snippet,contentDetails",
-            playlistId=uploads_playlist_id,
-            maxResults=50  # Maximum allowed by the API
-        )
-        videos_response = videos_request.execute()
 
-        # Filter videos by date
-        if days_ago is not None or start_date is not None or end_date is not None:
-            filtered_items = []
+def _links_cache_key(channel_id=None, username=None, handle=None, custom_url=None):
+    """
+    Build the links cache key for a channel, preferring the channel ID
+
+    Returns:
+        str: The cache key, or None if no identifier was provided
+    """
+    if channel_id:
+        return channel_id
+    if username:
+        return f"user:{username.lower()}"
+    if handle:
+        return '@' + handle.lstrip('@').lower()
+    if custom_url:
+        return f"c:{custom_url.lower()}"
+    return None
 
-            # Calculate cutoff date if days_ago is specified
-            cutoff_date_str = None
-            if days_ago is not None:
-                cutoff_date = datetime.datetime.now() - datetime.timedelta(days=days_ago)
-                cutoff_date_str = cutoff_date.isoformat() + 'Z'
 
-            # Convert start_date and end_date to ISO format if provided
-            start_date_str = None
-            if start_date is not None:
-                try:
-                    start_date_obj = datetime.datetime.strptime(start_date, "%Y-%m-%d")
-                    start_date_str = start_date_obj.isoformat() + 'Z'
-                except ValueError:
-                    print(f"Warning: Invalid start_date format. Expected YYYY-MM-DD, got {start_date}")
+def _links_cache_key_for_identifier(identifier):
+    """
+    Build the links cache key for a channel ID or @handle (URLs are not cached)
+    """
+    if 'youtube.com' in identifier:
+        return None
+    if identifier.startswith('UC') and len(identifier) == 24:
+        return _links_cache_key(channel_id=identifier)
+    return _links_cache_key(handle=identifier)
 
-            end_date_str = None
-            if end_date is not None:
-                try:
-                    # Set end_date to the end of the day (23:59:59)
-                    end_date_obj = datetime.datetime.strptime(end_date, "%Y-%m-%d")
-                    end_date_obj = end_date_obj.replace(hour=23, minute=59, second=59)
-                    end_date_str = end_date_obj.isoformat() + 'Z'
-                except ValueError:
-                    print(f"Warning: Invalid end_date format. Expected YYYY-MM-DD, got {end_date}")
 
-            # Filter videos based on the date criteria
-            for item in videos_response.get('items', []):
-                published_at = item['snippet']['publishedAt']
+def get_cached_links(cache_key):
+    """
+    Look up a links result in the persistent links cache
+
+    Args:
+        cache_key (str): Key built by _links_cache_key
+
+    Returns:
+        dict: The cached result marked with cache='hit', or None on a miss
+    """
+    if not cache_key:
+        return None
+    try:
+        cached = link_cache.get(cache_key)
+    except sqlite3.Error as e:
+        print(f"Warning: Could not read links cache: {e}")
+        return None
+    if cached is not None:
+        cached['cache'] = 'hit'
+    return cached
 
-                # Check if the video meets all the specified date criteria
-                meets_criteria = True
 
-                if cutoff_date_str is not None and published_at < cutoff_date_str:
-                    meets_criteria = False
+def cache_links_result(cache_key, result):
+    """
+    Store a links result in the persistent links cache
 
-                if start_date_str is not None and published_at < start_date_str:
-                    meets_criteria = False
+    Failed extractions are cached for LINK_CACHE_NEGATIVE_TTL seconds so a broken
+    page is not scraped on every request, successful ones for LINK_CACHE_TTL.
 
-                if end_date_str is not None and published_at > end_date_str:
-                    meets_criteria = False
+    Args:
+        cache_key (str): Key built by _links_cache_key
+        result (dict): The links result to store
+    """
+    if not cache_key or result is None:
+        return
+    try:
+        ttl = LINK_CACHE_NEGATIVE_TTL if result.get('error') else LINK_CACHE_TTL
+        link_cache.set(cache_key, {k: v for k, v in result.items() if k != 'cache'}, ttl=ttl)
+    except sqlite3.Error as e:
+        print(f"Warning: Could not write links cache: {e}")
+    result['cache'] = 'miss'
 
-                if meets_criteria:
-                    filtered_items.append(item)
 
-            videos_response['items'] = filtered_items
+def get_channel_links_playwright(channel_id=None, username=None, handle=None, headless=True, verbose=True, mode=None, refresh=False, dispatch=None,
+                                 custom_url=None):
+    """
+    Get all external links from a YouTube channel's about page using Playwright
 
-        # Get detailed stats for each video
-        video_ids = [item['contentDetails']['videoId'] for item in videos_response.get('items', [])]
+    Args:
+        channel_id (str, optional): The YouTube channel ID
+        username (str, optional): The YouTube username
+        handle (str, optional): The YouTube handle (with or without @)
+        headless (bool): Whether to run browser in headless mode
+        verbose (bool, optional): Whether to print status messages. Defaults to True.
+        mode (str, optional): 'browser', 'http' or 'auto', see extract_channel_links.
+            Defaults to LINK_EXTRACTION_MODE.
+        refresh (bool, optional): Skip the links cache and scrape the page again. Defaults to False.
+        dispatch (str, optional): 'inline' to scrape in this process or 'worker' to hand the
+            job to the scraper worker process. Defaults to SCRAPER_DISPATCH.
+        custom_url (str, optional): The name of a youtube.com/c/ custom URL
 
-        if video_ids:
-            # Split into chunks of 50 (API limit)
-            video_id_chunks = [video_ids[i:i+50] for i in range(0, len(video_ids), 50)]
-
-            all_video_stats = []
-            for chunk in video_id_chunks:
-                video_stats_request = youtube.videos().list(
-                    part="statistics,contentDetails,snippet",
-                    id=','.join(chunk)
-                )
-                video_stats_response = video_stats_request.execute()
-                all_video_stats.extend(video_stats_response.get('items', []))
+    Returns:
+        dict: Dictionary containing channel info and links
+    """
+    mode = mode or LINK_EXTRACTION_MODE
+    if not channel_id:
+        # Handles, usernames and custom URLs seen before are cached and scraped under their channel ID
+        channel_id = lookup_channel_id(username=username, handle=handle, custom_url=custom_url)
+    cache_key = _links_cache_key(channel_id, username, handle, custom_url)
+    if not refresh:
+        cached = get_cached_links(cache_key)
+        if cached is not None:
+            if verbose:
+                print(f"Using cached links for {cache_key}")
+            return cached
 
-            # Add video stats to the response
-            response['video_stats'] = {'items': all_video_stats}
-        else:
-            response['video_stats'] = {'items': []}
+    if (dispatch or SCRAPER_DISPATCH) == 'worker':
+        # The worker scrapes and fills the links cache, we only wait for the result
+        payload = {'channel_id': channel_id, 'username': username, 'handle': handle, 'custom_url': custom_url,
+                   'headless': headless, 'mode': mode, 'refresh': refresh}
+        if verbose:
+            print("Waiting for the scraper worker...")
+        try:
+            return scrape_job_queue.run(payload)
+        except Exception as e:
+            if verbose:
+                print(f"Error waiting for the scraper worker: {e}")
+            return _empty_links_result(channel_id or username or handle or custom_url, error=str(e))
 
-        return response
+    if mode == 'browser' and not PLAYWRIGHT_AVAILABLE:
+        if verbose:
+            print("Playwright is not available. Cannot extract channel links.")
+            print("To install: pip install playwright")
+            print("Then run: playwright install")
+        return _empty_links_result(channel_id)
 
-    except HttpError as e:
+    # Construct the URL based on the provided parameters
+    url = build_about_url(channel_id, username, handle, custom_url)
+    if not url:
         if verbose:
-            print(f"YouTube API Error: {e}")
+            print("Error: You must provide either a channel_id, username, handle or custom_url.")
         return None
+
+    try:
+        result = extract_channel_links(url, mode=mode, headless=headless, verbose=verbose)
     except Exception as e:
         if verbose:
-            print(f"Error retrieving YouTube data: {e}")
-        return None
+            print(f"Error in get_channel_links_playwright: {e}")
+            import traceback
+            print(traceback.format_exc())
+        # Return empty result on error
+        result = _empty_links_result(channel_id or username or handle or custom_url, error=str(e))
 
+    cache_links_result(cache_key, result)
+    return result
 
-def extract_direct_url(youtube_redirect_url):
+
+def _about_url_for_identifier(identifier):
     """
-    Extract the actual direct URL from a YouTube redirect URL
+    Build the about page URL for a channel ID, @handle or channel URL
 
     Args:
-        youtube_redirect_url (str): YouTube redirect URL
+        identifier (str): Channel ID (UC...), handle (@name) or YouTube channel URL
 
     Returns:
-        str: The actual direct URL or the original URL if not a redirect
+        str: The about page URL
     """
-    # Check if it's a YouTube redirect URL
-    if 'youtube.com/redirect' in youtube_redirect_url:
+    if 'youtube.com' in identifier:
+        url = identifier.rstrip('/')
+        return url if url.endswith('/about') else url + '/about'
+    if identifier.startswith('@'):
+        return build_about_url(handle=identifier)
+    if identifier.startswith('UC') and len(identifier) == 24:
+        return build_about_url(channel_id=identifier)
+    return build_about_url(handle=identifier)
+
+
+async def _scrape_about_page_async(context, url, verbose=False):
+    """
+    Async version of _scrape_about_page built on playwright.async_api
+
+    Args:
+        context: Async Playwright browser context to open the page in
+        url (str): URL of the channel's about page
+        verbose (bool, optional): Whether to print status messages. Defaults to False.
+
+    Returns:
+        dict: Dictionary containing channel info and links
+    """
+    page = await context.new_page()
+
+    if verbose:
+        print(f"Navigating to {url}")
+    await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+
+    consent_seen = consent_accepted = False
+    try:
+        await page.wait_for_selector(COOKIE_OR_LINKS_SELECTOR, timeout=SCRAPER_WAIT_TIMEOUT)
+
+        consent_button = page.locator(COOKIE_SELECTOR).first
+        if await consent_button.is_visible():
+            consent_seen = True
+            if verbose:
+                print("Accepting cookies")
+            await consent_button.click()
+            consent_accepted = True
+            try:
+                await page.wait_for_selector(LINKS_SELECTOR, timeout=SCRAPER_WAIT_TIMEOUT)
+            finally:
+                save_consent_state(await context.storage_state())
+    except Exception as e:
+        if verbose:
+            print(f"Warning during page load: {e}")
+
+    extracted = await page.evaluate(EXTRACT_CHANNEL_SCRIPT, EXTRACT_CHANNEL_SELECTORS)
+    await page.close()
+
+    result = _build_links_result(url, extracted)
+    result['consent'] = _consent_status(consent_seen, consent_accepted)
+    return result
+
+
+class AsyncLinksEngine:
+    """
+    Concurrent about page scraper built on playwright.async_api
+
+    The engine runs its own event loop in a background thread and keeps one
+    browser open across batches. Each channel gets a fresh context, and at most
+    max_concurrency pages are in flight at once, so a batch takes roughly as long
+    as its slowest page instead of the sum of all pages.
+    """
+
+    def __init__(self, max_concurrency=SCRAPER_MAX_CONCURRENCY, headless=True, max_pages=BROWSER_MAX_PAGES):
+        self.max_concurrency = max(1, max_concurrency)
+        self.headless = headless
+        self.max_pages = max(1, max_pages)
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._playwright = None
+        self._browser = None
+        self._retired = set()
+        self._browser_lock = None
+        self._semaphore = None
+        self._pages_served = 0
+        self.stats = {'launches': 0, 'recycles': 0, 'pages': 0}
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="async-links-engine", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    async def _get_browser(self):
+        async with self._browser_lock:
+            if self._browser is not None and (self._pages_served >= self.max_pages or not self._browser.is_connected()):
+                # Let pages already running on the old browser finish before closing it
+                self.stats['recycles'] += 1
+                self._retired.add(self._browser)
+                self._browser = None
+            if self._browser is None:
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=self.headless)
+                self._pages_served = 0
+                self.stats['launches'] += 1
+            self._pages_served += 1
+            return self._browser
+
+    async def _close_if_retired(self, browser):
+        if browser in self._retired and not browser.contexts:
+            self._retired.discard(browser)
+            try:
+                await browser.close()
+            except Exception:
+                pass
+
+    async def scrape(self, identifier, verbose=False):
+        """
+        Scrape one channel's about page
+
+        Args:
+            identifier (str): Channel ID, @handle or channel URL
+            verbose (bool, optional): Whether to print status messages. Defaults to False.
+
+        Returns:
+            dict: Dictionary containing channel info and links
+        """
+        url = _about_url_for_identifier(identifier)
+        if self._semaphore is None:
+            self._browser_lock = asyncio.Lock()
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            browser = None
+            context = None
+            try:
+                browser = await self._get_browser()
+                context = await browser.new_context(**scrape_context_options())
+                self.stats['pages'] += 1
+                network_stats = await block_heavy_resources_async(context) if SCRAPER_BLOCK_RESOURCES else None
+                result = await _scrape_about_page_async(context, url, verbose=verbose)
+                if network_stats is not None:
+                    result['network'] = network_stats
+                return result
+            except Exception as e:
+                if verbose:
+                    print(f"Error scraping {url}: {e}")
+                return _empty_links_result(identifier, error=str(e))
+            finally:
+                if context is not None:
+                    try:
+                        await context.close()
+                    except Exception:
+                        pass
+                if browser is not None:
+                    await self._close_if_retired(browser)
+
+    async def scrape_many(self, identifiers, verbose=False):
+        """
+        Scrape several channels' about pages concurrently
+
+        Args:
+            identifiers (list): Channel IDs, @handles or channel URLs
+            verbose (bool, optional): Whether to print status messages. Defaults to False.
+
+        Returns:
+            list: One result dictionary per identifier, in the same order
+        """
+        return await asyncio.gather(*(self.scrape(identifier, verbose=verbose) for identifier in identifiers))
+
+    def submit(self, identifiers, verbose=False):
+        """
+        Schedule a batch on the engine's event loop from any thread
+
+        Returns:
+            concurrent.futures.Future: Future resolving to the list of results
+        """
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self.scrape_many(identifiers, verbose=verbose), loop)
+
+    def run(self, identifiers, verbose=False, timeout=None):
+        """
+        Scrape a batch of channels and block until all results are ready
+
+        Raises:
+            TimeoutError: If the batch did not finish within timeout seconds
+        """
+        future = self.submit(identifiers, verbose=verbose)
         try:
-            # Parse the URL and extract the 'q' parameter which contains the actual URL
-            parsed_url = urlparse(youtube_redirect_url)
-            query_params = parse_qs(parsed_url.query)
+            return future.result(timeout=timeout)
+        except FuturesTimeoutError:
+            # Stop the scrapes still running on the event loop
+            future.cancel()
+            raise TimeoutError(f"Links extraction did not finish within {timeout:g} seconds")
+
+    async def _close(self):
+        browsers = list(self._retired)
+        if self._browser is not None:
+            browsers.append(self._browser)
+        self._browser = None
+        self._retired.clear()
+        for browser in browsers:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    def shutdown(self):
+        """
+        Close the browser and stop the event loop thread
+        """
+        with self._lock:
+            loop = self._loop
+            self._loop = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close(), loop).result(timeout=10)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=10)
 
-            if 'q' in query_params:
-                # URL decode the 'q' parameter to get the actual URL
-                direct_url = unquote(query_params['q'][0])
-                return direct_url
-        except Exception as e:
-            print(f"Error extracting direct URL: {e}")
 
-    # If not a redirect or if there was an error, return the original URL
-    return youtube_redirect_url
+_links_engines = {}
 
 
-def get_channel_links(url, headless=True, verbose=True):
+def get_links_engine(headless=True):
     """
-    Get all external links from a YouTube channel's about page
+    Get the process-wide async links engine, creating it on first use
 
     Args:
-        url (str): YouTube channel URL
+        headless (bool): Whether the engine's browser runs in headless mode
+
+    Returns:
+        AsyncLinksEngine: The shared engine
+    """
+    with _browser_pools_lock:
+        engine = _links_engines.get(headless)
+        if engine is None:
+            engine = AsyncLinksEngine(headless=headless)
+            _links_engines[headless] = engine
+        return engine
+
+
+async def get_channels_links_async(identifiers, headless=True, verbose=False):
+    """
+    Extract links for several channels concurrently from async code
+
+    Args:
+        identifiers (list): Channel IDs, @handles or channel URLs
         headless (bool): Whether to run browser in headless mode
-        verbose (bool, optional): Whether to print status messages. Defaults to True.
+        verbose (bool, optional): Whether to print status messages. Defaults to False.
 
     Returns:
-        dict: Dictionary containing channel info and links
+        list: One dictionary per identifier, shaped like get_channel_links results
     """
-    # Make sure the URL is a YouTube channel
-    if 'youtube.com' not in url:
-        raise ValueError("URL must be a YouTube channel URL")
+    if not PLAYWRIGHT_AVAILABLE:
+        return [_empty_links_result(identifier) for identifier in identifiers]
+    return await asyncio.wrap_future(get_links_engine(headless=headless).submit(identifiers, verbose=verbose))
 
-    # Ensure the URL points to the about page
-    if not url.endswith('/about'):
-        if url.endswith('/'):
-            url = url + 'about'
+
+def _identifier_to_channel_kwargs(identifier):
+    """
+    Split a channel ID, @handle or channel URL into get_channel_links_playwright arguments
+    """
+    if 'youtube.com' in identifier:
+        path_parts = urlparse(identifier).path.strip('/').split('/')
+        if len(path_parts) > 1 and path_parts[0] == 'channel':
+            return {'channel_id': path_parts[1]}
+        if len(path_parts) > 1 and path_parts[0] == 'user':
+            return {'username': path_parts[1]}
+        if len(path_parts) > 1 and path_parts[0] == 'c':
+            return {'custom_url': path_parts[1]}
+        return {'handle': path_parts[0]}
+    if identifier.startswith('UC') and len(identifier) == 24:
+        return {'channel_id': identifier}
+    return {'handle': identifier}
+
+
+def _resolve_identifier(identifier):
+    """Replace a @handle or channel URL by its channel ID if the resolution index knows it"""
+    alias = channel_alias_from_identifier(identifier)
+    return (lookup_channel_id(**alias) if alias else None) or identifier
+
+
+def get_channels_links(identifiers, headless=True, verbose=False, mode=None, refresh=False, dispatch=None):
+    """
+    Extract links for several channels concurrently
+
+    Args:
+        identifiers (list): Channel IDs, @handles or channel URLs
+        headless (bool): Whether to run browser in headless mode
+        verbose (bool, optional): Whether to print status messages. Defaults to False.
+        mode (str, optional): 'browser', 'http' or 'auto', see extract_channel_links.
+            Defaults to LINK_EXTRACTION_MODE.
+        refresh (bool, optional): Skip the links cache and scrape every page again. Defaults to False.
+        dispatch (str, optional): 'inline' or 'worker', see get_channel_links_playwright
+
+    Returns:
+        list: One dictionary per identifier, shaped like get_channel_links results
+    """
+    mode = mode or LINK_EXTRACTION_MODE
+    # Handles and channel URLs seen before are cached and scraped under their channel ID
+    identifiers = [_resolve_identifier(identifier) for identifier in identifiers]
+    cache_keys = [_links_cache_key_for_identifier(identifier) for identifier in identifiers]
+    results = [None if refresh else get_cached_links(key) for key in cache_keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+
+    if missing and (dispatch or SCRAPER_DISPATCH) == 'worker':
+        # Queue every job first so the worker can run them concurrently, then wait
+        deadline = time.time() + SCRAPER_JOB_TIMEOUT
+        job_ids = {}
+        for i in missing:
+            payload = dict(_identifier_to_channel_kwargs(identifiers[i]), headless=headless, mode=mode, refresh=refresh)
+            job_ids[i] = scrape_job_queue.submit(payload)
+        for i, job_id in job_ids.items():
+            try:
+                results[i] = scrape_job_queue.wait(job_id, timeout=max(0.0, deadline - time.time()))
+            except Exception as e:
+                results[i] = _empty_links_result(identifiers[i], error=str(e))
+        return results
+
+    if missing and mode in ('http', 'auto'):
+        def fetch(identifier):
+            try:
+                return get_channel_links_http(identifier, verbose=verbose)
+            except Exception as e:
+                if mode == 'http':
+                    return _empty_links_result(identifier, error=str(e))
+                return None
+
+        with ThreadPoolExecutor(max_workers=SCRAPER_MAX_CONCURRENCY) as executor:
+            fetched = list(executor.map(fetch, [identifiers[i] for i in missing]))
+        for i, result in zip(missing, fetched):
+            if result is None and mode == 'http':
+                result = _empty_links_result(identifiers[i], error="Could not find ytInitialData in the channel page")
+            results[i] = result
+
+    # Scrape the remaining channels with the browser
+    pending = [i for i in missing if results[i] is None]
+    if pending:
+        if not PLAYWRIGHT_AVAILABLE:
+            # Not cached: the links become available as soon as Playwright is installed
+            for i in pending:
+                results[i] = _empty_links_result(identifiers[i], error="Playwright is not available")
+            missing = [i for i in missing if i not in pending]
         else:
-            url = url + '/about'
+            try:
+                scraped = get_links_engine(headless=headless).run(
+                    [identifiers[i] for i in pending], verbose=verbose, timeout=BROWSER_JOB_TIMEOUT)
+            except TimeoutError as e:
+                scraped = [_empty_links_result(identifiers[i], error=str(e)) for i in pending]
+            for i, result in zip(pending, scraped):
+                if 'error' not in result:
+                    result['source'] = 'browser'
+                results[i] = result
+
+    for i in missing:
+        cache_links_result(cache_keys[i], results[i])
+    return results
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=headless)
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        )
-        page = context.new_page()
 
-        # Navigate to the about page
-        if verbose:
-            print(f"Navigating to {url}")
-        try:
-            # Use a shorter timeout and don't wait for network to be idle
-            page.goto(url, wait_until="domcontentloaded", timeout=15000)
-            if verbose:
-                print("Page loaded")
+def _parse_iso8601_duration(duration):
+    """
+    Convert a YouTube ISO 8601 duration to seconds
+
+    Example: PT5M13S (5 minutes, 13 seconds). Only hours, minutes and
+    seconds are read; a duration that cannot be parsed counts as 0.
+    """
+    if not duration:
+        return 0
+    try:
+        duration_seconds = 0
+
+        # Extract hours
+        if 'H' in duration:
+            hours_part = duration.split('H')[0].split('T')[1]
+            duration_seconds += int(hours_part) * 3600
+            duration = duration.split('H')[1]
+        else:
+            duration = duration.split('T')[1]
+
+        # Extract minutes
+        if 'M' in duration:
+            minutes_part = duration.split('M')[0]
+            duration_seconds += int(minutes_part) * 60
+            duration = duration.split('M')[1]
+
+        # Extract seconds
+        if 'S' in duration:
+            seconds_part = duration.split('S')[0]
+            duration_seconds += int(seconds_part)
+
+        return duration_seconds
+    except Exception:
+        # Skip if duration parsing fails
+        return 0
+
+
+def video_columns(videos):
+    """
+    Read a list of videos into typed columns in a single pass
+
+    Each statistic is parsed once here, and video_metrics and video_averages
+    are derived from the columns instead of walking the videos again.
+
+    Args:
+        videos (list): List of video data from YouTube API
+
+    Returns:
+        dict: Lists of views, likes, comments, duration_seconds and published_at,
+            one entry per video in the order given
+    """
+    views = []
+    likes = []
+    comments = []
+    durations = []
+    published_at = []
+
+    for video in videos:
+        statistics = video.get('statistics', {})
+        views.append(int(statistics.get('viewCount', 0)))
+        likes.append(int(statistics.get('likeCount', 0)))
+        comments.append(int(statistics.get('commentCount', 0)))
+        durations.append(_parse_iso8601_duration(video.get('contentDetails', {}).get('duration', '')))
+        published_at.append(video.get('snippet', {}).get('publishedAt', 'Unknown'))
+
+    return {
+        'views': views,
+        'likes': likes,
+        'comments': comments,
+        'duration_seconds': durations,
+        'published_at': published_at
+    }
+
+
+def video_metrics_from_columns(columns):
+    """
+    Calculate the video_metrics of a channel from its video columns
+
+    Args:
+        columns (dict): Video columns from video_columns, for at least one video
+
+    Returns:
+        dict: Video count, average, maximum, minimum and total views, average likes
+            and comments, and engagement rate
+    """
+    views = columns['views']
+    count = len(views)
+    total_views = sum(views)
+    total_likes = sum(columns['likes'])
+    total_comments = sum(columns['comments'])
+
+    return {
+        'analyzed_videos_count': count,
+        'avg_views': total_views / count,
+        'max_views': max(views),
+        'min_views': min(views),
+        'total_views': total_views,
+        'avg_likes': total_likes / count,
+        'avg_comments': total_comments / count,
+        # Engagement rate is (likes + comments) / views
+        'engagement_rate': (total_likes + total_comments) / total_views if total_views > 0 else 0
+    }
+
+
+def _percentile(sorted_values, q):
+    """
+    Get the q quantile of sorted values, interpolating linearly between closest ranks
+
+    This is numpy.percentile's default method, written out so that both video
+    statistics engines round the same way.
+    """
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return float(sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower))
+
+
+def _outlier_cutoff(p25_views, p75_views):
+    """
+    Get the largest view count that is not an outlier
+
+    Views are integers, so comparing them with the floor of the float threshold
+    gives the exact result in both engines, where NumPy would otherwise round
+    counts above 2**53 to float64 before comparing.
+    """
+    return math.floor(p75_views + 1.5 * (p75_views - p25_views))
+
+
+def video_stats_engine(engine=None):
+    """
+    Get the video statistics engine to use, 'numpy' or 'python'
 
-            # Accept cookies if the dialog appears
-            try:
-                # Look for common cookie consent buttons
-                cookie_selectors = [
-                    "button[aria-label='Accept all']",
-                    "button[aria-label='Accept cookies']",
-                    "button:has-text('Accept all')",
-                    "button:has-text('Accept cookies')",
-                    "button:has-text('I agree')"
-                ]
-
-                for selector in cookie_selectors:
-                    if page.is_visible(selector, timeout=1000):
-                        if verbose:
-                            print(f"Accepting cookies with selector: {selector}")
-                        page.click(selector)
-                        break
-
-                # Immediately look for the links section after cookie acceptance
-                if verbose:
-                    print("Looking for links section...")
-                link_selectors = ["#links-section", "#link-list-container", "a[href^='https://www.youtube.com/redirect']"]
+    Args:
+        engine (str, optional): 'numpy', 'python' or 'auto'. Defaults to VIDEO_STATS_ENGINE.
+            NumPy is only used when it is installed.
+    """
+    engine = engine or VIDEO_STATS_ENGINE
+    return 'numpy' if engine in ('numpy', 'auto') and NUMPY_AVAILABLE else 'python'
 
-                for selector in link_selectors:
-                    try:
-                        # Use a short timeout since links appear quickly
-                        page.wait_for_selector(selector, timeout=2000)
-                        if verbose:
-                            print(f"Found links section with selector: {selector}")
-                        # No need to wait further once we find the links
-                        break
-                    except Exception as e:
-                        if verbose:
-                            print(f"Link selector {selector} not found, trying next...")
 
-            except Exception as e:
-                if verbose:
-                    print(f"Warning during page load: {e}")
-                    print("Continuing anyway...")
+def _video_averages_python(columns):
+    views = columns['views']
+    count = len(views)
+    total_views = sum(views)
+    total_likes = sum(columns['likes'])
+    total_comments = sum(columns['comments'])
 
-        except Exception as e:
-            if verbose:
-                print(f"Error loading page: {e}")
-            browser.close()
-            raise
+    sorted_views = sorted(views)
+    p25_views = _percentile(sorted_views, 0.25)
+    p75_views = _percentile(sorted_views, 0.75)
+    outlier_cutoff = _outlier_cutoff(p25_views, p75_views)
+    outliers = [view_count for view_count in views if view_count > outlier_cutoff]
 
-        # Extract channel name
-        try:
-            # Try different selectors for the channel name
-            channel_name_selectors = [
-                "#channel-name",
-                "#channel-header-container h1",
-                "ytd-channel-name #text"
-            ]
-
-            channel_name = "Unknown"
-            for selector in channel_name_selectors:
-                if page.is_visible(selector, timeout=500):
-                    channel_name = page.text_content(selector).strip()
-                    break
-        except Exception as e:
-            if verbose:
-                print(f"Warning: Could not get channel name: {e}")
-            channel_name = "Unknown"
+    # Summed exactly, so the result does not depend on the order of the videos
+    mean_views = total_views / count
+    views_variance = math.fsum(d * d for d in (view_count - mean_views for view_count in views)) / count
 
-        # Extract channel ID
-        channel_id = "Unknown"
-        try:
-            # Extract from URL
-            parsed_url = urlparse(url)
-            path_parts = parsed_url.path.strip('/').split('/')
-
-            if 'channel' in path_parts:
-                # URL format: youtube.com/channel/CHANNEL_ID/about
-                idx = path_parts.index('channel')
-                if idx + 1 < len(path_parts):
-                    channel_id = path_parts[idx + 1]
-            elif '@' in path_parts[0]:
-                # URL format: youtube.com/@USERNAME/about
-                # We'll use the handle as the ID
-                channel_id = path_parts[0]
-        except Exception as e:
-            if verbose:
-                print(f"Warning: Could not extract channel ID from URL: {e}")
+    return {
+        "total_views": total_views,
+        "total_likes": total_likes,
+        "total_comments": total_comments,
+        "max_views": max(views),
+        "min_views": min(views),
+        "total_duration_seconds": sum(columns['duration_seconds']),
+        "median_views": _percentile(sorted_views, 0.5),
+        "p25_views": p25_views,
+        "p75_views": p75_views,
+        "p90_views": _percentile(sorted_views, 0.9),
+        "views_std": math.sqrt(views_variance),
+        "outlier_count": len(outliers),
+        "outlier_views": sum(outliers),
+        "median_duration_seconds": _percentile(sorted(columns['duration_seconds']), 0.5)
+    }
 
-        # Extract subscriber count
-        try:
-            # Try different selectors for the subscriber count
-            subscriber_selectors = [
-                "#subscriber-count",
-                "yt-formatted-string.ytd-c4-tabbed-header-renderer",
-                "#meta-contents #metadata-line"
-            ]
-
-            subscriber_count = "Unknown"
-            for selector in subscriber_selectors:
-                if page.is_visible(selector, timeout=500):
-                    subscriber_text = page.text_content(selector).strip()
-                    # Extract just the subscriber count
-                    if 'subscribers' in subscriber_text.lower():
-                        subscriber_count = subscriber_text
-                    break
-        except Exception as e:
-            if verbose:
-                print(f"Warning: Could not get subscriber count: {e}")
-            subscriber_count = "Unknown"
 
-        # Get links section - try multiple selectors for different YouTube layouts
-        # No need to wait, extract links immediately
-        if verbose:
-            print("Extracting links...")
-        links = page.evaluate('''
-            () => {
-                // Try different selectors for the links section
-                const linkSelectors = [
-                    '#link-list-container', // Older layout
-                    '#links-section',       // Newer layout
-                    'ytd-channel-about-metadata-renderer #links-container' // Another possible layout
-                ];
-
-                let links = [];
-
-                // Try each selector
-                for (const selector of linkSelectors) {
-                    const linksSection = document.querySelector(selector);
-                    if (linksSection) {
-                        console.log('Found links section with selector: ' + selector);
-
-                        // Try different selectors for the actual links
-                        const linkElementSelectors = [
-                            'a.yt-simple-endpoint',
-                            'a[href]',
-                            'ytd-channel-about-metadata-renderer a[href]'
-                        ];
-
-                        for (const linkSelector of linkElementSelectors) {
-                            const linkElements = linksSection.querySelectorAll(linkSelector);
-                            if (linkElements && linkElements.length > 0) {
-                                console.log('Found ' + linkElements.length + ' links with selector: ' + linkSelector);
-
-                                links = Array.from(linkElements)
-                                    .filter(link => {
-                                        // Filter out YouTube internal links
-                                        const href = link.href;
-                                        return href &&
-                                               (href.includes('youtube.com/redirect') ||
-                                                (!href.includes('youtube.com/') &&
-                                                 !href.startsWith('javascript:') &&
-                                                 href !== '#'));
-                                    })
-                                    .map(link => {
-                                        return {
-                                            text: link.textContent.trim() || 'Link',
-                                            url: link.href
-                                        };
-                                    });
-
-                                if (links.length > 0) {
-                                    break; // Found links, no need to try other selectors
-                                }
-                            }
-                        }
-
-                        if (links.length > 0) {
-                            break; // Found links, no need to try other sections
-                        }
-                    }
-                }
+def _int64_sum(values):
+    """Sum integers as int64, raising OverflowError where NumPy would silently wrap around"""
+    array = np.asarray(values, dtype=np.int64)
+    if len(array) and max(-int(array.min()), int(array.max())) > np.iinfo(np.int64).max // len(array):
+        raise OverflowError("Sum may not fit in 64 bits")
+    return array, int(array.sum())
 
-                // If no links found with the above selectors, try a more general approach
-                if (links.length === 0) {
-                    console.log('Trying general approach to find links...');
-                    // Look for any links in the about section
-                    const aboutSection = document.querySelector('ytd-channel-about-metadata-renderer');
-                    if (aboutSection) {
-                        const allLinks = aboutSection.querySelectorAll('a[href]');
-                        links = Array.from(allLinks)
-                            .filter(link => {
-                                // Filter out YouTube internal links
-                                const href = link.href;
-                                return href &&
-                                       !href.includes('youtube.com/') &&
-                                       !href.startsWith('javascript:') &&
-                                       href !== '#';
-                            })
-                            .map(link => {
-                                return {
-                                    text: link.textContent.trim() || 'Link',
-                                    url: link.href
-                                };
-                            });
-                    }
-                }
 
-                return links;
-            }
-        ''')
+def _video_averages_numpy(columns):
+    views, total_views = _int64_sum(columns['views'])
+    durations, total_duration = _int64_sum(columns['duration_seconds'])
+    count = len(views)
 
-        if verbose:
-            print(f"Found {len(links)} links")
+    sorted_views = np.sort(views)
+    p25_views = _percentile(sorted_views, 0.25)
+    p75_views = _percentile(sorted_views, 0.75)
+    outlier_cutoff = _outlier_cutoff(p25_views, p75_views)
+    if outlier_cutoff >= int(sorted_views[-1]):
+        outliers = views[:0]
+    else:
+        outliers = views[views > np.int64(outlier_cutoff)]
 
-        # Extract channel description
-        try:
-            # Try different selectors for the description
-            description_selectors = [
-                "#description",
-                "ytd-channel-about-metadata-renderer #description",
-                "#meta-contents #description"
-            ]
-
-            description = ""
-            # Try to find any of the selectors with a short timeout
-            for selector in description_selectors:
-                if page.is_visible(selector, timeout=500):
-                    # Found a selector, now extract the text
-                    description = page.evaluate(f'''
-                        () => {{
-                            const descElement = document.querySelector('{selector}');
-                            return descElement ? descElement.textContent.trim() : '';
-                        }}
-                    ''')
-                    if description:
-                        break
-            else:
-                # No selectors found or no text in them
-                description = ""
-        except Exception as e:
-            if verbose:
-                print(f"Warning: Could not get description: {e}")
-            description = ""
-
-        # Close the browser
-        browser.close()
-
-        # Create result object
-        result = {
-            'channel_name': channel_name,
-            'channel_id': channel_id,
-            'subscriber_count': subscriber_count,
-            'description': description,
-            'links': links
-        }
+    deviations = views - total_views / count
+    views_variance = math.fsum((deviations * deviations).tolist()) / count
 
-        return result
+    return {
+        "total_views": total_views,
+        "total_likes": _int64_sum(columns['likes'])[1],
+        "total_comments": _int64_sum(columns['comments'])[1],
+        "max_views": int(sorted_views[-1]),
+        "min_views": int(sorted_views[0]),
+        "total_duration_seconds": total_duration,
+        "median_views": _percentile(sorted_views, 0.5),
+        "p25_views": p25_views,
+        "p75_views": p75_views,
+        "p90_views": _percentile(sorted_views, 0.9),
+        "views_std": math.sqrt(views_variance),
+        "outlier_count": len(outliers),
+        "outlier_views": int(outliers.sum()),
+        "median_duration_seconds": _percentile(np.sort(durations), 0.5)
+    }
 
 
-def get_channel_links_playwright(channel_id=None, username=None, handle=None, headless=True, verbose=True):
+def video_averages_from_columns(columns, engine=None):
     """
-    Get all external links from a YouTube channel's about page using Playwright
+    Calculate detailed average statistics from video columns
+
+    Besides the averages, reports the distribution of views: median, quartiles,
+    90th percentile and standard deviation, and the videos whose views are
+    outliers (more than 1.5 interquartile ranges above the third quartile),
+    with the average views of the other videos. Both engines return exactly
+    the same values.
 
     Args:
-        channel_id (str, optional): The YouTube channel ID
-        username (str, optional): The YouTube username
-        handle (str, optional): The YouTube handle (with or without @)
-        headless (bool): Whether to run browser in headless mode
-        verbose (bool, optional): Whether to print status messages. Defaults to True.
+        columns (dict): Video columns from video_columns
+        engine (str, optional): 'numpy', 'python' or 'auto', see video_stats_engine
 
     Returns:
-        dict: Dictionary containing channel info and links
+        dict: Dictionary containing average statistics and metrics
     """
-    if not PLAYWRIGHT_AVAILABLE:
-        if verbose:
-            print("Playwright is not available. Cannot extract channel links.")
-            print("To install: pip install playwright")
-            print("Then run: playwright install")
+    count = len(columns['views'])
+    if not count:
         return {
-            'channel_name': 'Unknown',
-            'channel_id': channel_id or 'Unknown',
-            'subscriber_count': 'Unknown',
-            'description': '',
-            'links': []
+            "count": 0,
+            "avg_views": 0,
+            "avg_likes": 0,
+            "avg_comments": 0,
+            "engagement_rate": 0,
+            "max_views": 0,
+            "min_views": 0,
+            "avg_duration_seconds": 0,
+            "like_to_view_ratio": 0,
+            "comment_to_view_ratio": 0,
+            "median_views": 0,
+            "p25_views": 0,
+            "p75_views": 0,
+            "p90_views": 0,
+            "views_std": 0,
+            "outlier_count": 0,
+            "avg_views_excluding_outliers": 0,
+            "median_duration_seconds": 0
         }
 
-    # Construct the URL based on the provided parameters
-    if channel_id:
-        url = f"https://www.youtube.com/channel/{channel_id}/about"
-    elif username:
-        url = f"https://www.youtube.com/user/{username}/about"
-    elif handle:
-        # Remove @ if it exists
-        if handle.startswith('@'):
-            handle = handle[1:]
-        url = f"https://www.youtube.com/@{handle}/about"
+    if video_stats_engine(engine) == 'numpy':
+        try:
+            totals = _video_averages_numpy(columns)
+        except OverflowError:
+            # Counts or sums beyond 64 bits are left to Python integers
+            totals = _video_averages_python(columns)
     else:
-        if verbose:
-            print("Error: You must provide either a channel_id, username, or handle.")
-        return None
+        totals = _video_averages_python(columns)
 
-    try:
-        # Use the get_channel_links function to extract links
-        return get_channel_links(url, headless=headless, verbose=verbose)
-    except Exception as e:
-        if verbose:
-            print(f"Error in get_channel_links_playwright: {e}")
-            import traceback
-            print(traceback.format_exc())
-        # Return empty result on error
-        return {
-            'channel_name': 'Unknown',
-            'channel_id': channel_id or username or handle or 'Unknown',
-            'subscriber_count': 'Unknown',
-            'description': '',
-            'links': [],
-            'error': str(e)
-        }
+    total_views = totals['total_views']
+    total_likes = totals['total_likes']
+    total_comments = totals['total_comments']
+
+    return {
+        "count": count,
+        "avg_views": total_views / count,
+        "avg_likes": total_likes / count,
+        "avg_comments": total_comments / count,
+        "engagement_rate": (total_likes + total_comments) / total_views if total_views > 0 else 0,
+        "max_views": totals['max_views'],
+        "min_views": totals['min_views'],
+        "avg_duration_seconds": totals['total_duration_seconds'] / count,
+        "like_to_view_ratio": total_likes / total_views if total_views > 0 else 0,
+        "comment_to_view_ratio": total_comments / total_views if total_views > 0 else 0,
+        "median_views": totals['median_views'],
+        "p25_views": totals['p25_views'],
+        "p75_views": totals['p75_views'],
+        "p90_views": totals['p90_views'],
+        "views_std": totals['views_std'],
+        "outlier_count": totals['outlier_count'],
+        "avg_views_excluding_outliers": (total_views - totals['outlier_views']) / (count - totals['outlier_count']),
+        "median_duration_seconds": totals['median_duration_seconds']
+    }
 
 
 def extract_account_metrics(data):
     """
     Extract metrics from YouTube channel data
 
+    The videos in data['video_stats'] are read once into columns, see
+    video_columns, from which video_metrics and video_averages are calculated.
+
     Args:
         data (dict): The YouTube API response data
 
@@ -588,42 +3931,17 @@ def extract_account_metrics(data):
     # Extract video metrics if available
     if 'video_stats' in data and 'items' in data['video_stats']:
         videos = data['video_stats']['items']
+        columns = video_columns(videos)
 
         if videos:
             # Calculate video metrics
-            total_views = sum(int(video.get('statistics', {}).get('viewCount', 0)) for video in videos)
-            total_likes = sum(int(video.get('statistics', {}).get('likeCount', 0)) for video in videos)
-            total_comments = sum(int(video.get('statistics', {}).get('commentCount', 0)) for video in videos)
-
-            # Calculate averages
-            avg_views = total_views / len(videos) if videos else 0
-            avg_likes = total_likes / len(videos) if videos else 0
-            avg_comments = total_comments / len(videos) if videos else 0
-
-            # Calculate engagement rate (likes + comments) / views
-            engagement_rate = (total_likes + total_comments) / total_views if total_views > 0 else 0
-
-            # Find max and min views
-            max_views = max(int(video.get('statistics', {}).get('viewCount', 0)) for video in videos) if videos else 0
-            min_views = min(int(video.get('statistics', {}).get('viewCount', 0)) for video in videos) if videos else 0
-
-            # Store metrics
-            metrics['video_metrics'] = {
-                'analyzed_videos_count': len(videos),
-                'avg_views': avg_views,
-                'max_views': max_views,
-                'min_views': min_views,
-                'total_views': total_views,
-                'avg_likes': avg_likes,
-                'avg_comments': avg_comments,
-                'engagement_rate': engagement_rate
-            }
+            metrics['video_metrics'] = video_metrics_from_columns(columns)
 
             # Extract recent videos
             recent_videos = []
-            for video in videos:
+            for video, views, likes, comments, published_at in zip(videos, columns['views'], columns['likes'],
+                                                                   columns['comments'], columns['published_at']):
                 snippet = video.get('snippet', {})
-                statistics = video.get('statistics', {})
                 video_id = video.get('id', 'Unknown')
 
                 # Create video URL from video ID
@@ -637,10 +3955,10 @@ def extract_account_metrics(data):
 
                 recent_videos.append({
                     'title': snippet.get('title', 'Unknown'),
-                    'published_at': snippet.get('publishedAt', 'Unknown'),
-                    'views': int(statistics.get('viewCount', 0)),
-                    'likes': int(statistics.get('likeCount', 0)),
-                    'comments': int(statistics.get('commentCount', 0)),
+                    'published_at': published_at,
+                    'views': views,
+                    'likes': likes,
+                    'comments': comments,
                     'video_id': video_id,
                     'video_url': video_url,
                     'thumbnail_url': thumbnail_url
@@ -650,7 +3968,8 @@ def extract_account_metrics(data):
             recent_videos.sort(key=lambda x: x['published_at'], reverse=True)
             metrics['recent_videos'] = recent_videos
 
-
+        # Calculate detailed video averages from the same columns
+        metrics['video_averages'] = video_averages_from_columns(columns)
 
     return metrics
 
@@ -711,6 +4030,11 @@ def format_metrics(metrics):
         minutes = int(avg_duration // 60)
         seconds = int(avg_duration % 60)
         formatted += f"Average Video Duration: {minutes}m {seconds}s\n"
+        formatted += f"Median Views: {video_averages.get('median_views', 0):,.1f}\n"
+        formatted += f"90th Percentile Views: {video_averages.get('p90_views', 0):,.1f}\n"
+        formatted += f"Views Standard Deviation: {video_averages.get('views_std', 0):,.1f}\n"
+        formatted += f"Outlier Videos: {video_averages.get('outlier_count', 0)}"
+        formatted += f" (average views without them: {video_averages.get('avg_views_excluding_outliers', 0):,.1f})\n"
 
 
     # Recent videos
@@ -729,12 +4053,13 @@ def format_metrics(metrics):
     return formatted
 
 
-def format_search_results(channels):
+def format_search_results(channels, start=1):
     """
     Format search results for display
 
     Args:
         channels (list): List of channel information dictionaries
+        start (int, optional): Number of the first channel, for later pages of results. Defaults to 1.
 
     Returns:
         str: Formatted search results string
@@ -745,7 +4070,7 @@ def format_search_results(channels):
     formatted = "\n=== SEARCH RESULTS ===\n"
     formatted += f"Found {len(channels)} channels:\n\n"
 
-    for i, channel in enumerate(channels, 1):
+    for i, channel in enumerate(channels, start):
         # Format the published date
         published_date = channel.get('published_at', 'Unknown')
         if published_date != 'Unknown':
@@ -771,7 +4096,7 @@ def format_search_results(channels):
     return formatted
 
 
-def analyze_youtube_channel(channel_id=None, username=None, handle=None, days_ago=None, start_date=None, end_date=None, extract_links=True, headless=True, verbose=True):
+def analyze_youtube_channel(channel_id=None, username=None, handle=None, days_ago=None, start_date=None, end_date=None, extract_links=True, headless=True, verbose=True, prefetched_links=None, links_mode=None, refresh_links=False, stats=None, prefetched_data=None, full=False, incremental=False):
     """
     Analyze a YouTube channel and display metrics
 
@@ -785,6 +4110,17 @@ def analyze_youtube_channel(channel_id=None, username=None, handle=None, days_ag
         extract_links (bool): Whether to extract external links using Playwright
         headless (bool): Whether to run browser in headless mode when extracting links
         verbose (bool, optional): Whether to print status messages. Defaults to True.
+        prefetched_links (dict, optional): Links result already extracted for this channel,
+            used instead of scraping the about page again
+        links_mode (str, optional): 'browser', 'http' or 'auto', see extract_channel_links
+        refresh_links (bool, optional): Scrape the about page even if its links are cached
+        stats (dict, optional): Dictionary whose 'round_trips' count is incremented
+            for every API request made
+        prefetched_data (dict, optional): API data already retrieved for this channel,
+            used instead of calling retrieve_youtube_data
+        full (bool, optional): Keep complete API resources in raw_data instead of the fields the metrics use
+        incremental (bool, optional): Fetch only the uploads added since the channel was last
+            analyzed this way, see retrieve_uploads_incremental
 
     Returns:
         dict: The raw data and metrics
@@ -808,7 +4144,11 @@ def analyze_youtube_channel(channel_id=None, username=None, handle=None, days_ag
         else:
             print(f"Retrieving data for YouTube channel: {identifier}")
 
-    data = retrieve_youtube_data(channel_id, username, handle, days_ago, start_date, end_date, verbose=verbose)
+    if prefetched_data is not None:
+        data = prefetched_data
+    else:
+        data = retrieve_youtube_data(channel_id, username, handle, days_ago, start_date, end_date, verbose=verbose, stats=stats,
+                                     full=full, incremental=incremental)
 
     if not data or 'items' not in data or not data['items']:
         if verbose:
@@ -817,19 +4157,19 @@ def analyze_youtube_channel(channel_id=None, username=None, handle=None, days_ag
 
     metrics = extract_account_metrics(data)
 
-    # Calculate detailed video averages
-    if 'video_stats' in data and 'items' in data['video_stats']:
-        videos = data['video_stats']['items']
-        video_averages = calculate_video_averages(videos)
-        metrics['video_averages'] = video_averages
-
     # Extract links using Playwright if requested
     channel_links = None
-    if extract_links and PLAYWRIGHT_AVAILABLE:
+    if extract_links and links_extraction_available(links_mode):
         if verbose:
             print("\n=== EXTRACTING CHANNEL LINKS USING PLAYWRIGHT ===")
         try:
-            channel_links = get_channel_links_playwright(channel_id, username, handle, headless=headless, verbose=verbose)
+            if prefetched_links is not None:
+                channel_links = prefetched_links
+            else:
+                # Use the resolved channel ID so the links cache is keyed the same way for every lookup
+                resolved_id = data['items'][0].get('id') or channel_id
+                channel_links = get_channel_links_playwright(resolved_id, username, handle, headless=headless, verbose=verbose,
+                                                             mode=links_mode, refresh=refresh_links)
 
             if channel_links and channel_links.get('links'):
                 # Add links to metrics
@@ -887,12 +4227,6 @@ def analyze_from_json_data(json_data):
 
     metrics = extract_account_metrics(data)
 
-    # Calculate detailed video averages
-    if 'video_stats' in data and 'items' in data['video_stats']:
-        videos = data['video_stats']['items']
-        video_averages = calculate_video_averages(videos)
-        metrics['video_averages'] = video_averages
-
     print(format_metrics(metrics))
 
     return {
@@ -984,75 +4318,292 @@ def check_analyzed_videos_count(data):
 
     if analyzed_count < total_videos:
         print(f"Note: Only analyzing {analyzed_count} out of {total_videos} videos")
-        print("This is due to YouTube API limitations (max 50 videos per request)")
+        print(f"Only uploads inside the date filter are fetched, up to {YOUTUBE_MAX_VIDEOS} per channel; "
+              f"without a date filter the latest {UNFILTERED_MAX_VIDEOS} are analyzed")
 
     return analyzed_count
 
 
-def search_youtube_channels(query, max_results=5):
+def normalize_search_query(query):
     """
-    Search for YouTube channels based on a query string
+    Normalize a search query for the search results cache
+
+    Applies Unicode NFKC normalization and case folding, and collapses whitespace,
+    so "AI news" and " ai  news " share an entry.
+    """
+    return ' '.join(unicodedata.normalize('NFKC', query).casefold().split())
+
+
+# Largest maxResults search.list accepts
+SEARCH_PAGE_SIZE = 50
+
+
+def search_quota_cost(max_results):
+    """
+    Get the quota units a search for max_results channels costs, details included
+    """
+    pages = -(-max_results // SEARCH_PAGE_SIZE)
+    return pages * (quota_ledger.cost('search.list') + quota_ledger.cost('channels.list'))
+
+
+class SearchCacheCounters:
+    """
+    Thread-safe counters of the search results cache for this process
+
+    Hits and misses are counted by search_cache for all workers; this tracks the
+    stale results served, the background refreshes and the quota units saved.
+    """
+
+    def __init__(self):
+        self._counts = {'stale_served': 0, 'revalidations': 0, 'quota_saved': 0}
+        self._lock = threading.Lock()
+
+    def add(self, key, value=1):
+        with self._lock:
+            self._counts[key] += value
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counts)
+
+
+search_cache_counters = SearchCacheCounters()
+_search_revalidations = set()
+_search_revalidations_lock = threading.Lock()
+_search_revalidate_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='search-revalidate')
+atexit.register(_search_revalidate_executor.shutdown, wait=False)
+
+
+def get_search_channel_details(channel_ids, stats=None):
+    """
+    Get the details of channels found by a search
 
     Args:
-        query (str): The search query (e.g., "ai news")
-        max_results (int, optional): Maximum number of results to return. Defaults to 5.
+        channel_ids (list): Unique channel IDs, in search ranking order
+        stats (dict, optional): Dictionary whose 'round_trips' count is incremented
 
     Returns:
-        list: List of channel information dictionaries
+        list: List of channel information dictionaries, in search ranking order
+    """
+    # Get more details about the channels, up to 50 per request
+    channel_details_by_id = {}
+    for chunk in chunk_ids(channel_ids):
+        channel_response = execute_api_call(
+            'channels.list',
+            stats=stats,
+            part="snippet,statistics,contentDetails",
+            id=','.join(chunk),
+            maxResults=len(chunk)
+        )
+        for channel_details in channel_response.get('items', []):
+            channel_details_by_id[channel_details['id']] = channel_details
+
+    # Process search results, keeping the search ranking order
+    channels = []
+    for channel_id in channel_ids:
+        channel_details = channel_details_by_id.get(channel_id)
+        if channel_details:
+            snippet = channel_details['snippet']
+            statistics = channel_details.get('statistics', {})
+
+            # Get thumbnail URLs (different sizes available)
+            thumbnails = snippet.get('thumbnails', {})
+            profile_picture_url = thumbnails.get('high', {}).get('url',
+                                 thumbnails.get('medium', {}).get('url',
+                                 thumbnails.get('default', {}).get('url', 'N/A')))
+
+            channels.append({
+                'channel_id': channel_id,
+                'title': snippet.get('title', 'Unknown'),
+                'description': snippet.get('description', ''),
+                'published_at': snippet.get('publishedAt', 'Unknown'),
+                'thumbnail': snippet.get('thumbnails', {}).get('default', {}).get('url', 'N/A'),
+                'profile_picture_url': profile_picture_url,
+                'subscriber_count': statistics.get('subscriberCount', 'N/A'),
+                'video_count': statistics.get('videoCount', 'N/A'),
+                'view_count': statistics.get('viewCount', 'N/A')
+            })
+
+    return channels
+
+
+def iter_search_pages(query, max_results=5, quota_budget=None, stats=None, use_cache=True):
     """
+    Search for YouTube channels page by page, following nextPageToken
 
+    Each page of search results is yielded as soon as its channel details
+    arrive, so callers can start on the first channels while later pages are
+    still to be requested. Channels found on an earlier page are left out of
+    later ones.
 
-    try:
-        # Initialize the YouTube API client
-        youtube = build('youtube', 'v3', developerKey=API_KEY)
+    Args:
+        query (str): The search query
+        max_results (int, optional): Stop after this many channels. Defaults to 5.
+        quota_budget (int, optional): Stop before a page would take the quota units spent
+            by the search above this budget. A search costs at least one page.
+        stats (dict, optional): Dictionary whose 'round_trips' count is incremented
+        use_cache (bool, optional): Whether to use the search results cache. Defaults to True.
+
+    Yields:
+        list: Channel information dictionaries of one page, in search ranking order
+    """
+    if use_cache:
+        cached = get_cached_search(query, max_results, stats)
+        if cached is not None:
+            for start in range(0, len(cached), SEARCH_PAGE_SIZE):
+                yield cached[start:start + SEARCH_PAGE_SIZE]
+            return
 
-        # Search for channels
-        print(f"Searching for YouTube channels with query: '{query}'")
-        search_request = youtube.search().list(
+    channels = []
+    seen = set()
+    page_token = None
+    spent = 0
+    complete = True
+    while len(channels) < max_results:
+        page_size = min(SEARCH_PAGE_SIZE, max_results - len(channels))
+        if quota_budget is not None and spent and spent + search_quota_cost(page_size) > quota_budget:
+            complete = False
+            break
+
+        params = {'pageToken': page_token} if page_token else {}
+        search_response = execute_api_call(
+            'search.list',
+            stats=stats,
             part="snippet",
             q=query,
             type="channel",
-            maxResults=max_results
+            maxResults=page_size,
+            **params
         )
-        search_response = search_request.execute()
+        spent += search_quota_cost(page_size)
 
-        # Process search results
-        channels = []
+        channel_ids = []
         for item in search_response.get('items', []):
             channel_id = item['snippet']['channelId']
+            if channel_id not in seen and len(channels) + len(channel_ids) < max_results:
+                seen.add(channel_id)
+                channel_ids.append(channel_id)
 
-            # Get more details about the channel
-            channel_request = youtube.channels().list(
-                part="snippet,statistics,contentDetails",
-                id=channel_id
-            )
-            channel_response = channel_request.execute()
+        page = get_search_channel_details(channel_ids, stats) if channel_ids else []
+        channels.extend(page)
+        if page:
+            yield page
 
-            if channel_response.get('items'):
-                channel_details = channel_response['items'][0]
-                snippet = channel_details['snippet']
-                statistics = channel_details.get('statistics', {})
+        page_token = search_response.get('nextPageToken')
+        if not page_token or not search_response.get('items'):
+            break
 
-                # Get thumbnail URLs (different sizes available)
-                thumbnails = snippet.get('thumbnails', {})
-                profile_picture_url = thumbnails.get('high', {}).get('url',
-                                     thumbnails.get('medium', {}).get('url',
-                                     thumbnails.get('default', {}).get('url', 'N/A')))
+    if use_cache:
+        # A search stopped by the budget only holds the first len(channels) results
+        try:
+            search_cache.set(normalize_search_query(query), {
+                'query': query, 'max_results': max_results if complete else len(channels),
+                'channels': channels, 'fetched_at': time.time()
+            })
+        except sqlite3.Error as e:
+            print(f"Warning: Could not write search cache: {e}")
 
-                channels.append({
-                    'channel_id': channel_id,
-                    'title': snippet.get('title', 'Unknown'),
-                    'description': snippet.get('description', ''),
-                    'published_at': snippet.get('publishedAt', 'Unknown'),
-                    'thumbnail': snippet.get('thumbnails', {}).get('default', {}).get('url', 'N/A'),
-                    'profile_picture_url': profile_picture_url,
-                    'subscriber_count': statistics.get('subscriberCount', 'N/A'),
-                    'video_count': statistics.get('videoCount', 'N/A'),
-                    'view_count': statistics.get('viewCount', 'N/A')
-                })
 
-        return channels
+def iter_search_channels(query, max_results=5, quota_budget=None, stats=None, use_cache=True):
+    """
+    Search for YouTube channels, yielding them as each page of results arrives
+
+    See iter_search_pages for the arguments.
+
+    Yields:
+        dict: Channel information dictionaries, in search ranking order
+    """
+    for page in iter_search_pages(query, max_results, quota_budget=quota_budget, stats=stats, use_cache=use_cache):
+        yield from page
+
+
+def _revalidate_search(cache_key, query, max_results):
+    """Refresh a stale search results entry, run in the background"""
+    try:
+        channels = list(iter_search_channels(query, max_results, use_cache=False))
+        search_cache.set(cache_key, {'query': query, 'max_results': max_results, 'channels': channels, 'fetched_at': time.time()})
+        search_cache_counters.add('revalidations')
+        search_cache_counters.add('quota_saved', -search_quota_cost(max_results))
+    except Exception as e:
+        print(f"Error refreshing cached search results for '{query}': {e}")
+    finally:
+        with _search_revalidations_lock:
+            _search_revalidations.discard(cache_key)
+
+
+def get_cached_search(query, max_results, stats=None):
+    """
+    Look up search results in the search results cache
+
+    An entry stored for at least max_results channels answers the request. An
+    entry older than SEARCH_CACHE_TTL is still returned, and refreshed in the
+    background (once per entry at a time). Sets stats['search_cache'] to 'hit',
+    'stale' or 'miss', and counts the quota units saved in stats['quota_saved'].
+
+    Returns:
+        list: The first max_results cached channels, or None on a miss
+    """
+    cache_key = normalize_search_query(query)
+    try:
+        entry = search_cache.get(cache_key, count=False)
+    except sqlite3.Error as e:
+        print(f"Warning: Could not read search cache: {e}")
+        return None
+
+    if entry is None or entry['max_results'] < max_results:
+        search_cache.record(False)
+        if stats is not None:
+            stats['search_cache'] = 'miss'
+        return None
+
+    search_cache.record(True)
+    saved = search_quota_cost(max_results)
+    search_cache_counters.add('quota_saved', saved)
+    add_to_stats(stats, 'quota_saved', saved)
+    stale = time.time() - entry['fetched_at'] >= SEARCH_CACHE_TTL
+    if stats is not None:
+        stats['search_cache'] = 'stale' if stale else 'hit'
+
+    if stale:
+        search_cache_counters.add('stale_served')
+        with _search_revalidations_lock:
+            start = cache_key not in _search_revalidations
+            _search_revalidations.add(cache_key)
+        if start:
+            # Attribute the refresh's quota to the endpoint that found the stale entry
+            _search_revalidate_executor.submit(contextvars.copy_context().run, _revalidate_search,
+                                               cache_key, entry['query'], entry['max_results'])
+    return entry['channels'][:max_results]
+
+
+def search_youtube_channels(query, max_results=5, stats=None, use_cache=True, quota_budget=None):
+    """
+    Search for YouTube channels based on a query string
+
+    Results are served from the search results cache when possible, see
+    get_cached_search. More than 50 results are requested page by page, see
+    iter_search_pages.
+
+    Args:
+        query (str): The search query (e.g., "ai news")
+        max_results (int, optional): Maximum number of results to return. Defaults to 5.
+        stats (dict, optional): Dictionary whose 'round_trips' count is incremented
+            for every API request made
+        use_cache (bool, optional): Whether to use the search results cache. Defaults to True.
+        quota_budget (int, optional): Most quota units to spend on the search
+
+    Returns:
+        list: List of channel information dictionaries
+    """
+
 
+    try:
+        # Search for channels
+        print(f"Searching for YouTube channels with query: '{query}'")
+        return list(iter_search_channels(query, max_results, quota_budget=quota_budget, stats=stats, use_cache=use_cache))
+
+    except QuotaExceededError:
+        raise
     except HttpError as e:
         print(f"YouTube API Error: {e}")
         return []
@@ -1061,10 +4612,18 @@ def search_youtube_channels(query, max_results=5):
         return []
 
 
-def analyze_search_results(channels, days_ago=None, start_date=None, end_date=None, extract_links=True, headless=True, verbose=True):
+_analysis_slots = threading.BoundedSemaphore(ANALYZE_MAX_CONCURRENCY)
+
+
+def analyze_search_results(channels, days_ago=None, start_date=None, end_date=None, extract_links=True, headless=True, verbose=True, links_mode=None, refresh_links=False, stats=None, full=False, max_workers=None, incremental=False):
     """
     Analyze multiple channels from search results
 
+    With more than one worker, links extraction and the batched API fetch run
+    at the same time, then the channels are analyzed in a thread pool. At most
+    ANALYZE_MAX_CONCURRENCY channels are analyzed at once across all calls. A
+    channel that fails is left out of the results without affecting the others.
+
     Args:
         channels (list): List of channel information dictionaries
         days_ago (int, optional): Only include videos from the last X days
@@ -1073,35 +4632,110 @@ def analyze_search_results(channels, days_ago=None, start_date=None, end_date=No
         extract_links (bool): Whether to extract external links using Playwright
         headless (bool): Whether to run browser in headless mode when extracting links
         verbose (bool, optional): Whether to print status messages. Defaults to True.
+        links_mode (str, optional): 'browser', 'http' or 'auto', see extract_channel_links
+        refresh_links (bool, optional): Scrape about pages even if their links are cached
+        stats (dict, optional): Dictionary whose 'round_trips' count is incremented
+            for every API request made
+        full (bool, optional): Keep complete API resources in raw_data instead of the fields the metrics use
+        max_workers (int, optional): Channels analyzed in parallel, 1 to analyze them one
+            at a time. Defaults to ANALYZE_MAX_WORKERS.
+        incremental (bool, optional): Fetch only the uploads added since each channel was last
+            analyzed this way. The channels are then refreshed one by one instead of in batches.
 
     Returns:
-        dict: Dictionary mapping channel IDs to analysis results
+        dict: Dictionary mapping channel IDs to analysis results, in search order
     """
     results = {}
+    max_workers = ANALYZE_MAX_WORKERS if max_workers is None else max_workers
 
     if verbose:
         print(f"\n=== ANALYZING {len(channels)} CHANNELS FROM SEARCH RESULTS ===")
 
-    for i, channel in enumerate(channels, 1):
+    def prefetch_links():
+        # Scrape all about pages concurrently up front instead of one per channel
+        if not (extract_links and links_extraction_available(links_mode) and channels):
+            return {}
+        channel_ids = [channel.get('channel_id') for channel in channels if channel.get('channel_id')]
+        if verbose:
+            print(f"Extracting links for {len(channel_ids)} channels concurrently...")
+        try:
+            return dict(zip(channel_ids, get_channels_links(channel_ids, headless=headless, verbose=verbose,
+                                                            mode=links_mode, refresh=refresh_links)))
+        except Exception as e:
+            if verbose:
+                print(f"Error extracting links concurrently, falling back to one channel at a time: {e}")
+            return {}
+
+    def prefetch_data():
+        # Fetch the API data of all channels together instead of one channel at a time
+        if not channels or incremental:
+            return {}
+        try:
+            return retrieve_youtube_data_batch(
+                [channel.get('channel_id') for channel in channels],
+                days_ago=days_ago, start_date=start_date, end_date=end_date, verbose=verbose, stats=stats, full=full
+            )
+        except QuotaExceededError:
+            raise
+        except Exception as e:
+            if verbose:
+                print(f"Error retrieving channel data in batches, falling back to one channel at a time: {e}")
+            return {}
+
+    def analyze(i, channel):
         channel_id = channel.get('channel_id')
         title = channel.get('title', 'Unknown')
 
-        if verbose:
-            print(f"\n[{i}/{len(channels)}] Analyzing channel: {title} (ID: {channel_id})")
+        with _analysis_slots:
+            if verbose:
+                print(f"\n[{i}/{len(channels)}] Analyzing channel: {title} (ID: {channel_id})")
 
-        # Analyze the channel
-        result = analyze_youtube_channel(
-            channel_id=channel_id,
-            days_ago=days_ago,
-            start_date=start_date,
-            end_date=end_date,
-            extract_links=extract_links,
-            headless=headless,
-            verbose=verbose
-        )
+            try:
+                # Analyze the channel
+                return analyze_youtube_channel(
+                    channel_id=channel_id,
+                    days_ago=days_ago,
+                    start_date=start_date,
+                    end_date=end_date,
+                    extract_links=extract_links,
+                    headless=headless,
+                    verbose=verbose,
+                    prefetched_links=links_by_channel.get(channel_id),
+                    links_mode=links_mode,
+                    refresh_links=refresh_links,
+                    stats=stats,
+                    prefetched_data=data_by_channel.get(channel_id),
+                    full=full,
+                    incremental=incremental
+                )
+            except QuotaExceededError:
+                raise
+            except Exception as e:
+                if verbose:
+                    print(f"Error analyzing channel {title} (ID: {channel_id}): {e}")
+                return None
+
+    if max_workers <= 1 or len(channels) <= 1:
+        links_by_channel = prefetch_links()
+        data_by_channel = prefetch_data()
+        analyzed = [analyze(i, channel) for i, channel in enumerate(channels, 1)]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analyze') as executor:
+            # Worker threads run in a copy of the caller's context so quota is attributed to its endpoint
+            def submit(func, *args):
+                return executor.submit(contextvars.copy_context().run, func, *args)
 
+            links_future = submit(prefetch_links)
+            data_future = submit(prefetch_data)
+            links_by_channel = links_future.result()
+            data_by_channel = data_future.result()
+
+            futures = [submit(analyze, i, channel) for i, channel in enumerate(channels, 1)]
+            analyzed = [future.result() for future in futures]
+
+    for channel, result in zip(channels, analyzed):
         if result:
-            results[channel_id] = result
+            results[channel.get('channel_id')] = result
 
     return results
 
@@ -1160,113 +4794,20 @@ def export_to_json(results, query=None, filename=None):
         return None
 
 
-def calculate_video_averages(videos):
+def calculate_video_averages(videos, engine=None):
     """
     Calculate detailed average statistics for a list of YouTube videos.
 
+    extract_account_metrics already includes these as metrics['video_averages'].
+
     Args:
         videos (list): List of video data from YouTube API
+        engine (str, optional): 'numpy', 'python' or 'auto', see video_stats_engine
 
     Returns:
         dict: Dictionary containing average statistics and metrics
     """
-    if not videos:
-        return {
-            "count": 0,
-            "avg_views": 0,
-            "avg_likes": 0,
-            "avg_comments": 0,
-            "engagement_rate": 0,
-            "max_views": 0,
-            "min_views": 0,
-            "avg_duration_seconds": 0,
-            "like_to_view_ratio": 0,
-            "comment_to_view_ratio": 0
-        }
-
-    # Initialize counters
-    total_views = 0
-    total_likes = 0
-    total_comments = 0
-    total_duration_seconds = 0
-    view_counts = []
-
-    # Process each video
-    for video in videos:
-        statistics = video.get('statistics', {})
-        content_details = video.get('contentDetails', {})
-
-        # Extract view count
-        view_count = int(statistics.get('viewCount', 0))
-        view_counts.append(view_count)
-        total_views += view_count
-
-        # Extract like count
-        total_likes += int(statistics.get('likeCount', 0))
-
-        # Extract comment count
-        total_comments += int(statistics.get('commentCount', 0))
-
-        # Extract duration if available
-        duration = content_details.get('duration', '')
-        if duration:
-            try:
-                # Convert ISO 8601 duration to seconds
-                # Example: PT5M13S (5 minutes, 13 seconds)
-                duration_seconds = 0
-
-                # Extract hours
-                if 'H' in duration:
-                    hours_part = duration.split('H')[0].split('T')[1]
-                    duration_seconds += int(hours_part) * 3600
-                    duration = duration.split('H')[1]
-                else:
-                    duration = duration.split('T')[1]
-
-                # Extract minutes
-                if 'M' in duration:
-                    minutes_part = duration.split('M')[0]
-                    duration_seconds += int(minutes_part) * 60
-                    duration = duration.split('M')[1]
-
-                # Extract seconds
-                if 'S' in duration:
-                    seconds_part = duration.split('S')[0]
-                    duration_seconds += int(seconds_part)
-
-                total_duration_seconds += duration_seconds
-            except Exception:
-                # Skip if duration parsing fails
-                pass
-
-    # Calculate averages
-    count = len(videos)
-    avg_views = total_views / count if count > 0 else 0
-    avg_likes = total_likes / count if count > 0 else 0
-    avg_comments = total_comments / count if count > 0 else 0
-    avg_duration_seconds = total_duration_seconds / count if count > 0 else 0
-
-    # Calculate engagement metrics
-    engagement_rate = (total_likes + total_comments) / total_views if total_views > 0 else 0
-    like_to_view_ratio = total_likes / total_views if total_views > 0 else 0
-    comment_to_view_ratio = total_comments / total_views if total_views > 0 else 0
-
-    # Find max and min views
-    max_views = max(view_counts) if view_counts else 0
-    min_views = min(view_counts) if view_counts else 0
-
-    return {
-        "count": count,
-        "avg_views": avg_views,
-        "avg_likes": avg_likes,
-        "avg_comments": avg_comments,
-        "engagement_rate": engagement_rate,
-        "max_views": max_views,
-        "min_views": min_views,
-        "avg_duration_seconds": avg_duration_seconds,
-        "like_to_view_ratio": like_to_view_ratio,
-        "comment_to_view_ratio": comment_to_view_ratio
-    }
+    return video_averages_from_columns(video_columns(videos), engine=engine)
 
 def run_youtube_analysis(query):
     """
@@ -1314,17 +4855,6 @@ def run_youtube_analysis(query):
         headless=headless
     )
 
-    # Calculate and add video averages for each channel
-    for channel_id, result in results.items():
-        if result and 'raw_data' in result and 'video_stats' in result['raw_data']:
-            videos = result['raw_data']['video_stats'].get('items', [])
-            video_averages = calculate_video_averages(videos)
-
-            # Add the video averages to the result
-            if 'metrics' not in result:
-                result['metrics'] = {}
-            result['metrics']['video_averages'] = video_averages
-
     if results:
         print("\n=== ANALYSIS COMPLETE ===")
         print(f"Analyzed {len(results)} channels matching '{query}'")
@@ -1357,7 +4887,10 @@ def main():
     # Search command
     search_parser = subparsers.add_parser('search', help='Search for and analyze YouTube channels')
     search_parser.add_argument('query', help='Search query for YouTube channels')
-    search_parser.add_argument('--max-results', type=int, default=5, help='Maximum number of search results to analyze')
+    search_parser.add_argument('--max-results', type=int, default=5,
+                               help='Maximum number of search results to analyze. More than 50 are requested and analyzed page by page')
+    search_parser.add_argument('--quota-budget', type=int,
+                               help='Stop searching before a page of results would take the search over this many API quota units')
 
     # Date filtering options
     date_group = search_parser.add_argument_group('date filtering options (use only one)')
@@ -1369,7 +4902,11 @@ def main():
 
     search_parser.add_argument('--no-links', action='store_true', help='Disable extraction of external links')
     search_parser.add_argument('--visible', action='store_true', help='Run browser in visible mode (not headless)')
+    search_parser.add_argument('--links-mode', choices=LINK_EXTRACTION_MODES, default=LINK_EXTRACTION_MODE,
+                               help='How to extract external links (browser, http or auto)')
     search_parser.add_argument('--output', help='Custom filename for JSON export')
+    search_parser.add_argument('--incremental', action='store_true',
+                               help='Fetch only the uploads added since the last incremental run')
 
     # Channel command
     channel_parser = subparsers.add_parser('channel', help='Analyze a specific YouTube channel')
@@ -1388,12 +4925,18 @@ def main():
 
     channel_parser.add_argument('--no-links', action='store_true', help='Disable extraction of external links')
     channel_parser.add_argument('--visible', action='store_true', help='Run browser in visible mode (not headless)')
+    channel_parser.add_argument('--links-mode', choices=LINK_EXTRACTION_MODES, default=LINK_EXTRACTION_MODE,
+                                help='How to extract external links (browser, http or auto)')
     channel_parser.add_argument('--output', help='Custom filename for JSON export')
+    channel_parser.add_argument('--incremental', action='store_true',
+                                help='Fetch only the uploads added since the last incremental run')
 
     # Links command
     links_parser = subparsers.add_parser('links', help='Extract links from a YouTube channel')
     links_parser.add_argument('url', help='YouTube channel URL')
     links_parser.add_argument('--visible', action='store_true', help='Run browser in visible mode (not headless)')
+    links_parser.add_argument('--mode', choices=LINK_EXTRACTION_MODES, default=LINK_EXTRACTION_MODE,
+                              help='Extract links with the browser, from the page JSON over HTTP, or auto (HTTP with browser fallback)')
     links_parser.add_argument('--output', help='Output file path (JSON)')
 
     # Parse arguments
@@ -1420,32 +4963,43 @@ def main():
         if args.date_range:
             start_date, end_date = args.date_range
 
-        # Search for channels
+        # Search for channels, analyzing each page of results as it arrives
         print(f"Searching for YouTube channels with query: '{args.query}'")
-        channels = search_youtube_channels(args.query, max_results=max_results)
-
-        if not channels:
-            print("No channels found matching your search query.")
-            return
-
-        # Print search results
-        print(format_search_results(channels))
-
-        # Analyze all channels from search results
-        results = analyze_search_results(
-            channels,
-            days_ago=days_ago,
-            start_date=start_date,
-            end_date=end_date,
-            extract_links=extract_links,
-            headless=headless
-        )
+        results = {}
+        found = 0
+        try:
+            for channels in iter_search_pages(args.query, max_results=max_results, quota_budget=args.quota_budget):
+                # Print search results
+                print(format_search_results(channels, start=found + 1))
+                found += len(channels)
+
+                # Analyze the channels from this page of search results
+                results.update(analyze_search_results(
+                    channels,
+                    days_ago=days_ago,
+                    start_date=start_date,
+                    end_date=end_date,
+                    extract_links=extract_links,
+                    headless=headless,
+                    links_mode=args.links_mode,
+                    incremental=args.incremental
+                ))
+        except QuotaExceededError as e:
+            print(f"YouTube API quota exceeded: {e}")
+            if e.retry_after:
+                print(f"Try again in {int(e.retry_after) + 1} seconds")
+        except HttpError as e:
+            print(f"YouTube API Error: {e}")
+        except Exception as e:
+            print(f"Error searching for channels: {e}")
 
-        # Export results to JSON
+        # Export results to JSON, including the pages analyzed before an error
         if results:
             json_file = export_to_json(results, args.query, args.output)
             if json_file:
                 print(f"Results exported to JSON file: {json_file}")
+        elif not found:
+            print("No channels found matching your search query.")
 
     # Handle channel command
     elif args.command == 'channel':
@@ -1474,7 +5028,9 @@ def main():
             start_date=start_date,
             end_date=end_date,
             extract_links=extract_links,
-            headless=headless
+            headless=headless,
+            links_mode=args.links_mode,
+            incremental=args.incremental
         )
 
         # Export results to JSON if requested
@@ -1487,7 +5043,7 @@ def main():
     # Handle links command
     elif args.command == 'links':
         try:
-            result = get_channel_links(args.url, headless=not args.visible)
+            result = extract_channel_links(args.url, mode=args.mode, headless=not args.visible)
 
             # Process links to extract direct URLs
             if result['links']:
@@ -0,0 +1,369 @@
+import asyncio
+import json
+import os
+import time
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+import youtube_analyzer
+
+# aiohttp is optional, only needed for the asyncio client
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+YOUTUBE_API_BASE_URL = os.environ.get('YOUTUBE_API_BASE_URL', 'https://youtube.googleapis.com/youtube/v3/')
+# Requests in flight at once per client, which is also the size of its connection pool
+ASYNC_API_CONCURRENCY = int(os.environ.get('ASYNC_API_CONCURRENCY', '20'))
+
+
+class AsyncYouTubeClient:
+    """
+    Asyncio client for the YouTube Data API methods used by youtube_analyzer
+
+    Supports search.list, channels.list, playlistItems.list and videos.list. It
+    returns the same response dicts as the googleapiclient calls, and raises
+    googleapiclient's HttpError for error responses, so quota accounting, key
+    failover, field masks and ETag revalidation work as in execute_api_call.
+    Connections are pooled and at most `concurrency` requests are in flight.
+
+    Use as an async context manager:
+
+        async with AsyncYouTubeClient() as client:
+            response = await client.call('channels.list', part='snippet', id=channel_id)
+    """
+
+    RESOURCES = {
+        'search.list': 'search',
+        'channels.list': 'channels',
+        'playlistItems.list': 'playlistItems',
+        'videos.list': 'videos',
+    }
+
+    def __init__(self, concurrency=ASYNC_API_CONCURRENCY, base_url=YOUTUBE_API_BASE_URL, timeout=youtube_analyzer.YOUTUBE_API_CALL_TIMEOUT):
+        if not AIOHTTP_AVAILABLE:
+            raise RuntimeError("aiohttp is not installed. Install it with: pip install aiohttp")
+        self.concurrency = concurrency
+        self.base_url = base_url if base_url.endswith('/') else base_url + '/'
+        self.timeout = timeout
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        self._session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._session.close()
+        self._session = None
+
+    async def _get(self, method, api_key, params, etag=None):
+        """Send one GET request, raising HttpError for non-2xx responses"""
+        url = self.base_url + self.RESOURCES[method]
+        query = {name: str(value) for name, value in params.items()}
+        if api_key:
+            query['key'] = api_key
+        headers = {'If-None-Match': etag} if etag else {}
+
+        async with self._semaphore:
+            async with self._session.get(url, params=query, headers=headers) as response:
+                content = await response.read()
+                if response.status >= 300:
+                    # Keep the headers so retry_delay sees Retry-After
+                    raise HttpError(httplib2.Response({**response.headers, 'status': response.status}), content, uri=str(response.url))
+                return json.loads(content)
+
+    async def _send_with_key(self, method, params, stats=None, api_key=None):
+        """Send the call with api_key (already charged) or a newly charged key, switching keys when one runs out of quota"""
+        while True:
+            # Quota and ETag bookkeeping use SQLite, keep it off the event loop
+            api_key = api_key or await asyncio.to_thread(youtube_analyzer.quota_ledger.charge, method)
+            cache_key, cached = await asyncio.to_thread(youtube_analyzer.lookup_etag, method, params)
+
+            youtube_analyzer.count_round_trip(stats)
+            started = time.monotonic()
+            try:
+                response, error = await self._get(method, api_key, params, etag=cached['etag'] if cached else None), None
+            except HttpError as e:
+                response, error = None, e
+            except asyncio.TimeoutError as e:
+                youtube_analyzer.add_to_stats(stats, 'timeouts')
+                raise TimeoutError(f"{method} did not answer within {self.timeout:g} seconds") from e
+            except aiohttp.ClientConnectionError as e:
+                raise ConnectionError(f"{method} request failed: {e}") from e
+
+            elapsed = time.monotonic() - started
+            response, error = await asyncio.to_thread(
+                youtube_analyzer.resolve_conditional, cache_key, cached, response, error, elapsed, stats
+            )
+            if error is None:
+                youtube_analyzer.api_latency.record(method, elapsed)
+                return response
+            # Retry with another key if this one ran out of quota
+            if not await asyncio.to_thread(youtube_analyzer.quota_ledger.handle_error, api_key, error):
+                raise error
+            api_key = None
+
+    async def _send_hedged(self, method, params, stats=None):
+        """
+        Send one attempt of a call, hedged like youtube_analyzer's synchronous calls
+
+        The hedge is only sent if a key can pay for it right away. The losing
+        request is cancelled and recorded as abandoned in the quota ledger.
+        """
+        hedge_delay = None
+        if youtube_analyzer.YOUTUBE_API_HEDGE and method in youtube_analyzer.HEDGE_METHODS:
+            p95 = youtube_analyzer.api_latency.percentile(method, 0.95)
+            if p95 is not None:
+                hedge_delay = max(youtube_analyzer.YOUTUBE_API_HEDGE_MIN_DELAY, p95)
+
+        if hedge_delay is None:
+            return await self._send_with_key(method, params, stats)
+
+        first_key = await asyncio.to_thread(youtube_analyzer.quota_ledger.charge, method)
+        first = asyncio.ensure_future(self._send_with_key(method, params, stats, first_key))
+        done, _ = await asyncio.wait({first}, timeout=hedge_delay)
+        if done:
+            return first.result()
+        try:
+            hedge_key = await asyncio.to_thread(youtube_analyzer.quota_ledger.charge, method, timeout=0)
+        except youtube_analyzer.QuotaExceededError:
+            youtube_analyzer.add_to_stats(stats, 'hedges_skipped')
+            return await first
+        hedge = asyncio.ensure_future(self._send_with_key(method, params, stats, hedge_key))
+        youtube_analyzer.add_to_stats(stats, 'hedged')
+        keys = {first: first_key, hedge: hedge_key}
+        pending = {first, hedge}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            youtube_analyzer.add_to_stats(stats, 'hedge_wins')
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+                youtube_analyzer.add_to_stats(stats, 'abandoned')
+                await asyncio.to_thread(youtube_analyzer.quota_ledger.record_abandoned, keys[task])
+
+    async def call(self, method, stats=None, full=False, **params):
+        """
+        Execute a YouTube Data API call
+
+        Transient errors are retried like youtube_analyzer.execute_api_call does.
+
+        Args:
+            method (str): API method such as 'channels.list'
+            stats (dict, optional): Dictionary whose 'round_trips' count is incremented
+            full (bool, optional): Return complete resources instead of the fields in API_FIELD_MASKS
+            **params: Parameters for the API method
+
+        Returns:
+            dict: The API response
+        """
+        if not full:
+            params = youtube_analyzer.with_field_mask(method, params)
+
+        for attempt in range(youtube_analyzer.YOUTUBE_API_RETRIES + 1):
+            try:
+                return await self._send_hedged(method, params, stats=stats)
+            except Exception as e:
+                if attempt == youtube_analyzer.YOUTUBE_API_RETRIES or not youtube_analyzer.is_retryable(e):
+                    raise
+                youtube_analyzer.add_to_stats(stats, 'retries')
+                await asyncio.sleep(youtube_analyzer.retry_delay(attempt, e))
+
+
+async def retrieve_youtube_data_async(client, channel_id=None, username=None, handle=None, days_ago=None, start_date=None, end_date=None, verbose=True, stats=None, max_videos=None, full=False):
+    """
+    Retrieve YouTube channel data with the asyncio client
+
+    Same arguments and result as youtube_analyzer.retrieve_youtube_data, plus:
+
+    Args:
+        client (AsyncYouTubeClient): An open client
+
+    Returns:
+        dict: The channel data response, or None if it could not be retrieved
+    """
+    try:
+        # Determine which parameter to use for the API call
+        lookup, resolved = await asyncio.to_thread(youtube_analyzer.channel_lookup, channel_id, username, handle)
+        if lookup is None:
+            if verbose:
+                print("Error: You must provide either a channel_id, username, or handle.")
+            return None
+
+        response = await client.call('channels.list', stats=stats, full=full, part="snippet,contentDetails,statistics", **lookup)
+        if not await asyncio.to_thread(youtube_analyzer.accept_channel_lookup, response, username, handle, resolved):
+            # The stored channel ID is out of date, look the channel up by name
+            lookup, resolved = await asyncio.to_thread(youtube_analyzer.channel_lookup, channel_id, username, handle)
+            response = await client.call('channels.list', stats=stats, full=full, part="snippet,contentDetails,statistics", **lookup)
+            await asyncio.to_thread(youtube_analyzer.accept_channel_lookup, response, username, handle, resolved)
+
+        # Check if any channels were found
+        if not response.get('items'):
+            if verbose:
+                print("No channel found with the provided identifier.")
+            return None
+
+        uploads_playlist_id = response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+
+        # Get the channel's videos and their stats, page by page
+        date_filter = youtube_analyzer.build_date_filter(days_ago, start_date, end_date)
+        remaining = youtube_analyzer.resolve_max_videos(date_filter, max_videos)
+        page_token = None
+        all_video_stats = []
+        while remaining > 0:
+            videos_response = await client.call('playlistItems.list', stats=stats, full=full,
+                                                **youtube_analyzer.upload_page_params(uploads_playlist_id, page_token, remaining))
+            items, page_token = youtube_analyzer.read_upload_page(videos_response, date_filter, remaining)
+
+            video_ids = [item['contentDetails']['videoId'] for item in items]
+            if video_ids:
+                video_stats_response = await client.call('videos.list', stats=stats, full=full,
+                                                         part="statistics,contentDetails,snippet", id=','.join(video_ids))
+                all_video_stats.extend(video_stats_response.get('items', []))
+
+            remaining -= len(items)
+            if not page_token:
+                break
+
+        response['video_stats'] = {'items': all_video_stats}
+        return response
+
+    except youtube_analyzer.QuotaExceededError:
+        raise
+    except HttpError as e:
+        if verbose:
+            print(f"YouTube API Error: {e}")
+        return None
+    except Exception as e:
+        if verbose:
+            print(f"Error retrieving YouTube data: {e}")
+        return None
+
+
+async def analyze_youtube_channel_async(channel_id=None, username=None, handle=None, days_ago=None, start_date=None, end_date=None, extract_links=True, headless=True, verbose=True, prefetched_links=None, links_mode=None, refresh_links=False, stats=None, full=False, client=None):
+    """
+    Analyze a YouTube channel, fetching its API data with the asyncio client
+
+    Same arguments and result as youtube_analyzer.analyze_youtube_channel. The
+    metrics and links extraction are done by analyze_youtube_channel itself in a
+    worker thread, so the output is identical.
+
+    Args:
+        client (AsyncYouTubeClient, optional): An open client. A new one is used if not given.
+
+    Returns:
+        dict: The raw data and metrics, or None if the channel could not be retrieved
+    """
+    if client is None:
+        async with AsyncYouTubeClient() as client:
+            return await analyze_youtube_channel_async(
+                channel_id, username, handle, days_ago, start_date, end_date, extract_links, headless, verbose,
+                prefetched_links, links_mode, refresh_links, stats, full, client
+            )
+
+    data = await retrieve_youtube_data_async(client, channel_id, username, handle, days_ago, start_date, end_date,
+                                             verbose=verbose, stats=stats, full=full)
+    if data is None:
+        if verbose:
+            print(f"Error: Could not retrieve data for {channel_id or username or handle}")
+        return None
+
+    return await asyncio.to_thread(
+        youtube_analyzer.analyze_youtube_channel,
+        channel_id=channel_id, username=username, handle=handle, days_ago=days_ago, start_date=start_date,
+        end_date=end_date, extract_links=extract_links, headless=headless, verbose=verbose,
+        prefetched_links=prefetched_links, links_mode=links_mode, refresh_links=refresh_links,
+        stats=stats, prefetched_data=data, full=full
+    )
+
+
+async def analyze_search_results_async(channels, days_ago=None, start_date=None, end_date=None, extract_links=True, headless=True, verbose=True, links_mode=None, refresh_links=False, stats=None, full=False, client=None):
+    """
+    Analyze multiple channels from search results with the asyncio client
+
+    Same arguments and result as youtube_analyzer.analyze_search_results. Every
+    channel's API data is fetched concurrently (bounded by the client's
+    concurrency) while the links are extracted in a worker thread. A channel
+    that fails is left out of the results without affecting the others.
+
+    Args:
+        client (AsyncYouTubeClient, optional): An open client. A new one is used if not given.
+
+    Returns:
+        dict: Dictionary mapping channel IDs to analysis results, in search order
+    """
+    if client is None:
+        async with AsyncYouTubeClient() as client:
+            return await analyze_search_results_async(
+                channels, days_ago, start_date, end_date, extract_links, headless, verbose, links_mode,
+                refresh_links, stats, full, client
+            )
+
+    if verbose:
+        print(f"\n=== ANALYZING {len(channels)} CHANNELS FROM SEARCH RESULTS ===")
+
+    channel_ids = [channel.get('channel_id') for channel in channels]
+
+    def prefetch_links():
+        if not (extract_links and youtube_analyzer.links_extraction_available(links_mode)):
+            return {}
+        try:
+            ids = [channel_id for channel_id in channel_ids if channel_id]
+            return dict(zip(ids, youtube_analyzer.get_channels_links(ids, headless=headless, verbose=verbose,
+                                                                     mode=links_mode, refresh=refresh_links)))
+        except Exception as e:
+            if verbose:
+                print(f"Error extracting links concurrently, falling back to one channel at a time: {e}")
+            return {}
+
+    async def fetch(channel_id):
+        try:
+            return await retrieve_youtube_data_async(client, channel_id, days_ago=days_ago, start_date=start_date,
+                                                     end_date=end_date, verbose=verbose, stats=stats, full=full)
+        except youtube_analyzer.QuotaExceededError:
+            raise
+        except Exception as e:
+            if verbose:
+                print(f"Error retrieving data for {channel_id}: {e}")
+            return None
+
+    links_task = asyncio.ensure_future(asyncio.to_thread(prefetch_links))
+    try:
+        data = await asyncio.gather(*(fetch(channel_id) for channel_id in channel_ids))
+        links_by_channel = await links_task
+    finally:
+        if not links_task.done():
+            links_task.cancel()
+
+    def analyze(channel_id, channel_data):
+        try:
+            return youtube_analyzer.analyze_youtube_channel(
+                channel_id=channel_id, days_ago=days_ago, start_date=start_date, end_date=end_date,
+                extract_links=extract_links, headless=headless, verbose=verbose,
+                prefetched_links=links_by_channel.get(channel_id), links_mode=links_mode,
+                refresh_links=refresh_links, stats=stats, prefetched_data=channel_data, full=full
+            )
+        except Exception as e:
+            if verbose:
+                print(f"Error analyzing channel {channel_id}: {e}")
+            return None
+
+    # Channels without prefetched links scrape their about page inline, so keep this off the event loop
+    retrieved = [(channel_id, channel_data) for channel_id, channel_data in zip(channel_ids, data) if channel_data is not None]
+    analyzed = await asyncio.gather(*(asyncio.to_thread(analyze, channel_id, channel_data) for channel_id, channel_data in retrieved))
+
+    return {channel_id: result for (channel_id, _), result in zip(retrieved, analyzed) if result}